@@ -4,8 +4,11 @@ from pathlib import Path
 
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtGui import QIcon, QFont
+from PyQt6.QtCore import QTimer
 
+from src.config.config import PREWARM_DELAY_MS, PREWARM_HEAVY_IMPORTS
 from src.ui.ui_main import MainWindow
+from src.utils.lazy_imports import prewarm_imports
 
 
 def main():
@@ -36,6 +39,12 @@ def main():
 
     win = MainWindow()
     win.showMaximized()
+
+    # PyMuPDF / python-docx 在启动路径上是延迟导入的；窗口出来后在后台先导入，
+    # 第一次解析 / 生成报告时就不用再等
+    if PREWARM_HEAVY_IMPORTS:
+        QTimer.singleShot(PREWARM_DELAY_MS, prewarm_imports)
+
     sys.exit(app.exec())
 
 
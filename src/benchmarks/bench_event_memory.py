@@ -0,0 +1,99 @@
+# src/benchmarks/bench_event_memory.py
+"""
+解析结果的内存占用：dict 版 dataclass（旧） vs slots dataclass vs 列式 DscEventTable。
+
+用法：
+    python -m src.benchmarks.bench_event_memory --events 10000 50000 --segments 4
+
+每种表示都从同一串伪随机数现场建出来（float 对象也算在各自头上），用 tracemalloc 量建完之后还占着的字节数。
+最后顺带量一下“整列取 Peak 求最大值”：dataclass 要逐个 part 取属性，列式直接切 memoryview。
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from dataclasses import field, fields, make_dataclass
+from typing import Callable, List
+
+from src.models.event_table import DscEventTable
+from src.models.models import DscPeakPart, DscSegment
+
+# 旧的 dict 版 dataclass（字段和现在的 DscPeakPart / DscSegment 一样，只是没有 slots），只作对照
+LegacyPart = make_dataclass("LegacyPart", [(f.name, f.type, field(default=f.default)) for f in fields(DscPeakPart)])
+LegacySegment = make_dataclass(
+    "LegacySegment",
+    [(f.name, f.type) for f in fields(DscSegment) if f.name != "parts"] + [("parts", list, field(default_factory=list))],
+)
+
+
+def build_segments(n_events: int, n_segments: int, part_cls, segment_cls, seed: int = 0) -> list:
+    rng = random.Random(seed)
+    per_seg = max(1, n_events // n_segments)
+    segments = []
+    for k in range(n_segments):
+        parts = []
+        for _ in range(per_seg):
+            area = rng.uniform(-150.0, 150.0)
+            part = part_cls(
+                value_dsc=rng.uniform(-1.0, 1.0) if rng.random() < 0.3 else None,
+                value_temp_c=rng.uniform(-20.0, 300.0) if rng.random() < 0.3 else None,
+                onset_c=rng.uniform(-20.0, 300.0),
+                peak_c=rng.uniform(-20.0, 300.0),
+                area_raw=area,
+                area_report=-area,
+                comment="Endothermic" if area < 0 else "Exothermic",
+            )
+            parts.append(part)
+        segments.append(segment_cls(k + 1, n_segments, "-20°C/10.0(K/min)/150°C", "-20°C ➜ 150°C@10K/min", parts))
+    return segments
+
+
+def measure(build: Callable[[], object]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def max_peak_time(segments_or_table, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        if isinstance(segments_or_table, DscEventTable):
+            peaks = segments_or_table.column("peak_c")
+            max(peaks)
+        else:
+            max(p.peak_c for seg in segments_or_table for p in seg.parts)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Memory of parsed DSC events: dict dataclass vs slots vs columnar.")
+    parser.add_argument("--events", type=int, nargs="+", default=[10000, 50000])
+    parser.add_argument("--segments", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    print(f"{'events':>8} {'representation':<16} {'KB':>10} {'B/event':>8} {'max(peak) ms':>13}")
+    for n in args.events:
+        builders: List[tuple] = [
+            ("dict dataclass", lambda: build_segments(n, args.segments, LegacyPart, LegacySegment)),
+            ("slots dataclass", lambda: build_segments(n, args.segments, DscPeakPart, DscSegment)),
+            ("event table", lambda: DscEventTable.from_segments(
+                build_segments(n, args.segments, DscPeakPart, DscSegment))),
+        ]
+        for name, build in builders:
+            size = measure(build)
+            scan_ms = max_peak_time(build()) * 1000
+            print(f"{n:>8} {name:<16} {size / 1024:10.0f} {size / n:8.0f} {scan_ms:13.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
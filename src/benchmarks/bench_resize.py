@@ -0,0 +1,152 @@
+# src/benchmarks/bench_resize.py
+"""
+主窗口拖动缩放的帧时间基准：
+- legacy：旧的 resizeEvent，每个 resize 事件都 findChildren 扫控件树、重设所有字体、重算宽度和网格
+- current：resizeEvent 只在跨过字号档位时启动去抖定时器，档位不变的帧不碰字体
+
+用法（没有显示器时加 QT_QPA_PLATFORM=offscreen）：
+    python -m src.benchmarks.bench_resize --samples 50 --segments 4 --step 4
+
+窗口里先放好 N 个样品和一份 segments 编辑区，然后把宽度从 --min-width 拖到 --max-width 再拖回来，
+每一步 resize + processEvents 记一帧。拖完之后等去抖定时器触发，字体最终落在正确的档位上。
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from PyQt6.QtCore import QEventLoop
+from PyQt6.QtGui import QFont
+from PyQt6.QtWidgets import QApplication, QLabel, QLineEdit, QMessageBox, QTextEdit
+
+from src.benchmarks.synthetic_netzsch import generate_sample
+from src.config.config import FONT_SCALE_DEBOUNCE_MS
+from src.models.models import SampleItem
+from src.ui.ui_main import MainWindow, font_bucket_for_width
+
+
+def build_window(n_samples: int, n_segments: int, workdir: str) -> MainWindow:
+    # 基准里没有真实模板，跳过“找不到模板”的提示框
+    warning = QMessageBox.warning
+    QMessageBox.warning = lambda *args, **kwargs: QMessageBox.StandardButton.Ok
+    try:
+        win = MainWindow()
+    finally:
+        QMessageBox.warning = warning
+
+    synthetic = generate_sample(workdir, 0, n_segments=n_segments, with_pdf=False)
+    win.samples.replace(
+        SampleItem(id=i + 1, name=f"Sample-{i + 1:04d}", txt_path=synthetic.txt_path)
+        for i in range(n_samples)
+    )
+    win.segments_ctrl.build(synthetic.segments)
+    win.step_stack.setCurrentIndex(2)
+    return win
+
+
+def legacy_apply_font_scaling(win: MainWindow) -> None:
+    """旧的 MainWindow._apply_font_scaling（没有档位判断、用 findChildren 找控件），只留作对照。"""
+    app = QApplication.instance()
+    base = font_bucket_for_width(max(win.width(), 900))
+
+    app_font = QFont(app.font())
+    app_font.setPointSize(base)
+    app.setFont(app_font)
+
+    def _set(wdg, size, bold=False):
+        f = QFont(wdg.font())
+        f.setPointSize(size)
+        if bold:
+            f.setBold(True)
+        wdg.setFont(f)
+
+    _set(win.title_label, base + 6, bold=True)
+    for btn in win.step_buttons:
+        _set(btn, base + 2)
+    for lbl in win.findChildren(QLabel, "sectionTitle"):
+        _set(lbl, base + 2, bold=True)
+    for lbl in win.findChildren(QLabel, "SampleManualTitle"):
+        _set(lbl, base + 1, bold=True)
+    for wdg in (win.btn_prev, win.btn_next, win.btn_prev_sample, win.btn_next_sample, win.label_current_sample):
+        _set(wdg, base)
+    for name in ("HeaderLabel", "FieldLabel"):
+        for lbl in win.findChildren(QLabel, name):
+            _set(lbl, base)
+    for wdg in win.findChildren(QLineEdit) + win.findChildren(QTextEdit):
+        _set(wdg, base)
+    for wdg in win._header_field_labels + win._header_field_values + win._header_field_buttons:
+        _set(wdg, base)
+    if win.add_sample_btn is not None:
+        _set(win.add_sample_btn, base)
+
+    win._refresh_auto_edits_width()
+    fm = win.fontMetrics()
+    w_label = max(fm.horizontalAdvance("Template:"), fm.horizontalAdvance("Output:"))
+    win._files_grid.setColumnMinimumWidth(0, w_label + 12)
+    win._sync_files_grid_metrics()
+    win._sync_theme_switch_metrics()
+
+
+def drag_widths(min_width: int, max_width: int, step: int) -> List[int]:
+    forward = list(range(min_width, max_width + 1, step))
+    return forward + forward[::-1]
+
+
+def run_drag(app: QApplication, win: MainWindow, widths: List[int], height: int, legacy: bool) -> Dict[str, float]:
+    frames = []
+    for w in widths:
+        t0 = time.perf_counter()
+        win.resize(w, height)
+        if legacy:
+            legacy_apply_font_scaling(win)
+        app.processEvents()
+        frames.append(time.perf_counter() - t0)
+
+    # 等去抖定时器把最后一次档位变化落下来
+    deadline = time.perf_counter() + FONT_SCALE_DEBOUNCE_MS / 1000 * 3
+    while win._font_scale_timer.isActive() and time.perf_counter() < deadline:
+        app.processEvents(QEventLoop.ProcessEventsFlag.AllEvents, 10)
+
+    frames.sort()
+    return {
+        "frames": len(frames),
+        "median_ms": statistics.median(frames) * 1000,
+        "p95_ms": frames[int(len(frames) * 0.95) - 1] * 1000,
+        "max_ms": frames[-1] * 1000,
+        "total_ms": sum(frames) * 1000,
+        "final_bucket_ok": win._font_bucket == font_bucket_for_width(win.width()),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Frame time while dragging the main window edge.")
+    parser.add_argument("--samples", type=int, default=50, help="样品数（样品列表 / 手动字段表的行数）")
+    parser.add_argument("--segments", type=int, default=4, help="segments 编辑区的段数")
+    parser.add_argument("--min-width", type=int, default=1000)
+    parser.add_argument("--max-width", type=int, default=1900)
+    parser.add_argument("--step", type=int, default=4, help="每帧宽度变化（像素）")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    widths = drag_widths(args.min_width, args.max_width, args.step)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        win = build_window(args.samples, args.segments, workdir)
+        win.resize(args.min_width, 800)
+        win.show()
+        app.processEvents()
+
+        print(f"samples={args.samples} segments={args.segments} frames={len(widths)} "
+              f"width {args.min_width}->{args.max_width}->{args.min_width}")
+        print(f"{'mode':<8} {'median ms':>10} {'p95 ms':>9} {'max ms':>9} {'total ms':>10}  final bucket")
+        for mode in ("legacy", "current"):
+            r = run_drag(app, win, widths, 800, legacy=(mode == "legacy"))
+            print(f"{mode:<8} {r['median_ms']:10.2f} {r['p95_ms']:9.2f} {r['max_ms']:9.2f} {r['total_ms']:10.1f}  "
+                  f"{'ok' if r['final_bucket_ok'] else 'WRONG'}")
+        win.close()
+
+
+if __name__ == "__main__":
+    main()
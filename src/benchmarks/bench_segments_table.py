@@ -0,0 +1,204 @@
+# src/benchmarks/bench_segments_table.py
+"""
+Result and Discussion 表格填充基准：
+- legacy：逐行 append + table.rows[-1]、cell.text 整格重写，再用 table.cell + cell.merge 合并 Sample / Test method 列
+- current：_fill_segment_rows_to_table（批量插入，按预先定位的文本节点写值，建行时直接写 vMerge）
+
+用法：
+    python -m src.benchmarks.bench_segments_table --rows 100 1000 4000 --repeat 3
+
+合成模板：表头行 + 一行 {{SEG_*}} 模板行 + 一行表尾备注。
+每次计时都从同一份模板克隆，计“建行 + 填数据 + 合并 + 居中”的时间。
+"""
+
+import argparse
+import statistics
+import time
+from copy import deepcopy
+from typing import Callable, Dict, List
+
+from docx import Document
+from docx.enum.table import WD_ALIGN_VERTICAL
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+
+from src.utils.template_cache import clone_document
+from src.utils.templating import _fill_row_with_data, _fill_segment_rows_to_table
+
+SEG_COLUMNS = ("SEG_SAMPLE", "SEG_METHOD", "SEG_VALUE", "SEG_ONSET", "SEG_PEAK", "SEG_AREA", "SEG_COMMENT")
+
+
+def build_synthetic_template():
+    doc = Document()
+    doc.add_paragraph("Result and Discussion")
+    table = doc.add_table(rows=3, cols=len(SEG_COLUMNS))
+    for c, name in enumerate(SEG_COLUMNS):
+        table.cell(0, c).text = name.replace("SEG_", "").title()
+        table.cell(1, c).text = f"{{{{{name}}}}}"
+    table.cell(2, 0).text = "Note: n.d. = not detected"
+    return doc
+
+
+def build_rows_data(n_rows: int, events_per_sample: int = 12, parts_per_segment: int = 3) -> List[Dict[str, str]]:
+    rows = []
+    for i in range(n_rows):
+        sample = i // events_per_sample
+        segment = (i % events_per_sample) // parts_per_segment
+        rows.append({
+            "SEG_SAMPLE": f"Sample {sample}",
+            "SEG_METHOD": f"-20°C ➜ {150 + 10 * segment}°C@10K/min",
+            "SEG_VALUE": f"{40 + i % 50:.1f}",
+            "SEG_ONSET": f"{45 + i % 50:.1f}",
+            "SEG_PEAK": f"{50 + i % 50:.1f}",
+            "SEG_AREA": f"{-1.5 - (i % 7) / 10:.3f}",
+            "SEG_COMMENT": "-",
+        })
+    return rows
+
+
+# -----------------------------
+# 旧实现（原样保留，只作对照）
+# -----------------------------
+def _legacy_merge_down_same_text(table, start_row: int, end_row: int, col_idx: int) -> None:
+    """
+    在 table 的第 col_idx 列，从 start_row 到 end_row（含）之间，
+    把“连续文本相同”的单元格纵向合并。
+    合并后只保留一份文本（放在合并后的单元格里）。
+    """
+    if start_row >= end_row:
+        return
+
+    current_text = table.cell(start_row, col_idx).text
+    group_start = start_row
+
+    for r in range(start_row + 1, end_row + 1):
+        cell = table.cell(r, col_idx)
+        text = cell.text
+
+        if text == current_text:
+            # 还在同一组，继续往下
+            continue
+
+        # 结束上一组：如果组里有多行且文本非空，则合并
+        if r - 1 > group_start and current_text != "":
+            top_cell = table.cell(group_start, col_idx)
+            bottom_cell = table.cell(r - 1, col_idx)
+            merged = top_cell.merge(bottom_cell)
+            # 重要：重设一次文本，只留一份
+            merged.text = current_text
+
+        # 开启新的一组
+        current_text = text
+        group_start = r
+
+    # 处理最后一组
+    if end_row > group_start and current_text != "":
+        top_cell = table.cell(group_start, col_idx)
+        bottom_cell = table.cell(end_row, col_idx)
+        merged = top_cell.merge(bottom_cell)
+        merged.text = current_text
+
+def _legacy_merge_method_within_sample(table, start_row: int, end_row: int,
+                                sample_col: int, method_col: int) -> None:
+    """
+    只在“同一个 Sample 且 Test method 文本相同”的连续行里合并 method 列。
+    不会跨样品合并。
+    """
+    if start_row >= end_row:
+        return
+
+    current_sample = table.cell(start_row, sample_col).text
+    current_method = table.cell(start_row, method_col).text
+    group_start = start_row
+
+    for r in range(start_row + 1, end_row + 1):
+        sample_text = table.cell(r, sample_col).text
+        method_text = table.cell(r, method_col).text
+
+        # 只要样品变了，或者方法变了，就结束上一个分组
+        if sample_text != current_sample or method_text != current_method:
+            if r - 1 > group_start and current_method != "":
+                top_cell = table.cell(group_start, method_col)
+                bottom_cell = table.cell(r - 1, method_col)
+                merged = top_cell.merge(bottom_cell)
+                merged.text = current_method
+            # 开启新组
+            current_sample = sample_text
+            current_method = method_text
+            group_start = r
+
+    # 处理最后一组
+    if end_row > group_start and current_method != "":
+        top_cell = table.cell(group_start, method_col)
+        bottom_cell = table.cell(end_row, method_col)
+        merged = top_cell.merge(bottom_cell)
+        merged.text = current_method
+
+
+def legacy_fill(doc, rows_data: List[Dict[str, str]]) -> None:
+    table = doc.tables[0]
+    tpl_row = table.rows[1]
+    tpl_tr_template = deepcopy(tpl_row._tr)
+    _fill_row_with_data(tpl_row, rows_data[0])
+    for data in rows_data[1:]:
+        new_tr = deepcopy(tpl_tr_template)
+        table._tbl.append(new_tr)
+        new_row = table.rows[-1]
+        _fill_row_with_data(new_row, data)
+
+    start_row, end_row = 1, len(rows_data)
+    _legacy_merge_down_same_text(table, start_row, end_row, 0)
+    _legacy_merge_method_within_sample(table, start_row, end_row, 0, 1)
+    for r in range(start_row, end_row + 1):
+        for c in range(len(SEG_COLUMNS)):
+            cell = table.cell(r, c)
+            cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+            for p in cell.paragraphs:
+                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+
+
+def current_fill(doc, rows_data: List[Dict[str, str]]) -> None:
+    _fill_segment_rows_to_table(doc, rows_data)
+
+
+def _time(fn: Callable, master, rows_data, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        doc = clone_document(master)
+        t0 = time.perf_counter()
+        fn(doc, rows_data)
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark Result and Discussion table filling.")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 4000], help="表格行数（可给多个）")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--legacy-max-rows",
+        type=int,
+        default=100,
+        help="旧实现只在行数不超过这个值时运行（它是超线性的，200 行就要几十秒）",
+    )
+    args = parser.parse_args(argv)
+
+    master = build_synthetic_template()
+    engines = {
+        "legacy (rows[-1] + cell.merge)": legacy_fill,
+        "current (bulk + text nodes)": current_fill,
+    }
+
+    for n in args.rows:
+        rows_data = build_rows_data(n)
+        print(f"{n} rows, {args.repeat} runs each")
+        for name, fn in engines.items():
+            if fn is legacy_fill and n > args.legacy_max_rows:
+                print(f"  {name:<32} skipped (> --legacy-max-rows)")
+                continue
+            median = _time(fn, master, rows_data, args.repeat)
+            print(f"  {name:<32} median {median * 1000:9.2f} ms  per row {median * 1e6 / n:8.1f} us")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
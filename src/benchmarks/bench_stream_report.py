@@ -0,0 +1,86 @@
+# src/benchmarks/bench_stream_report.py
+"""
+多样品大报告：doc.save（整棵对象树 + 所有图片在内存里）vs 流式写出（stream=True）。
+
+用法：
+    python -m src.benchmarks.bench_stream_report --samples 25 100 200
+
+合成数据：每个样品 4 个 segment × 3 个 part、一张各不相同的 PNG 曲线图（--image-kb 控制大小）。
+每个 (模式, 样品数) 在单独的子进程里跑一次，报告耗时和子进程的峰值 RSS
+（lxml 的内存不经过 Python 分配器，tracemalloc 看不到，所以看 RSS）。
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from src.benchmarks.synthetic_netzsch import make_report_samples, write_report_template
+from src.utils.templating import fill_template_with_mapping
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位是 KB，macOS 是字节
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_one(workdir: str, n_samples: int, stream: bool, image_kb: int) -> dict:
+    template = os.path.join(workdir, "tpl.docx")
+    if not os.path.exists(template):
+        write_report_template(template)
+    samples = make_report_samples(n_samples, workdir, image_kb)
+    baseline = _peak_rss_mb()
+
+    out = os.path.join(workdir, f"out-{'stream' if stream else 'save'}-{n_samples}.docx")
+    t0 = time.perf_counter()
+    size = fill_template_with_mapping(
+        template, out, {"{{Request_id}}": "R-1"},
+        discussion_text="Discussion.", samples=samples, stream=stream,
+    )
+    return {
+        "seconds": time.perf_counter() - t0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "baseline_rss_mb": baseline,
+        "size_bytes": size,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark in-memory save vs streaming DOCX writer.")
+    parser.add_argument("--samples", type=int, nargs="+", default=[25, 100, 200], help="样品数（可给多个）")
+    parser.add_argument("--image-kb", type=int, default=300, help="每张曲线图的大小（KB）")
+    parser.add_argument("--workdir", type=str, default=None, help="临时文件目录（默认新建临时目录）")
+    parser.add_argument("--one", type=str, choices=("save", "stream"), default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.one:
+        # 子进程：只跑一个组合，结果以 JSON 打到 stdout
+        result = run_one(args.workdir, args.samples[0], args.one == "stream", args.image_kb)
+        print(json.dumps(result))
+        return 0
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bench_stream_")
+    print(f"workdir: {workdir}")
+    for n in args.samples:
+        print(f"{n} samples ({n * 12} table rows, {n} figures of ~{args.image_kb} KB)")
+        for mode in ("save", "stream"):
+            proc = subprocess.run(
+                [sys.executable, "-m", "src.benchmarks.bench_stream_report", "--one", mode,
+                 "--samples", str(n), "--image-kb", str(args.image_kb), "--workdir", workdir],
+                capture_output=True, text=True, check=True,
+            )
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(
+                f"  {mode:<7} {r['seconds']:7.2f} s  "
+                f"peak RSS {r['peak_rss_mb']:7.1f} MB (+{r['peak_rss_mb'] - r['baseline_rss_mb']:6.1f} MB)  "
+                f"docx {r['size_bytes'] / 1024 / 1024:6.1f} MB"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
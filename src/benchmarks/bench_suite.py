@@ -0,0 +1,237 @@
+# src/benchmarks/bench_suite.py
+"""
+端到端基准套件：在合成 NETZSCH 数据（synthetic_netzsch）上给整条流水线计时，结果写成 JSON，
+方便改动前后对比、在 CI 里卡回归。
+
+计时项（每个样品数各跑一遍，取 --repeat 次的中位数）：
+- parse_dsc_txt_basic             逐个样品读基础信息
+- parse_dsc_segments              逐个样品解析 segments（TXT + PDF Range）
+- parse_segment_ranges_from_pdf   逐个样品只读 PDF Range
+- render_pdf_figure               逐个样品渲染曲线图（默认 FigureOptions，不走缓存）
+- fill_template_with_mapping      N 个样品出一份报告（含插图；样品数达到 STREAM_REPORT_MIN_SAMPLES 时流式写出）
+
+用法：
+    python -m src.benchmarks.bench_suite --samples 1 10 100 1000 --output bench.json
+    python -m src.benchmarks.bench_suite --samples 1 10 100 --output new.json --compare bench.json
+    python -m src.benchmarks.bench_suite --samples 10 --cases parse_dsc_segments --compare bench.json --fail-above 1.25
+
+--compare 按 “计时项@样品数” 对齐两份结果，打印 旧 / 新 / 倍数；
+给了 --fail-above 时，只要有一项变慢超过这个倍数就返回 1。
+合成文件生成在 --workdir 里并按参数复用，第二次跑不再重新生成。
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import docx
+import fitz  # PyMuPDF
+
+from src.benchmarks.synthetic_netzsch import SyntheticSample, generate_sample, write_report_template
+from src.models.models import SampleItem
+from src.tools.dsc_services import DscParseService, ReportService, apply_basic_to_sample
+from src.utils.figure_cache import FigureOptions, render_pdf_figure
+from src.utils.parser_dsc import (
+    parse_dsc_segments,
+    parse_dsc_txt_basic,
+    parse_segment_ranges_from_pdf,
+    parser_fingerprint,
+)
+from src.utils.templating import fill_template_with_mapping
+
+SUITE_VERSION = 1
+CASES = (
+    "parse_dsc_txt_basic",
+    "parse_dsc_segments",
+    "parse_segment_ranges_from_pdf",
+    "render_pdf_figure",
+    "fill_template_with_mapping",
+)
+
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pymupdf": getattr(fitz, "VersionBind", ""),
+        "python_docx": getattr(docx, "__version__", ""),
+        "parser": parser_fingerprint(),
+        "git": _git_revision(),
+    }
+
+
+def _report_samples(synthetic: List[SyntheticSample]) -> List[SampleItem]:
+    """合成文件 -> 解析好的 SampleItem（和 GUI / batch_report 一样走 DscParseService）。"""
+    service = DscParseService()
+    samples = []
+    for i, s in enumerate(synthetic):
+        item = SampleItem(id=i, name=s.name, txt_path=s.txt_path, pdf_path=s.pdf_path)
+        apply_basic_to_sample(item, service.parse_one(s.txt_path, s.pdf_path))
+        item.manual_fields.sample_id = f"S{i}"
+        samples.append(item)
+    return samples
+
+
+def build_cases(synthetic: List[SyntheticSample], workdir: str, stream: Optional[bool]) -> Dict[str, Callable[[], None]]:
+    options = FigureOptions()
+    template = os.path.join(workdir, "template.docx")
+    if not os.path.exists(template):
+        write_report_template(template)
+    samples = _report_samples(synthetic)
+    use_stream = ReportService(stream=stream).use_stream(samples)
+    output = os.path.join(workdir, f"report-{len(samples)}.docx")
+
+    def fill() -> None:
+        fill_template_with_mapping(
+            template, output, {"{{Request_id}}": "SYN-1"},
+            discussion_text="Synthetic discussion.", samples=samples, stream=use_stream,
+        )
+
+    return {
+        "parse_dsc_txt_basic": lambda: [parse_dsc_txt_basic(s.txt_path) for s in synthetic],
+        "parse_dsc_segments": lambda: [parse_dsc_segments(s.txt_path, s.pdf_path) for s in synthetic],
+        "parse_segment_ranges_from_pdf": lambda: [parse_segment_ranges_from_pdf(s.pdf_path) for s in synthetic],
+        "render_pdf_figure": lambda: [render_pdf_figure(s.pdf_path, options) for s in synthetic],
+        "fill_template_with_mapping": fill,
+    }
+
+
+def _time(fn: Callable[[], None], repeat: int) -> List[float]:
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - t0)
+    return runs
+
+
+def run_suite(
+    sizes: List[int],
+    workdir: str,
+    repeat: int = 3,
+    cases: Optional[List[str]] = None,
+    n_segments: int = 3,
+    n_peaks: int = 2,
+    n_values: int = 2,
+    stream: Optional[bool] = None,
+    log: Callable[[str], None] = print,
+) -> dict:
+    cases = list(cases or CASES)
+    results = {}
+    for n in sizes:
+        synthetic = [generate_sample(workdir, i, n_segments, n_peaks, n_values) for i in range(n)]
+        fns = build_cases(synthetic, workdir, stream)
+        log(f"{n} sample(s)")
+        for name in cases:
+            runs = _time(fns[name], repeat)
+            median = statistics.median(runs)
+            results[f"{name}@{n}"] = {
+                "case": name,
+                "samples": n,
+                "runs_s": runs,
+                "median_s": median,
+                "per_sample_ms": median * 1000 / n,
+            }
+            log(f"  {name:<32} median {median * 1000:10.2f} ms  per sample {median * 1000 / n:8.3f} ms")
+
+    return {
+        "suite": "dsc-report",
+        "version": SUITE_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "environment": environment(),
+        "config": {
+            "segments": n_segments,
+            "peaks": n_peaks,
+            "values": n_values,
+            "repeat": repeat,
+            "stream": "auto" if stream is None else stream,
+        },
+        "results": results,
+    }
+
+
+def compare(baseline: dict, current: dict, fail_above: Optional[float] = None) -> List[str]:
+    """打印两份结果的对比，返回变慢超过 fail_above 倍的项。"""
+    regressions = []
+    print(f"{'case':<40} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for key, cur in current["results"].items():
+        old = baseline.get("results", {}).get(key)
+        if old is None:
+            print(f"{key:<40} {'-':>12} {cur['median_s'] * 1000:12.2f} {'new':>7}")
+            continue
+        ratio = cur["median_s"] / old["median_s"] if old["median_s"] > 0 else float("inf")
+        flag = ""
+        if fail_above is not None and ratio > fail_above:
+            regressions.append(key)
+            flag = "  <-- slower"
+        print(f"{key:<40} {old['median_s'] * 1000:12.2f} {cur['median_s'] * 1000:12.2f} {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the DSC parse / render / report pipeline on synthetic data.")
+    parser.add_argument("--samples", type=int, nargs="+", default=[1, 10, 100, 1000], help="样品数（可给多个）")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", type=str, nargs="+", choices=CASES, default=None, help="只跑这些计时项")
+    parser.add_argument("--segments", type=int, default=3, help="每个样品的段数")
+    parser.add_argument("--peaks", type=int, default=2, help="每段的 Complex Peak 块数")
+    parser.add_argument("--values", type=int, default=2, help="每段的 Value (DSC) 行数")
+    parser.add_argument(
+        "--stream",
+        choices=("auto", "on", "off"),
+        default="auto",
+        help="fill_template_with_mapping 是否流式写出（auto：样品数 >= STREAM_REPORT_MIN_SAMPLES 时开启）",
+    )
+    parser.add_argument("--workdir", type=str, default=None, help="合成文件目录（默认新建临时目录）")
+    parser.add_argument("--output", type=str, default=None, help="结果 JSON 写到这里")
+    parser.add_argument("--compare", type=str, default=None, help="和这份旧结果 JSON 对比")
+    parser.add_argument("--fail-above", type=float, default=None, help="有一项比旧结果慢超过这个倍数就返回 1")
+    args = parser.parse_args(argv)
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix="bench_suite_")
+    os.makedirs(workdir, exist_ok=True)
+    print(f"workdir: {workdir}")
+
+    stream = {"auto": None, "on": True, "off": False}[args.stream]
+    result = run_suite(
+        args.samples, workdir, repeat=args.repeat, cases=args.cases,
+        n_segments=args.segments, n_peaks=args.peaks, n_values=args.values, stream=stream,
+    )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, result, args.fail_above)
+        if regressions:
+            print(f"{len(regressions)} case(s) slower than {args.fail_above}x: {', '.join(regressions)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,296 @@
+# src/benchmarks/synthetic_netzsch.py
+"""
+合成 NETZSCH DSC 导出文件：PrnRes TXT（UTF-16 + BOM、CRLF）+ 底部带 Range 的曲线 PDF。
+给基准测试和单元测试用，不依赖任何真实样品文件。
+
+- segments / peaks / values 控制每个样品的段数、每段 Complex Peak 块数和 Value (DSC) 行数
+- pdf_extra_segments > 0 时 PDF 的 Range 比 TXT 多几段（测试 apply_pdf_ranges 的补段逻辑）
+- 同一个 seed 生成的文件逐字节相同
+- generate_sample() 同时返回期望的解析结果（DscBasicInfo + DscSegment），测试直接比对
+
+命令行：生成一批样品和一个 batch_report 能直接用的 manifest.json
+    python -m src.benchmarks.synthetic_netzsch out_dir --samples 20 --segments 3 --peaks 2 --values 2
+"""
+
+import argparse
+import json
+import os
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import fitz  # PyMuPDF
+from docx import Document
+
+from src.models.models import DscBasicInfo, DscPeakPart, DscSegment, SampleItem
+from src.utils.parser_dsc import _normalize_segment_desc
+
+SEG_COLUMNS = ("SEG_SAMPLE", "SEG_METHOD", "SEG_VALUE", "SEG_ONSET", "SEG_PEAK", "SEG_AREA", "SEG_COMMENT")
+SAMPLE_COLUMNS = ("Sample_id", "Sample_name", "Nature", "Assign_to")
+
+
+@dataclass
+class SyntheticSample:
+    """一个合成样品：文件路径 + 期望的解析结果。"""
+    name: str
+    txt_path: str
+    pdf_path: Optional[str]
+    basic: DscBasicInfo
+    segments: List[DscSegment]        # 只看 TXT 的期望结果（parse_dsc_segments(txt)）
+    pdf_ranges: List[str]             # PDF 底部的 Range 行
+
+
+def _segment_ranges(n_segments: int, low: int = -20, high: int = 150, rate: float = 10.0) -> List[str]:
+    """升温 / 降温交替：-20°C/10.0(K/min)/150°C、150°C/10.0(K/min)/-20°C、..."""
+    ranges = []
+    for k in range(n_segments):
+        top = high + 10 * (k // 2)
+        start, end = (low, top) if k % 2 == 0 else (top, low)
+        ranges.append(f"{start}°C/{rate:.1f}(K/min)/{end}°C")
+    return ranges
+
+
+def make_prnres_lines(
+    sample_name: str,
+    n_segments: int = 3,
+    n_peaks: int = 2,
+    n_values: int = 2,
+    seed: int = 0,
+) -> Tuple[List[str], DscBasicInfo, List[DscSegment]]:
+    """生成 PrnRes TXT 的所有行，同时返回期望的解析结果。"""
+    rng = random.Random(seed)
+    mass = round(rng.uniform(5.0, 12.0), 3)
+    day, month = rng.randint(1, 28), rng.randint(1, 12)
+
+    lines = [
+        "NETZSCH Proteus Thermal Analysis",
+        "",
+        f"Identity:\t{sample_name}",
+        f"Sample name:\t{sample_name}",
+        f"Sample Mass:\t{mass} mg",
+        "Operator:\tWX",
+        "Instrument:\tDSC 214 Polyma",
+        "Laboratory:\tProcess Safety Lab",
+        "Project:\tSynthetic",
+        "Atmosphere:\tN2",
+        "Crucible:\tConcavus Al, pierced lid",
+        "Reference:\tEmpty crucible",
+        f"Temp.Calib.:\t{day:02d}-{month:02d}-2025 14:25",
+        "Sensitivity:\tSens. 2025-01",
+        f"End Date/Time:\t2025/{month}/{day} 10:57:06 (UTC+8)",
+        "",
+    ]
+    basic = DscBasicInfo(
+        sample_name=sample_name,
+        sample_mass_mg=mass,
+        operator="WX",
+        instrument="DSC 214 Polyma",
+        atmosphere="N2",
+        crucible="Concavus Al",
+        temp_calib=f"2025/{month:02d}/{day:02d}",
+        end_date=f"2025/{month:02d}/{day:02d}",
+    )
+
+    segments: List[DscSegment] = []
+    for k, raw in enumerate(_segment_ranges(n_segments)):
+        lines.append(f"Segments:\t{k + 1}/{n_segments}   :   {raw}")
+        lines.append("")
+        seg = DscSegment(index=k + 1, total=n_segments, raw_desc=raw, desc_display=_normalize_segment_desc(raw))
+
+        peaks = []
+        for _ in range(n_peaks):
+            area = round(rng.uniform(-120.0, 60.0), 3)
+            onset = round(rng.uniform(-10.0, 140.0), 1)
+            peak = round(onset + rng.uniform(1.0, 8.0), 1)
+            lines += [
+                "Complex Peak (DSC)",
+                f"Area\t{area:.3f} J/g",
+                f"Peak:\t{peak:.1f} °C",
+                f"Width:\t{rng.uniform(1.0, 6.0):.1f} °C",
+                f"Height:\t{rng.uniform(0.01, 2.0):.4f} mW/mg",
+                f"Onset:\t{onset:.1f} °C",
+                f"End:\t{peak + rng.uniform(1.0, 5.0):.1f} °C",
+                "",
+            ]
+            peaks.append((area, peak, onset))
+
+        temps = []
+        for _ in range(n_values):
+            temp = round(rng.uniform(-10.0, 140.0), 1)
+            lines.append(f"Value (DSC)\t{rng.uniform(-1.0, 1.0):.4f} mW/mg\t{temp:.1f} °C")
+            temps.append(temp)
+        lines.append("")
+
+        for i in range(max(n_peaks, n_values)):
+            part = DscPeakPart()
+            if i < n_peaks:
+                area, peak, onset = peaks[i]
+                part.onset_c, part.peak_c, part.area_raw, part.area_report = onset, peak, area, -area
+                part.comment = "Endothermic" if -area > 0 else ("Exothermic" if -area < 0 else "")
+            if i < n_values:
+                part.value_temp_c = temps[i]
+            seg.parts.append(part)
+        segments.append(seg)
+
+    return lines, basic, segments
+
+
+def write_prnres_txt(path: str, lines: List[str]) -> None:
+    """NETZSCH 的写法：UTF-16（带 BOM）、CRLF 换行。"""
+    with open(path, "w", encoding="utf-16", newline="") as f:
+        f.write("\r\n".join(lines) + "\r\n")
+
+
+def write_range_pdf(path: str, sample_name: str, ranges: List[str], seed: int = 0) -> None:
+    """
+    一页横版 PDF：标题、坐标轴、一条 DSC 曲线（矢量折线），底部是
+        Range
+        -20°C/10.0(K/min)/150°C
+        ...
+    文字用 PDF 内置字体（° 在 Latin-1 里），parse_segment_ranges_from_pdf 能原样读出。
+    """
+    rng = random.Random(seed)
+    doc = fitz.open()
+    page = doc.new_page(width=842, height=595)
+    page.insert_text((60, 40), f"DSC measurement - {sample_name}", fontsize=14)
+
+    left, top, right, bottom = 60, 60, 780, 420
+    page.draw_rect(fitz.Rect(left, top, right, bottom), color=(0, 0, 0), width=0.8)
+    points = []
+    y = (top + bottom) / 2
+    for i in range(400):
+        x = left + (right - left) * i / 399
+        y += rng.uniform(-3, 3)
+        if rng.random() < 0.01:
+            y += rng.choice((-1, 1)) * rng.uniform(20, 60)
+        y = min(bottom - 5, max(top + 5, y))
+        points.append(fitz.Point(x, y))
+    page.draw_polyline(points, color=(0.1, 0.3, 0.8), width=1.0)
+
+    text_y = 450
+    page.insert_text((60, text_y), "Range", fontsize=9)
+    for r in ranges:
+        text_y += 12
+        page.insert_text((60, text_y), r, fontsize=9)
+    doc.save(path)
+    doc.close()
+
+
+def generate_sample(
+    out_dir: str,
+    index: int,
+    n_segments: int = 3,
+    n_peaks: int = 2,
+    n_values: int = 2,
+    pdf_extra_segments: int = 0,
+    with_pdf: bool = True,
+    seed: Optional[int] = None,
+) -> SyntheticSample:
+    """在 out_dir 下生成第 index 个样品的 TXT（+ PDF），已存在且参数相同时直接复用。"""
+    seed = index if seed is None else seed
+    name = f"SYN{index:04d}"
+    tag = f"s{n_segments}p{n_peaks}v{n_values}x{pdf_extra_segments}r{seed}"
+    txt_path = os.path.join(out_dir, f"PrnRes_{name}_{tag}.txt")
+    pdf_path = os.path.join(out_dir, f"{name}_{tag}.pdf") if with_pdf else None
+
+    lines, basic, segments = make_prnres_lines(name, n_segments, n_peaks, n_values, seed)
+    ranges = _segment_ranges(n_segments + pdf_extra_segments)
+    if not os.path.exists(txt_path):
+        write_prnres_txt(txt_path, lines)
+    if pdf_path and not os.path.exists(pdf_path):
+        write_range_pdf(pdf_path, name, ranges, seed)
+
+    return SyntheticSample(name, txt_path, pdf_path, basic, segments, ranges if with_pdf else [])
+
+
+def write_report_template(path: str) -> None:
+    """最小报告模板：Request 段落、样品信息表、Result and Discussion 表、{{Discussion}}。"""
+    doc = Document()
+    doc.add_paragraph("Request: {{Request_id}}")
+    samples = doc.add_table(rows=2, cols=len(SAMPLE_COLUMNS))
+    for c, name in enumerate(SAMPLE_COLUMNS):
+        samples.cell(0, c).text = name
+        samples.cell(1, c).text = f"{{{{{name}}}}}"
+    doc.add_paragraph("Result and Discussion")
+    table = doc.add_table(rows=2, cols=len(SEG_COLUMNS))
+    for c, name in enumerate(SEG_COLUMNS):
+        table.cell(0, c).text = name.replace("SEG_", "").title()
+        table.cell(1, c).text = f"{{{{{name}}}}}"
+    doc.add_paragraph("{{Discussion}}")
+    doc.save(path)
+
+
+def make_report_samples(n_samples: int, image_dir: str, image_kb: int) -> List[SampleItem]:
+    """
+    已经“解析好”的样品（不走 TXT）：每个 4 段 × 3 个 part，pdf_path 指向一张各不相同的随机像素 PNG，
+    大小约 image_kb KB。给多样品大报告的基准和 docx 写出的测试用。
+    """
+    # 随机像素的 PNG 几乎压缩不了，文件大小约等于 宽 × 高 × 3
+    side = max(16, int((image_kb * 1024 / 3) ** 0.5))
+    samples = []
+    for i in range(n_samples):
+        png_path = os.path.join(image_dir, f"curve_{i:04d}.png")
+        if not os.path.exists(png_path):
+            pix = fitz.Pixmap(fitz.csRGB, side, side, os.urandom(side * side * 3), False)
+            pix.save(png_path)
+
+        segments = []
+        for k in range(4):
+            parts = [
+                DscPeakPart(value_temp_c=40.0 + j, onset_c=45.0 + j, peak_c=50.0 + j,
+                            area_report=-1.5 - j / 10, comment="Endothermic")
+                for j in range(3)
+            ]
+            segments.append(DscSegment(k + 1, 4, "", f"-20°C ➜ {150 + 10 * k}°C@10K/min", parts))
+
+        sample = SampleItem(id=i, name=f"Sample {i}", txt_path="", pdf_path=png_path, segments=segments)
+        sample.manual_fields.sample_id = f"S{i}"
+        samples.append(sample)
+    return samples
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate synthetic NETZSCH PrnRes TXT + Range PDF files.")
+    parser.add_argument("out_dir", type=str, help="输出目录")
+    parser.add_argument("--samples", type=int, default=10)
+    parser.add_argument("--segments", type=int, default=3, help="每个样品的段数")
+    parser.add_argument("--peaks", type=int, default=2, help="每段的 Complex Peak 块数")
+    parser.add_argument("--values", type=int, default=2, help="每段的 Value (DSC) 行数")
+    parser.add_argument("--pdf-extra-segments", type=int, default=0, help="PDF Range 比 TXT 多出的段数")
+    parser.add_argument("--no-pdf", action="store_true", help="只生成 TXT")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    template = os.path.join(args.out_dir, "template.docx")
+    write_report_template(template)
+
+    manifest_samples = []
+    for i in range(args.samples):
+        s = generate_sample(
+            args.out_dir, i, args.segments, args.peaks, args.values,
+            pdf_extra_segments=args.pdf_extra_segments, with_pdf=not args.no_pdf,
+        )
+        entry = {"txt": os.path.basename(s.txt_path), "name": s.name, "sample_id": f"S{i}"}
+        if s.pdf_path:
+            entry["pdf"] = os.path.basename(s.pdf_path)
+        manifest_samples.append(entry)
+
+    manifest = {
+        "template": "template.docx",
+        "reports": [{
+            "output": "synthetic-report.docx",
+            "request": {"Request_id": "SYN-1"},
+            "samples": manifest_samples,
+        }],
+    }
+    manifest_path = os.path.join(args.out_dir, "manifest.json")
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+    print(f"Generated {args.samples} sample(s) in {args.out_dir}")
+    print(f"Batch: python -m src.tools.batch_report {manifest_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
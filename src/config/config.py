@@ -1,4 +1,5 @@
 from pathlib import Path
+import os
 import sys
 
 THIS_FILE = Path(__file__).resolve()
@@ -21,4 +22,43 @@ ASSETS_DIR = SRC_DIR / "assets"
 
 DEFAULT_TEMPLATE_PATH = DATA_DIR / "DSC Report-Empty-2512.docx"
 LOGO_PATH = ASSETS_DIR / "logo.png"
-QSS_PATH = ASSETS_DIR / "app.qss"  # 如果你也有 qss
\ No newline at end of file
+QSS_PATH = ASSETS_DIR / "app.qss"  # 如果你也有 qss
+
+def _get_cache_dir() -> Path:
+    """
+    本地缓存目录（解析结果缓存等）：
+    - 可以用环境变量 DSC_REPORT_CACHE_DIR 覆盖
+    - 默认放在用户目录下（打包运行时 _MEIPASS 是临时解包目录，不能放缓存）
+    """
+    env = os.environ.get("DSC_REPORT_CACHE_DIR")
+    if env:
+        return Path(env).expanduser()
+    return Path.home() / ".dsc_report_tool" / "cache"
+
+
+CACHE_DIR = _get_cache_dir()
+PARSE_CACHE_MAX_BYTES = 64 * 1024 * 1024   # 解析结果缓存上限，超出按 LRU 淘汰
+FIGURE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # DSC 曲线渲染图缓存上限
+FIGURE_MODE = "raster"                      # 插图模式：raster / vector / target-size
+FIGURE_DPI = 250                            # PDF 曲线图渲染分辨率
+FIGURE_FORMAT = "png"                       # 插图格式：png / jpeg / png-gray / png-palette
+FIGURE_JPEG_QUALITY = 85
+FIGURE_MAX_BYTES = 300 * 1024               # target-size 模式下每张图的字节上限
+FIGURE_VECTOR_FALLBACK_DPI = 96             # vector 模式下给不支持 SVG 的 Word 看的备用位图
+STREAM_REPORT_MIN_SAMPLES = 100             # 样品数达到这个值时自动改用流式写出 docx
+
+# fill_template_with_mapping 的阶段名（按执行顺序），progress 回调会依次收到。
+# 放在这里而不是 templating.py：GUI 的进度条要用，但不该为此在启动时就导入 python-docx
+REPORT_STAGES = ("tables", "discussion", "figures", "placeholders", "save")
+
+# GUI 生成报告时记录各阶段耗时：环境变量 DSC_REPORT_PROFILE=1 打开。
+# 生成成功后在提示框的 Details 里显示分解，并在 docx 旁边写 <报告名>.trace.json（Chrome trace）
+PROFILE_REPORTS = os.environ.get("DSC_REPORT_PROFILE", "") not in ("", "0")
+
+# 窗口显示之后，在后台线程里预先导入 PyMuPDF / python-docx / lxml（启动路径上它们都是延迟导入的）
+PREWARM_HEAVY_IMPORTS = True
+PREWARM_DELAY_MS = 500                      # 窗口显示后等多久再开始预热，先让首帧画完
+
+# 主窗口字体随窗口宽度分档：(最小宽度, 基础字号)，从大到小匹配
+FONT_SCALE_BUCKETS = ((1700, 20), (1300, 18), (0, 16))
+FONT_SCALE_DEBOUNCE_MS = 80                 # 拖动窗口边缘时，档位变化后等这么久没有新的 resize 才重设字体
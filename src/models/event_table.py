@@ -0,0 +1,219 @@
+# src/models/event_table.py
+"""
+一个样品所有 event（DscPeakPart）的列式存储：
+
+- 每个数值字段一列 array('d')（缺失值存 NaN），comment 一个 list，段边界存在 offsets 里：
+  第 si 段的 event 是 [offsets[si], offsets[si + 1])
+- 一个 event 大约 56 字节（6 个 double + 一个 comment 引用），dict 版 dataclass 每个 part 要好几百字节
+- column(field, si) 返回 memoryview 切片，不复制，汇总 / 出表时可以整列读
+- segments 是兼容视图：DscSegmentList / DscSegmentView / DscPartView 的属性名和 DscSegment / DscPeakPart 一样，
+  读写直接落到列上，现有按属性访问的代码（Segments 编辑表、出表、discussion 文案）不用改
+- 表建好之后 event 数量不再变（只改值）；要增删 event 就 to_segments() 转回 dataclass 再重建
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Iterator, List, Optional, Sequence, Union
+
+from src.models.models import DscPeakPart, DscSegment
+
+EVENT_FLOAT_FIELDS = ("value_dsc", "value_temp_c", "onset_c", "peak_c", "area_raw", "area_report")
+_NAN = float("nan")
+
+
+def _pack(value: Optional[float]) -> float:
+    return _NAN if value is None else float(value)
+
+
+def _unpack(value: float) -> Optional[float]:
+    return None if value != value else value
+
+
+class DscEventTable:
+    __slots__ = ("columns", "comments", "offsets", "seg_index", "seg_total", "seg_raw_desc", "seg_desc_display")
+
+    def __init__(self) -> None:
+        self.columns = {name: array("d") for name in EVENT_FLOAT_FIELDS}
+        self.comments: List[str] = []
+        self.offsets = array("q", [0])
+        self.seg_index = array("i")
+        self.seg_total = array("i")
+        self.seg_raw_desc: List[str] = []
+        self.seg_desc_display: List[str] = []
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[DscSegment]) -> "DscEventTable":
+        table = cls()
+        for seg in segments:
+            table.append_segment(seg.index, seg.total, seg.raw_desc, seg.desc_display, seg.parts)
+        return table
+
+    def append_segment(
+        self, index: int, total: int, raw_desc: str, desc_display: str, parts: Iterable[DscPeakPart]
+    ) -> None:
+        for part in parts:
+            for name in EVENT_FLOAT_FIELDS:
+                self.columns[name].append(_pack(getattr(part, name)))
+            self.comments.append(part.comment)
+        self.offsets.append(len(self.comments))
+        self.seg_index.append(index)
+        self.seg_total.append(total)
+        self.seg_raw_desc.append(raw_desc)
+        self.seg_desc_display.append(desc_display)
+
+    def to_segments(self) -> List[DscSegment]:
+        """转回普通的 dataclass（序列化、要增删 event 时用）。"""
+        return [seg.to_segment() for seg in self.segments]
+
+    # -----------------------------
+    # 按行 / 按列访问
+    # -----------------------------
+    def __len__(self) -> int:
+        return len(self.comments)
+
+    @property
+    def n_segments(self) -> int:
+        return len(self.seg_index)
+
+    @property
+    def segments(self) -> "DscSegmentList":
+        return DscSegmentList(self)
+
+    def segment_rows(self, si: int) -> range:
+        return range(self.offsets[si], self.offsets[si + 1])
+
+    def column(self, name: str, si: Optional[int] = None) -> memoryview:
+        """某个数值字段的整列（si 给了就只取这一段），缺失值是 NaN。"""
+        view = memoryview(self.columns[name])
+        if si is None:
+            return view
+        return view[self.offsets[si]:self.offsets[si + 1]]
+
+    def get(self, row: int, name: str):
+        if name == "comment":
+            return self.comments[row]
+        return _unpack(self.columns[name][row])
+
+    def set(self, row: int, name: str, value) -> None:
+        if name == "comment":
+            self.comments[row] = value
+        else:
+            self.columns[name][row] = _pack(value)
+
+
+class DscPartView:
+    """DscPeakPart 的兼容视图：表里的一行。"""
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: DscEventTable, row: int):
+        self._table = table
+        self._row = row
+
+    def _field_property(name: str):
+        def fget(self):
+            return self._table.get(self._row, name)
+
+        def fset(self, value) -> None:
+            self._table.set(self._row, name, value)
+
+        return property(fget, fset)
+
+    value_dsc = _field_property("value_dsc")
+    value_temp_c = _field_property("value_temp_c")
+    onset_c = _field_property("onset_c")
+    peak_c = _field_property("peak_c")
+    area_raw = _field_property("area_raw")
+    area_report = _field_property("area_report")
+    comment = _field_property("comment")
+    del _field_property
+
+    def to_part(self) -> DscPeakPart:
+        return DscPeakPart(
+            **{name: self._table.get(self._row, name) for name in EVENT_FLOAT_FIELDS},
+            comment=self.comment,
+        )
+
+    def __repr__(self) -> str:
+        return f"DscPartView({self.to_part()!r})"
+
+
+class _PartsView(Sequence):
+    """一段里的所有 part（DscSegment.parts 的兼容视图），按下标现取 DscPartView。"""
+
+    __slots__ = ("_table", "_rows")
+
+    def __init__(self, table: DscEventTable, rows: range):
+        self._table = table
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            return [DscPartView(self._table, row) for row in self._rows[i]]
+        return DscPartView(self._table, self._rows[i])
+
+    def __iter__(self) -> Iterator[DscPartView]:
+        table = self._table
+        return (DscPartView(table, row) for row in self._rows)
+
+
+class DscSegmentView:
+    """DscSegment 的兼容视图：表里的一段。"""
+
+    __slots__ = ("_table", "_si")
+
+    def __init__(self, table: DscEventTable, si: int):
+        self._table = table
+        self._si = si
+
+    @property
+    def index(self) -> int:
+        return self._table.seg_index[self._si]
+
+    @property
+    def total(self) -> int:
+        return self._table.seg_total[self._si]
+
+    @property
+    def raw_desc(self) -> str:
+        return self._table.seg_raw_desc[self._si]
+
+    @property
+    def desc_display(self) -> str:
+        return self._table.seg_desc_display[self._si]
+
+    @property
+    def parts(self) -> _PartsView:
+        return _PartsView(self._table, self._table.segment_rows(self._si))
+
+    def to_segment(self) -> DscSegment:
+        return DscSegment(
+            index=self.index,
+            total=self.total,
+            raw_desc=self.raw_desc,
+            desc_display=self.desc_display,
+            parts=[part.to_part() for part in self.parts],
+        )
+
+    def __repr__(self) -> str:
+        return f"DscSegmentView(index={self.index}, desc_display={self.desc_display!r}, parts={len(self.parts)})"
+
+
+class DscSegmentList(Sequence):
+    """List[DscSegment] 的兼容视图（SampleItem.segments 存的就是它）。"""
+
+    __slots__ = ("table",)
+
+    def __init__(self, table: DscEventTable):
+        self.table = table
+
+    def __len__(self) -> int:
+        return self.table.n_segments
+
+    def __getitem__(self, i: Union[int, slice]):
+        if isinstance(i, slice):
+            return [DscSegmentView(self.table, si) for si in range(self.table.n_segments)[i]]
+        return DscSegmentView(self.table, range(self.table.n_segments)[i])
@@ -1,8 +1,10 @@
 # src/models.py
+# 所有模型都用 slots=True：没有实例 __dict__，样品 / event 多的时候内存小很多
+# （一个样品全部 event 的紧凑列式存储见 src/models/event_table.py）
 from dataclasses import dataclass, field
-from typing import Optional, List
+from typing import Optional, List, Sequence
 
-@dataclass
+@dataclass(slots=True)
 class DscBasicInfo:
     """保存从 DSC txt 解析出来的基础信息。"""
     sample_name: str = ""
@@ -15,7 +17,7 @@ class DscBasicInfo:
     end_date: str = ""     # 例如 '2025/05/06'
 
 
-@dataclass
+@dataclass(slots=True)
 class DscPeakPart:
     """
     每个小 peak / 小 part 的信息：
@@ -33,7 +35,7 @@ class DscPeakPart:
     comment: str = ""                      # Endothermic / Exothermic / 空
 
 
-@dataclass
+@dataclass(slots=True)
 class DscSegment:
     """
     每一段 Segment 的信息：
@@ -49,7 +51,7 @@ class DscSegment:
     parts: List[DscPeakPart] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class AutoFields:
     """
     右侧“自动识别字段”在 UI 中展示/编辑的最终值。
@@ -65,7 +67,7 @@ class AutoFields:
     end_date: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleManualFields:
     """
     左下 Sample information 区域中，每个样品对应的手动输入字段。
@@ -75,7 +77,7 @@ class SampleManualFields:
     assign_to: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class SampleItem:
     id: int
     name: str           # UI 显示用 Sample name
@@ -83,7 +85,8 @@ class SampleItem:
     pdf_path: Optional[str] = None
 
     basic_info: Optional["DscBasicInfo"] = None
-    segments: List["DscSegment"] = field(default_factory=list)
+    # 解析后是 DscSegmentList（列式存储的兼容视图，见 event_table.py），用法和 List[DscSegment] 一样
+    segments: Sequence["DscSegment"] = field(default_factory=list)
     auto_fields: AutoFields = field(default_factory=AutoFields)
 
     # 新增：每个样品自己的手动信息
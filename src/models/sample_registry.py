@@ -0,0 +1,207 @@
+# src/models/sample_registry.py
+"""
+样品集合（原来是 MainWindow.samples 这个 list，按 id 找样品、找行号都要从头扫）：
+
+- 顺序稳定：按加入顺序排列，删除不打乱其余样品的先后
+- 按 id 取样品 / 取行号、按显示名、按文件内容哈希查找都是 O(1)
+  （删除样品时要把后面样品的行号往前挪，这一步是 O(n)，但只发生在用户确认删除时）
+- 内容哈希由后台的 ParseTask 顺带算好（sample_content_hash，ParseCache 刚读过文件，sha256 有缓存），
+  解析完成时 set_content_hash() 记进索引；这里的查找不碰文件，GUI 线程上不做 IO
+- 增删改都会通知订阅者：listener(event, row, sample)，event 见下面的 SAMPLE_* 常量；
+  “about_to_*” 在改动之前发，Qt model 正好拿来包 begin/end Insert/RemoveRows
+"""
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from src.models.models import SampleItem
+from src.utils.disk_cache import file_digest, make_key
+
+SAMPLE_ABOUT_TO_INSERT = "about_to_insert"
+SAMPLE_INSERTED = "inserted"
+SAMPLE_ABOUT_TO_REMOVE = "about_to_remove"
+SAMPLE_REMOVED = "removed"
+SAMPLE_CHANGED = "changed"              # 改名 / 解析完成 / 开始解析：只影响这一行
+SAMPLE_ABOUT_TO_RESET = "about_to_reset"
+SAMPLE_RESET = "reset"                  # 整个集合被换掉（row = -1，sample = None）
+
+SampleListener = Callable[[str, int, Optional[SampleItem]], None]
+
+
+def sample_content_hash(txt_path: str, pdf_path: Optional[str] = None) -> Optional[str]:
+    """TXT（+ PDF）内容的哈希；文件读不到时返回 None。同一份数据换个路径 / 名字也能认出来。要读文件，别在 GUI 线程里调。"""
+    try:
+        return make_key(file_digest(txt_path), file_digest(pdf_path) if pdf_path else "-")
+    except OSError:
+        return None
+
+
+class SampleRegistry:
+    """
+    GUI 里的样品集合；可以像 list 一样遍历、len()、按行号下标取，
+    但增删改必须走 add / remove / rename / mark_changed / replace，索引和订阅者才能跟上。
+    """
+
+    def __init__(self, samples: Iterable[SampleItem] = ()):
+        self._items: List[SampleItem] = []
+        self._by_id: Dict[int, SampleItem] = {}
+        self._row_of: Dict[int, int] = {}
+        # 名字 / 内容哈希可能重复：值是按加入顺序排列的 id 集合（dict 当有序 set 用）
+        self._by_name: Dict[str, Dict[int, None]] = {}
+        self._by_hash: Dict[str, Dict[int, None]] = {}
+        self._hash_of: Dict[int, str] = {}
+        self._listeners: List[SampleListener] = []
+        self._next_id = 1
+        self._extend(samples)
+
+    # -----------------------------
+    # 订阅
+    # -----------------------------
+    def subscribe(self, listener: SampleListener) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener: SampleListener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notify(self, event: str, row: int, sample: Optional[SampleItem]) -> None:
+        for listener in list(self._listeners):
+            listener(event, row, sample)
+
+    # -----------------------------
+    # 只读：像 list 一样用
+    # -----------------------------
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[SampleItem]:
+        return iter(self._items)
+
+    def __getitem__(self, row: int) -> SampleItem:
+        return self._items[row]
+
+    def __contains__(self, sample_id: object) -> bool:
+        return sample_id in self._by_id
+
+    def get(self, sample_id: Optional[int]) -> Optional[SampleItem]:
+        return self._by_id.get(sample_id) if sample_id is not None else None
+
+    def at(self, row: int) -> Optional[SampleItem]:
+        return self._items[row] if 0 <= row < len(self._items) else None
+
+    def index_of(self, sample_id: Optional[int]) -> int:
+        """行号（从 0 开始），没有这个样品时返回 -1。"""
+        return self._row_of.get(sample_id, -1) if sample_id is not None else -1
+
+    def find_by_name(self, name: str) -> List[SampleItem]:
+        return [self._by_id[sid] for sid in self._by_name.get(name, ())]
+
+    def find_by_content_hash(self, content_hash: str) -> List[SampleItem]:
+        """内容哈希相同的样品（比如同一个文件被加了两次）；还没解析完的样品不在里面。"""
+        return [self._by_id[sid] for sid in self._by_hash.get(content_hash, ())]
+
+    def content_hash_of(self, sample_id: int) -> Optional[str]:
+        return self._hash_of.get(sample_id)
+
+    def new_id(self) -> int:
+        """给新样品分配 id（只增不减，删掉的 id 不会复用）。"""
+        sid = self._next_id
+        self._next_id += 1
+        return sid
+
+    # -----------------------------
+    # 修改
+    # -----------------------------
+    def add(self, sample: SampleItem) -> int:
+        """追加到末尾，返回行号。"""
+        if sample.id in self._by_id:
+            raise ValueError(f"duplicate sample id: {sample.id}")
+        row = len(self._items)
+        self._notify(SAMPLE_ABOUT_TO_INSERT, row, sample)
+        self._index(sample, row)
+        self._notify(SAMPLE_INSERTED, row, sample)
+        return row
+
+    def remove(self, sample_id: int) -> Optional[SampleItem]:
+        row = self.index_of(sample_id)
+        if row < 0:
+            return None
+        sample = self._items[row]
+        self._notify(SAMPLE_ABOUT_TO_REMOVE, row, sample)
+
+        del self._items[row]
+        del self._by_id[sample_id]
+        del self._row_of[sample_id]
+        for r in range(row, len(self._items)):
+            self._row_of[self._items[r].id] = r
+        self._discard(self._by_name, sample.name, sample_id)
+        content_hash = self._hash_of.pop(sample_id, None)
+        if content_hash:
+            self._discard(self._by_hash, content_hash, sample_id)
+
+        self._notify(SAMPLE_REMOVED, row, sample)
+        return sample
+
+    def rename(self, sample_id: int, name: str) -> None:
+        sample = self._by_id.get(sample_id)
+        if sample is None:
+            return
+        if name != sample.name:
+            self._discard(self._by_name, sample.name, sample_id)
+            sample.name = name
+            self._by_name.setdefault(name, {})[sample_id] = None
+        self._notify(SAMPLE_CHANGED, self._row_of[sample_id], sample)
+
+    def mark_changed(self, sample_id: int) -> None:
+        """样品的解析状态 / 结果变了：通知订阅者刷新这一行（txt/pdf 路径在样品加入后不会再改）。"""
+        sample = self._by_id.get(sample_id)
+        if sample is not None:
+            self._notify(SAMPLE_CHANGED, self._row_of[sample_id], sample)
+
+    def set_content_hash(self, sample_id: int, content_hash: Optional[str]) -> None:
+        """解析完成时记下样品的内容哈希（None：文件读不到）。不通知订阅者，列表显示不变。"""
+        if sample_id not in self._by_id:
+            return
+        old = self._hash_of.pop(sample_id, None)
+        if old:
+            self._discard(self._by_hash, old, sample_id)
+        if content_hash:
+            self._hash_of[sample_id] = content_hash
+            self._by_hash.setdefault(content_hash, {})[sample_id] = None
+
+    def replace(self, samples: Iterable[SampleItem]) -> None:
+        """整个换掉（比如打开另一个项目）。"""
+        self._notify(SAMPLE_ABOUT_TO_RESET, -1, None)
+        self._items.clear()
+        self._by_id.clear()
+        self._row_of.clear()
+        self._by_name.clear()
+        self._by_hash.clear()
+        self._hash_of.clear()
+        self._extend(samples)
+        self._notify(SAMPLE_RESET, -1, None)
+
+    # -----------------------------
+    # 索引维护
+    # -----------------------------
+    def _extend(self, samples: Iterable[SampleItem]) -> None:
+        for sample in samples:
+            if sample.id in self._by_id:
+                raise ValueError(f"duplicate sample id: {sample.id}")
+            self._index(sample, len(self._items))
+
+    def _index(self, sample: SampleItem, row: int) -> None:
+        self._items.append(sample)
+        self._by_id[sample.id] = sample
+        self._row_of[sample.id] = row
+        self._by_name.setdefault(sample.name, {})[sample.id] = None
+        self._next_id = max(self._next_id, sample.id + 1)
+
+    @staticmethod
+    def _discard(index: Dict[str, Dict[int, None]], key: str, sample_id: int) -> None:
+        ids = index.get(key)
+        if ids is None:
+            return
+        ids.pop(sample_id, None)
+        if not ids:
+            del index[key]
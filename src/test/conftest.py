@@ -0,0 +1,43 @@
+import pytest
+
+TXT_LINES = [
+    "Sample name:\tCF130G",
+    "Sample Mass:\t8.496 mg",
+    "Operator:\tWX",
+    "Instrument:\tDSC 214 Polyma",
+    "Atmosphere:\tN2",
+    "Crucible:\tConcavus Al, pierced lid",
+    "Temp.Calib.:\t09-04-2025 14:25",
+    "End Date/Time:\t2025/5/6 10:57:06 (UTC+8)",
+    "",
+    "Segments:\t1/2   :   -20°C/10.0(K/min)/150°C",
+    "Complex Peak (DSC)",
+    "Area\t-45.120 J/g",
+    "Peak:\t21.5 °C",
+    "Width:\t3.2 °C",
+    "Onset:\t18.2 °C",
+    "Value (DSC)\t0.1234 mW/mg\t15.3 °C",
+    "Value (DSC)\t0.2345 mW/mg\t40.1 °C",
+    "Segments:\t2/2   :   150°C/10.0(K/min)/-20°C",
+    "Complex Peak (DSC)",
+    "Area\t12.500 J/g",
+    "Peak:\t80.0 °C",
+    "Onset:\t85.0 °C",
+]
+
+
+@pytest.fixture
+def make_dsc_txt(tmp_path):
+    """按指定编码写出下面 dsc_txt_path 那份 TXT，返回路径。"""
+    def _write(encoding="utf-16"):
+        path = tmp_path / "PrnRes_CF130G.txt"
+        path.write_text("\r\n".join(TXT_LINES) + "\r\n", encoding=encoding)
+        return str(path)
+
+    return _write
+
+
+@pytest.fixture
+def dsc_txt_path(make_dsc_txt):
+    """一个两段、三个 Complex Peak 的最小 PrnRes TXT（UTF-16）。"""
+    return make_dsc_txt()
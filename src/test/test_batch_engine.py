@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from src.benchmarks.synthetic_netzsch import generate_sample, write_report_template
+from src.tools.batch_engine import _kill_executor, run_batch
+from src.tools.batch_report import ReportJob, SampleSpec
+
+
+def _bad_job(tmp_path, name):
+    return ReportJob(
+        output_path=str(tmp_path / f"{name}.docx"),
+        template_path=str(tmp_path / "missing-template.docx"),
+        samples=[SampleSpec(txt_path=str(tmp_path / "missing.txt"))],
+    )
+
+
+def _good_job(tmp_path, name):
+    template = tmp_path / "template.docx"
+    if not template.exists():
+        write_report_template(str(template))
+    sample = generate_sample(str(tmp_path), 0, n_segments=2)
+    return ReportJob(
+        output_path=str(tmp_path / f"{name}.docx"),
+        template_path=str(template),
+        samples=[SampleSpec(txt_path=sample.txt_path, pdf_path=sample.pdf_path, name=sample.name)],
+    )
+
+
+class _CrashOnUnpickle:
+    """放进 job 里：worker 进程反序列化任务时直接退出，进程池随之损坏。"""
+
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+def test_reports_are_generated_in_worker_processes(tmp_path):
+    jobs = [_good_job(tmp_path, f"r{i}") for i in range(2)]
+
+    summary = run_batch(jobs, workers=2, use_cache=False)
+
+    assert summary.succeeded == 2
+    assert all(r.size_bytes == os.path.getsize(r.output_path) for r in summary.results)
+
+
+@pytest.mark.skipif(not hasattr(os, "mkfifo"), reason="needs a FIFO")
+def test_timeout_kills_pool_and_requeues_siblings(tmp_path):
+    hung = _good_job(tmp_path, "hung")
+    fifo = tmp_path / "hung.txt"
+    os.mkfifo(fifo)     # 没有写端：worker 打开它时一直阻塞
+    hung.samples = [SampleSpec(txt_path=str(fifo))]
+    jobs = [hung, _good_job(tmp_path, "a"), _good_job(tmp_path, "b")]
+
+    summary = run_batch(jobs, workers=2, timeout=5, use_cache=False)
+
+    assert [r.ok for r in summary.results] == [False, True, True]
+    assert summary.results[0].error == "Timeout after 5s"
+
+
+def test_broken_pool_only_fails_the_job_that_breaks_it(tmp_path):
+    jobs = [_good_job(tmp_path, f"r{i}") for i in range(3)]
+    jobs[1].request = {"crash": _CrashOnUnpickle()}
+
+    summary = run_batch(jobs, workers=2, use_cache=False)
+
+    # r0 和崩掉的 r1 同时在池子里，也会收到 BrokenProcessPool；单独重跑一次就好了
+    assert [r.ok for r in summary.results] == [True, False, True]
+    assert summary.results[1].error.startswith("BrokenProcessPool")
+
+
+def test_kill_executor_terminates_workers():
+    # _kill_executor 依赖 ProcessPoolExecutor 私有的 _processes：改名了这里会先失败
+    executor = ProcessPoolExecutor(max_workers=1)
+    assert executor.submit(os.getpid).result() > 0
+    assert hasattr(executor, "_processes")
+    processes = list(executor._processes.values())
+
+    _kill_executor(executor)
+
+    for p in processes:
+        p.join(timeout=5)
+        assert not p.is_alive()
+
+
+def test_errors_are_captured_per_job(tmp_path):
+    jobs = [_bad_job(tmp_path, f"r{i}") for i in range(3)]
+    seen = []
+
+    summary = run_batch(jobs, workers=2, use_cache=False, on_result=seen.append)
+
+    assert len(seen) == 3
+    assert [r.output_path for r in summary.results] == [j.output_path for j in jobs]
+    assert summary.succeeded == 0
+    assert all("FileNotFoundError" in r.error for r in summary.failed)
+    assert "0/3 report(s) generated" in summary.format()
+
+
+def test_single_worker_runs_in_process(tmp_path):
+    summary = run_batch([_bad_job(tmp_path, "r")], workers=1, use_cache=False)
+
+    assert summary.workers == 1
+    assert len(summary.failed) == 1
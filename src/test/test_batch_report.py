@@ -0,0 +1,54 @@
+import json
+
+from src.tools.batch_report import build_job_mapping, load_manifest, parse_job_samples
+from src.tools.dsc_services import DscParseService
+
+
+def test_csv_manifest_groups_rows_by_output(tmp_path, dsc_txt_path):
+    manifest = tmp_path / "jobs.csv"
+    manifest.write_text(
+        "output,txt,pdf,name,sample_id,Request_id\n"
+        f"out/a.docx,{dsc_txt_path},,A,S1,R-1\n"
+        f"out/a.docx,{dsc_txt_path},,B,S2,\n"
+        f"out/b.docx,{dsc_txt_path},,C,S3,R-2\n",
+        encoding="utf-8",
+    )
+    jobs = load_manifest(str(manifest), default_template="tpl.docx")
+
+    assert [len(j.samples) for j in jobs] == [2, 1]
+    assert jobs[0].output_path == str(tmp_path / "out" / "a.docx")
+    assert jobs[0].template_path == "tpl.docx"
+    assert jobs[0].request == {"Request_id": "R-1"}
+    assert jobs[1].samples[0].pdf_path is None
+
+
+def test_json_manifest_builds_gui_equivalent_mapping(tmp_path, dsc_txt_path):
+    manifest = tmp_path / "jobs.json"
+    manifest.write_text(
+        json.dumps(
+            {
+                "template": "tpl.docx",
+                "reports": [
+                    {
+                        "output": "r.docx",
+                        "request": {"Request_id": "R-9"},
+                        "samples": [{"txt": dsc_txt_path, "sample_id": "S1", "nature": "powder"}],
+                    }
+                ],
+            }
+        ),
+        encoding="utf-8",
+    )
+    (job,) = load_manifest(str(manifest))
+    assert job.template_path == str(tmp_path / "tpl.docx")
+
+    samples = parse_job_samples(job, DscParseService())
+    mapping = build_job_mapping(job, samples)
+
+    assert samples[0].name == "CF130G"
+    assert mapping["{{Request_id}}"] == "R-9"
+    assert mapping["{{LSMP_code}}"] == "LSMP-21 F01v04"
+    assert mapping["{{Sample_id}}"] == "S1"
+    assert mapping["{{Sample_mass}}"] == "8.496 mg"
+    assert mapping["{{End_Date}}"] == "2025/05/06"
+    assert mapping["{{Deadline}}"] == ""
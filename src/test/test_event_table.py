@@ -0,0 +1,26 @@
+import math
+
+from src.benchmarks.synthetic_netzsch import make_prnres_lines
+from src.models.event_table import DscEventTable
+
+
+def test_round_trip_and_write_through():
+    _, _, segments = make_prnres_lines("S", n_segments=3, n_peaks=4, n_values=2)
+    segments[1].parts[0].onset_c = None
+    table = DscEventTable.from_segments(segments)
+
+    assert table.to_segments() == segments
+    assert len(table) == sum(len(seg.parts) for seg in segments)
+
+    view = table.segments
+    assert [seg.desc_display for seg in view] == [seg.desc_display for seg in segments]
+    assert view[1].parts[0].onset_c is None
+    assert view[-1].parts[-1].peak_c == segments[-1].parts[-1].peak_c
+
+    # 兼容视图的写入直接落到列上，按段切出来的列能看到
+    view[2].parts[1].peak_c = 321.5
+    view[2].parts[1].comment = "Exothermic"
+    column = table.column("peak_c", 2)
+    assert len(column) == len(segments[2].parts) and column[1] == 321.5
+    assert math.isnan(table.column("onset_c", 1)[0])
+    assert table.to_segments()[2].parts[1].comment == "Exothermic"
@@ -0,0 +1,61 @@
+import fitz
+
+from src.utils import figure_cache as fc
+from src.utils.figure_cache import FigureCache, FigureOptions
+
+
+def _make_pdf(tmp_path):
+    path = tmp_path / "curve.pdf"
+    doc = fitz.open()
+    page = doc.new_page(width=200, height=100)
+    page.insert_text((20, 50), "DSC")
+    doc.save(str(path))
+    doc.close()
+    return str(path)
+
+
+def test_rendered_png_is_reused_until_settings_change(tmp_path, monkeypatch):
+    pdf_path = _make_pdf(tmp_path)
+    cache = FigureCache(root=tmp_path / "figures")
+    calls = []
+    real_render = fc.render_pdf_figure
+
+    def _counting_render(*args, **kwargs):
+        calls.append(kwargs)
+        return real_render(*args, **kwargs)
+
+    monkeypatch.setattr(fc, "render_pdf_figure", _counting_render)
+
+    first = cache.get_or_render(pdf_path, FigureOptions(dpi=72)).image
+    assert first.startswith(b"\x89PNG")
+    assert cache.get_or_render(pdf_path, FigureOptions(dpi=72)).image == first
+    assert len(calls) == 1
+
+    cache.get_or_render(pdf_path, FigureOptions(dpi=96))
+    cache.get_or_render(pdf_path, FigureOptions(dpi=72, clip=(0, 0, 100, 50)))
+    assert len(calls) == 3
+
+
+def test_jpeg_and_gray_formats(tmp_path):
+    pdf_path = _make_pdf(tmp_path)
+
+    jpeg = fc.render_pdf_figure(pdf_path, FigureOptions(dpi=72, fmt="jpeg", jpeg_quality=60)).image
+    gray = fc.render_pdf_figure(pdf_path, FigureOptions(dpi=72, fmt="png-gray")).image
+    rgb = fc.render_pdf_figure(pdf_path, FigureOptions(dpi=72)).image
+
+    assert jpeg.startswith(b"\xff\xd8")
+    assert gray.startswith(b"\x89PNG") and len(gray) < len(rgb)
+
+
+def test_vector_and_target_size_modes(tmp_path):
+    pdf_path = _make_pdf(tmp_path)
+
+    vector = fc.render_pdf_figure(pdf_path, FigureOptions(mode="vector"))
+    assert vector.svg.lstrip().startswith(b"<svg")
+    assert vector.image.startswith(b"\x89PNG")
+
+    full = fc.render_pdf_figure(pdf_path, FigureOptions(dpi=250)).image
+    budget = len(full) // 2
+    capped = fc.render_pdf_figure(pdf_path, FigureOptions(mode="target-size", max_bytes=budget))
+    assert len(capped.image) <= budget
+    assert capped.svg is None
@@ -0,0 +1,61 @@
+import os
+
+from src.tools.dsc_services import DscParseService
+from src.utils import disk_cache
+from src.utils.disk_cache import DiskLruCache, file_digest
+from src.utils.parse_cache import ParseCache
+
+
+def test_cache_round_trip_returns_fresh_objects(tmp_path, dsc_txt_path):
+    txt_path = dsc_txt_path
+    service = DscParseService(cache=ParseCache(root=tmp_path / "cache"))
+
+    first = service.parse_one(txt_path)
+    first.segments[0].parts[0].onset_c = 999.0   # UI 编辑不应写进缓存
+
+    second = service.parse_one(txt_path)
+    assert second.basic == first.basic
+    assert second.segments[0].parts[0].onset_c == 18.2
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 1
+
+
+def test_cache_misses_after_file_changes(tmp_path, dsc_txt_path):
+    txt_path = dsc_txt_path
+    cache = ParseCache(root=tmp_path / "cache")
+    service = DscParseService(cache=cache)
+    service.parse_one(txt_path)
+
+    with open(txt_path, "a", encoding="utf-16") as f:
+        f.write("Value (DSC)\t0.1 mW/mg\t99.9 °C\r\n")
+    st = os.stat(txt_path)
+    os.utime(txt_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    assert cache.get(txt_path) is None
+    result = service.parse_one(txt_path)
+    assert result.segments[-1].parts[-1].value_temp_c == 99.9
+
+
+def test_lru_eviction_keeps_recently_used(tmp_path):
+    store = DiskLruCache(tmp_path, max_bytes=250)
+    store.put("a", b"x" * 100)
+    store.put("b", b"x" * 100)
+    os.utime(store.path_for("a"), ns=(1, 1))
+    os.utime(store.path_for("b"), ns=(2, 2))
+    store.get("a")                      # a 变成最近使用
+    store.put("c", b"x" * 100)          # 超出上限，淘汰最旧的 b
+
+    assert store.get("a") is not None
+    assert store.get("b") is None
+    assert store.get("c") is not None
+
+
+def test_digest_memo_keeps_one_entry_per_file(tmp_path):
+    path = tmp_path / "a.txt"
+    digests = set()
+    for i in range(5):
+        path.write_text(f"v{i}", encoding="utf-8")
+        os.utime(path, ns=(0, i * 1_000_000_000))
+        digests.add(file_digest(str(path)))
+
+    assert len(digests) == 5
+    assert sum(1 for key in disk_cache._digest_memo if key == os.path.abspath(path)) == 1
@@ -0,0 +1,48 @@
+from src.utils.parser_dsc import (
+    parse_dsc_segments,
+    parse_dsc_txt_basic,
+    read_dsc_sample_name,
+    scan_dsc_txt,
+)
+
+
+def test_scan_fills_basic_and_segments_in_one_pass(dsc_txt_path):
+    txt_path = dsc_txt_path
+    info, segments = scan_dsc_txt(txt_path)
+
+    assert info.sample_name == "CF130G"
+    assert info.sample_mass_mg == 8.496
+    assert info.crucible == "Concavus Al"
+    assert info.temp_calib == "2025/04/09"
+    assert info.end_date == "2025/05/06"
+
+    assert [(s.index, s.total) for s in segments] == [(1, 2), (2, 2)]
+    assert segments[0].desc_display == "-20°C ➜ 150°C@10K/min"
+
+    first = segments[0].parts
+    assert len(first) == 2
+    assert (first[0].onset_c, first[0].peak_c, first[0].area_report) == (18.2, 21.5, 45.12)
+    assert first[0].comment == "Endothermic"
+    assert first[0].value_temp_c == 15.3
+    assert first[1].onset_c is None and first[1].value_temp_c == 40.1
+
+    second = segments[1].parts
+    assert len(second) == 1
+    assert second[0].comment == "Exothermic"
+
+
+def test_wrappers_match_scanner(dsc_txt_path):
+    txt_path = dsc_txt_path
+    info, segments = scan_dsc_txt(txt_path)
+
+    assert parse_dsc_txt_basic(txt_path) == info
+    assert parse_dsc_segments(txt_path) == segments
+    assert read_dsc_sample_name(txt_path) == "CF130G"
+
+
+def test_utf8_export_is_detected(make_dsc_txt):
+    txt_path = make_dsc_txt(encoding="utf-8")
+    info, segments = scan_dsc_txt(txt_path)
+
+    assert info.sample_name == "CF130G"
+    assert len(segments) == 2
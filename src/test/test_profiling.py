@@ -0,0 +1,63 @@
+import json
+import tracemalloc
+
+from src.benchmarks.synthetic_netzsch import generate_sample, write_report_template
+from src.models.models import SampleItem
+from src.tools.dsc_services import DscParseService, ReportService, apply_basic_to_sample
+from src.utils.profiling import Profiler
+from src.config.config import REPORT_STAGES
+
+
+def test_stages_are_closed_by_enclosing_span():
+    profiler = Profiler(memory=True)
+    with profiler.span("outer"):
+        profiler.stage("a")
+        with profiler.span("inner"):
+            pass
+        profiler.stage("b")
+    profiler.close()
+
+    names = [(s.name, s.depth, s.parent) for s in profiler.spans]
+    assert names == [("outer", 0, None), ("a", 1, 0), ("inner", 2, 1), ("b", 1, 0)]
+    assert all(s.closed for s in profiler.spans)
+    assert all(s.py_peak_kb is not None for s in profiler.spans)
+
+
+def test_end_survives_tracemalloc_stopped_elsewhere():
+    profiler = Profiler(memory=True)
+    with profiler.span("outer"):
+        tracemalloc.stop()
+    profiler.close()
+    assert profiler.spans[0].closed
+
+
+def test_report_pipeline_records_every_stage(tmp_path):
+    synthetic = [generate_sample(str(tmp_path), i, n_segments=2) for i in range(3)]
+    template = str(tmp_path / "template.docx")
+    write_report_template(template)
+
+    profiler = Profiler()
+    parse_service = DscParseService()
+    samples = []
+    for i, s in enumerate(synthetic):
+        item = SampleItem(id=i, name=s.name, txt_path=s.txt_path, pdf_path=s.pdf_path)
+        apply_basic_to_sample(item, parse_service.parse_one(s.txt_path, s.pdf_path, profiler=profiler))
+        samples.append(item)
+
+    ReportService().generate_report(
+        template, str(tmp_path / "out.docx"), {"{{Request_id}}": "R-1"},
+        segments=[], discussion_text="x", pdf_path=None, sample_name_for_segments="",
+        figure_number="1", samples=samples, profiler=profiler,
+    )
+
+    rows = {(row["depth"], row["name"]): row for row in profiler.breakdown()}
+    assert rows[(0, "parse_one")]["count"] == 3
+    assert rows[(1, "scan_txt")]["count"] == 3
+    assert {(1, stage) for stage in ("load_template",) + REPORT_STAGES} <= set(rows)
+    assert rows[(2, "figure")]["count"] == 3
+
+    path = tmp_path / "out.trace.json"
+    profiler.export_chrome_trace(str(path))
+    events = json.loads(path.read_text(encoding="utf-8"))["traceEvents"]
+    assert {e["ph"] for e in events} == {"X"}
+    assert len(events) == len(profiler.spans)
@@ -0,0 +1,48 @@
+from src.models.models import SampleItem
+from src.models.sample_registry import SampleRegistry, sample_content_hash
+from src.tools.dsc_services import DscParseService
+from src.tools.parse_worker import ParseTask
+
+
+def _registry(tmp_path, n):
+    registry = SampleRegistry()
+    for i in range(n):
+        txt = tmp_path / f"s{i}.txt"
+        txt.write_text(f"data {i % 3}", encoding="utf-8")
+        registry.add(SampleItem(id=registry.new_id(), name=f"S{i % 4}", txt_path=str(txt)))
+    return registry
+
+
+def test_lookups_stay_consistent_after_remove_and_rename(tmp_path):
+    registry = _registry(tmp_path, 10)
+    events = []
+    registry.subscribe(lambda event, row, sample: events.append((event, row)))
+
+    assert registry.remove(3).id == 3
+    assert [s.id for s in registry] == [1, 2, 4, 5, 6, 7, 8, 9, 10]
+    assert registry.index_of(10) == 8 and registry.get(3) is None and registry.index_of(3) == -1
+    assert events == [("about_to_remove", 2), ("removed", 2)]
+
+    registry.rename(8, "Renamed")
+    assert [s.id for s in registry.find_by_name("S3")] == [4]
+    assert [s.id for s in registry.find_by_name("Renamed")] == [8]
+    assert events[-1] == ("changed", 6)
+
+    # 内容相同（i % 3 相同）的文件能认出来，删掉的样品不在索引里
+    for sample in registry:
+        registry.set_content_hash(sample.id, sample_content_hash(sample.txt_path))
+    same_as_s0 = registry.content_hash_of(1)
+    assert [s.id for s in registry.find_by_content_hash(same_as_s0)] == [1, 4, 7, 10]
+    registry.remove(4)
+    assert [s.id for s in registry.find_by_content_hash(same_as_s0)] == [1, 7, 10]
+    assert registry.new_id() == 11
+
+
+def test_parse_task_delivers_content_hash(dsc_txt_path):
+    task = ParseTask(1, dsc_txt_path, None, DscParseService())
+    finished = []
+    task.signals.finished.connect(lambda sid, result, content_hash: finished.append((sid, content_hash)))
+
+    task.run()
+
+    assert finished == [(1, sample_content_hash(dsc_txt_path))]
@@ -0,0 +1,35 @@
+from PyQt6.QtCore import Qt
+
+from src.models.models import SampleItem
+from src.models.sample_registry import SampleRegistry
+from src.ui.widgets.sample_views import FileStatusRole, ManualFieldsModel, SampleListModel
+
+
+def _samples(tmp_path, n):
+    txt = tmp_path / "a.txt"
+    txt.write_text("x", encoding="utf-8")
+    return SampleRegistry(SampleItem(id=i + 1, name=f"S{i + 1}", txt_path=str(txt)) for i in range(n))
+
+
+def test_rename_refreshes_only_that_row(tmp_path):
+    samples = _samples(tmp_path, 300)
+    model = SampleListModel(samples, lambda sid: False)
+    changed = []
+    model.dataChanged.connect(lambda top, bottom, roles=None: changed.append((top.row(), bottom.row())))
+
+    samples.rename(samples[150].id, "Renamed")
+
+    assert changed == [(150, 150)]
+    assert model.data(model.index(150, 0)) == "Renamed"
+    assert model.data(model.index(150, 0), FileStatusRole) == ("TXT: ✓", "PDF: -")
+
+
+def test_manual_fields_edit_writes_back(tmp_path):
+    samples = _samples(tmp_path, 2)
+    model = ManualFieldsModel(samples)
+
+    assert not model.flags(model.index(0, 0)) & Qt.ItemFlag.ItemIsEditable
+    assert model.setData(model.index(1, 2), "  Polymer  ")
+    assert samples[1].manual_fields.nature == "Polymer"
+    assert model.data(model.index(1, 0)) == "S2"
+    assert not model.setData(model.index(1, 0), "x")
@@ -1,17 +1,38 @@
-from src.utils.parser_dsc import parse_dsc_segments
-
-txt_path = "/Users/mark/Desktop/Projects/DSC_Report_Tool/CF130G/PrnRes_CF130G_2025-05-06.txt"  # 改成你的真实路径
-segments = parse_dsc_segments(txt_path)
-
-print("总段数：", len(segments))
-for seg in segments:
-    print(f"Segment {seg.index}/{seg.total}: {seg.desc_display}")
-    for part in seg.parts:
-       print(
-    "  ValueTemp(°C)=",
-    part.value_temp_c if part.value_temp_c is not None else "—",
-    "| Onset=", part.onset_c if part.onset_c is not None else "—",
-    "| Peak=", part.peak_c if part.peak_c is not None else "—",
-    "| Area(report)=", part.area_report if part.area_report is not None else "—",
-    "| Comment=", part.comment or "—",
-)
\ No newline at end of file
+from src.benchmarks.synthetic_netzsch import generate_sample
+from src.utils.parser_dsc import parse_dsc_segments, parse_segment_ranges_from_pdf, scan_dsc_txt
+
+
+def test_synthetic_txt_parses_to_expected_segments(tmp_path):
+    sample = generate_sample(str(tmp_path), 0, n_segments=4, n_peaks=3, n_values=1, with_pdf=False)
+
+    basic, segments = scan_dsc_txt(sample.txt_path)
+
+    assert basic == sample.basic
+    assert segments == sample.segments
+    assert [len(seg.parts) for seg in segments] == [3, 3, 3, 3]
+    assert segments[0].parts[1].value_temp_c is None
+
+
+def test_pdf_ranges_extend_txt_segments(tmp_path):
+    sample = generate_sample(str(tmp_path), 1, n_segments=2, pdf_extra_segments=1)
+
+    assert parse_segment_ranges_from_pdf(sample.pdf_path) == sample.pdf_ranges
+
+    segments = parse_dsc_segments(sample.txt_path, sample.pdf_path)
+    assert [seg.raw_desc for seg in segments] == sample.pdf_ranges
+    assert [seg.total for seg in segments] == [3, 3, 3]
+    # TXT 里已有的段数值不变；PDF 多出来的第 3 段只有 Range + 一个空 part
+    assert [seg.parts for seg in segments[:2]] == [seg.parts for seg in sample.segments]
+    assert segments[2].desc_display == "-20°C ➜ 160°C@10K/min"
+    assert [part.peak_c for part in segments[2].parts] == [None]
+
+
+def test_synthetic_files_are_deterministic(tmp_path):
+    (tmp_path / "a").mkdir()
+    (tmp_path / "b").mkdir()
+    a = generate_sample(str(tmp_path / "a"), 7)
+    b = generate_sample(str(tmp_path / "b"), 7)
+
+    with open(a.txt_path, "rb") as fa, open(b.txt_path, "rb") as fb:
+        assert fa.read() == fb.read()
+    assert a.segments == b.segments
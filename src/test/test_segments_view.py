@@ -0,0 +1,37 @@
+from PyQt6.QtCore import Qt
+
+from src.benchmarks.synthetic_netzsch import make_prnres_lines
+from src.ui.widgets.segments_view import SegmentsModel
+
+
+def test_rows_fetched_lazily():
+    _, _, segments = make_prnres_lines("S", n_segments=3, n_peaks=150)
+    total = sum(len(seg.parts) for seg in segments)
+    model = SegmentsModel()
+    model.set_segments(segments)
+
+    assert model.rowCount() == SegmentsModel.FETCH_BATCH < total
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.rowCount() == total
+
+
+def test_apply_writes_back_only_edited_cells():
+    _, _, segments = make_prnres_lines("S", n_segments=2, n_peaks=2)
+    part = segments[0].parts[0]
+    part.onset_c, part.peak_c = 123.456, 130.049
+    model = SegmentsModel()
+    model.set_segments(segments)
+    onset, peak, comment = (model.index(0, col) for col in (3, 4, 6))
+
+    # 原样提交显示的文本（.1f）不算改动，原始精度保留
+    assert model.setData(onset, model.data(onset))
+    assert model.setData(peak, "131.5")
+    assert not model.setData(peak, "abc")
+    assert model.setData(comment, "  melting ")
+    assert not model.flags(model.index(0, 0)) & Qt.ItemFlag.ItemIsEditable
+
+    assert part.peak_c == 130.049          # apply 之前不动数据
+    assert model.apply(segments) == 2
+    assert (part.onset_c, part.peak_c, part.comment) == (123.456, 131.5, "melting")
+    assert model.dirty_count() == 0
@@ -0,0 +1,18 @@
+from src.tools.startup_profile import _parse_importtime, profile_imports
+
+
+def test_parse_importtime_depth():
+    stderr = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |     lxml.etree\n"
+        "import time:        80 |        200 |   docx\n"
+        "import time:        10 |        210 | src.utils.templating\n"
+    )
+    entries = [(e.name, e.self_us, e.cumulative_us, e.depth) for e in _parse_importtime(stderr)]
+    assert entries == [("lxml.etree", 120, 120, 2), ("docx", 80, 200, 1), ("src.utils.templating", 10, 210, 0)]
+
+
+def test_gui_services_do_not_import_heavy_modules():
+    profile = profile_imports("src.tools.dsc_services")
+    assert profile.heavy_loaded == []
+    assert profile.entries[-1].name == "src.tools.dsc_services"
@@ -0,0 +1,200 @@
+import pytest
+from docx import Document
+from docx.oxml.ns import qn
+
+from src.utils.template_cache import TemplateCache
+from src.utils.template_index import build_template_index, normalize_split_placeholders
+from src.utils.templating import REPORT_STAGES, _fill_segment_rows_to_table, fill_template_with_mapping
+
+
+def _make_template(tmp_path):
+    path = tmp_path / "tpl.docx"
+    doc = Document()
+    doc.add_paragraph("Request: {{Request_id}}")
+    doc.add_paragraph("{{Discussion}}")
+    doc.save(str(path))
+    return str(path)
+
+
+def test_progress_reports_every_stage_in_order(tmp_path):
+    out = tmp_path / "out.docx"
+    seen = []
+
+    fill_template_with_mapping(
+        _make_template(tmp_path), str(out), {"{{Request_id}}": "R-1"},
+        discussion_text="ok", progress=seen.append,
+    )
+
+    assert tuple(seen) == REPORT_STAGES
+    assert "Request: R-1" in [p.text for p in Document(str(out)).paragraphs]
+
+
+def test_raising_from_progress_aborts_before_save(tmp_path):
+    out = tmp_path / "out.docx"
+
+    def _cancel(stage):
+        if stage == "figures":
+            raise RuntimeError("cancelled")
+
+    with pytest.raises(RuntimeError):
+        fill_template_with_mapping(_make_template(tmp_path), str(out), {}, progress=_cancel)
+    assert not out.exists()
+
+
+def test_template_index_records_story_table_and_run_split():
+    doc = Document()
+    doc.sections[0].header.paragraphs[0].text = "Req {{Request_id}}"
+    para = doc.add_paragraph()
+    para.add_run("Name: {{Request")
+    para.add_run("_Name}} / {{LSMP_code}}")
+    table = doc.add_table(rows=2, cols=1)
+    table.cell(1, 0).text = "{{SEG_VALUE}}"
+
+    index = build_template_index(doc)
+
+    assert index.first("{{Request_id}}").story == "header"
+    split = index.first("{{Request_Name}}")
+    assert split.runs == (0, 1) and split.split
+    assert index.first("{{LSMP_code}}").runs == (1, 1)
+    seg = index.first("{{SEG_VALUE}}")
+    assert seg.table._tbl is table._tbl and seg.row_idx == 1
+    assert index.paragraphs_for(["{{Request_Name}}", "{{LSMP_code}}"])[0]._p is para._p
+    assert len(index.paragraphs_for(["{{Request_Name}}", "{{LSMP_code}}"])) == 1
+
+
+def test_template_cache_returns_independent_clones(tmp_path):
+    path = _make_template(tmp_path)
+    cache = TemplateCache()
+
+    first = cache.load(path)
+    first.add_paragraph("only in first")
+    first.save(str(tmp_path / "first.docx"))
+    second = cache.load(path)
+
+    assert [p.text for p in second.paragraphs] == ["Request: {{Request_id}}", "{{Discussion}}"]
+    assert second.styles.element is first.styles.element   # styles 共享，不复制
+
+    doc = Document(path)
+    doc.add_paragraph("changed")
+    doc.save(path)
+    assert len(cache.load(path).paragraphs) == 3
+    assert "only in first" in [p.text for p in Document(str(tmp_path / "first.docx")).paragraphs]
+
+
+def test_single_pass_replacement_keeps_split_run_formatting(tmp_path):
+    path = tmp_path / "split.docx"
+    doc = Document()
+    para = doc.add_paragraph()
+    para.add_run("ID {{Req")
+    tail = para.add_run("uest_id}} by {{Operator}}")
+    tail.bold = True
+    doc.save(str(path))
+
+    out = tmp_path / "out.docx"
+    fill_template_with_mapping(
+        str(path), str(out), {"{{Request_id}}": "R-{{Operator}}", "{{Operator}}": "WX"}
+    )
+
+    runs = Document(str(out)).paragraphs[0].runs
+    # 替换值里的 {{...}} 不会被二次替换；第二个 run 的加粗保留
+    assert [r.text for r in runs] == ["ID R-{{Operator}}", " by WX"]
+    assert runs[1].bold
+
+
+def test_normalize_merges_split_placeholder_into_first_run():
+    doc = Document()
+    para = doc.add_paragraph()
+    para.add_run("A {{Req")
+    para.add_run("uest")
+    tail = para.add_run("_id}} tail {{X}}")
+    tail.italic = True
+
+    assert normalize_split_placeholders(doc) == 1
+    assert [r.text for r in para.runs] == ["A {{Request_id}}", "", " tail {{X}}"]
+    assert para.runs[2].italic
+    assert not build_template_index(doc).first("{{Request_id}}").split
+    assert normalize_split_placeholders(doc) == 0
+
+
+def test_segment_rows_are_inserted_after_template_row():
+    doc = Document()
+    table = doc.add_table(rows=3, cols=2)
+    table.cell(0, 0).text = "Sample"
+    table.cell(1, 0).text = "{{SEG_SAMPLE}}"
+    table.cell(1, 1).text = "{{SEG_VALUE}}"
+    table.cell(2, 0).text = "Note"
+    rows_data = [{"SEG_SAMPLE": "A", "SEG_VALUE": str(i)} for i in range(5)]
+
+    _fill_segment_rows_to_table(doc, rows_data)
+
+    cells = [[c.text for c in row.cells] for row in table.rows]
+    assert len(cells) == 7
+    assert [r[1] for r in cells[1:6]] == ["0", "1", "2", "3", "4"]
+    assert cells[1][0] == "A" and cells[-1][0] == "Note"
+
+
+def test_segment_merges_follow_row_data():
+    doc = Document()
+    table = doc.add_table(rows=1, cols=3)
+    for c, token in enumerate(("{{SEG_SAMPLE}}", "{{SEG_METHOD}}", "{{SEG_VALUE}}")):
+        table.cell(0, c).text = token
+    rows_data = [
+        {"SEG_SAMPLE": "A", "SEG_METHOD": "heat", "SEG_VALUE": "1"},
+        {"SEG_SAMPLE": "A", "SEG_METHOD": "heat", "SEG_VALUE": "2"},
+        {"SEG_SAMPLE": "A", "SEG_METHOD": "cool", "SEG_VALUE": "3"},
+        {"SEG_SAMPLE": "B", "SEG_METHOD": "cool", "SEG_VALUE": "4"},
+    ]
+
+    _fill_segment_rows_to_table(doc, rows_data)
+
+    marks = [[tc.vMerge for tc in tr.tc_lst[:2]] for tr in table._tbl.tr_lst]
+    assert marks == [
+        ["restart", "restart"],
+        ["continue", "continue"],
+        ["continue", None],
+        [None, None],
+    ]
+    assert [table.cell(r, 0).text for r in range(4)] == ["A", "A", "A", "B"]
+    assert [table.cell(r, 1).text for r in range(4)] == ["heat", "heat", "cool", "cool"]
+
+
+def test_segment_fill_keeps_template_run_formatting():
+    doc = Document()
+    table = doc.add_table(rows=1, cols=2)
+    value_para = table.cell(0, 0).paragraphs[0]
+    value_para.add_run("{{SEG_").bold = True
+    value_para.add_run("VALUE}} °C")
+    table.cell(0, 1).paragraphs[0].add_run("static").italic = True
+    rows_data = [{"SEG_VALUE": "42.0"}, {"SEG_VALUE": "-"}]
+
+    _fill_segment_rows_to_table(doc, rows_data)
+
+    for row, expected in zip(table.rows, ("42.0 °C", "- °C")):
+        value_runs = row.cells[0].paragraphs[0].runs
+        assert row.cells[0].text == expected
+        assert value_runs[0].bold and value_runs[0].text == expected.split(" ")[0]
+        assert row.cells[1].paragraphs[0].runs[0].italic
+
+
+def test_streaming_writer_matches_in_memory_save(tmp_path):
+    from src.benchmarks.synthetic_netzsch import make_report_samples, write_report_template
+
+    template = str(tmp_path / "tpl.docx")
+    write_report_template(template)
+    samples = make_report_samples(3, str(tmp_path), image_kb=4)
+    outputs = {}
+    for stream in (False, True):
+        out = tmp_path / f"out-{stream}.docx"
+        fill_template_with_mapping(
+            template, str(out), {"{{Request_id}}": "R-1"},
+            discussion_text="Discussion.", samples=samples, stream=stream,
+        )
+        outputs[stream] = Document(str(out))
+
+    def _summary(doc):
+        tables = [[[c.text for c in row.cells] for row in t.rows] for t in doc.tables]
+        merges = [tc.vMerge for tc in doc.tables[1]._tbl.iter(qn("w:tc"))]
+        return [p.text for p in doc.paragraphs], tables, merges, len(doc.inline_shapes)
+
+    assert _summary(outputs[True]) == _summary(outputs[False])
+    assert len(outputs[True].inline_shapes) == 3
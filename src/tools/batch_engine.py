@@ -0,0 +1,277 @@
+# src/tools/batch_engine.py
+from __future__ import annotations
+
+import os
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from src.tools.batch_report import ReportJob, run_report_job
+from src.tools.dsc_services import DscParseService, ReportService, format_file_size
+from src.utils.figure_cache import FigureCache, FigureOptions
+from src.utils.parse_cache import ParseCache
+from src.utils.profiling import Profiler, span, trace_path_for
+
+
+@dataclass
+class JobResult:
+    """单份报告的结果：成功与否、耗时、文件大小、错误信息（失败时）。"""
+    output_path: str
+    ok: bool
+    seconds: float
+    error: str = ""
+    size_bytes: int = 0
+    timings: List[str] = field(default_factory=list)   # profile=True 时的阶段耗时分解
+
+
+@dataclass
+class BatchSummary:
+    results: List[JobResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+    workers: int = 1
+
+    @property
+    def succeeded(self) -> int:
+        return sum(1 for r in self.results if r.ok)
+
+    @property
+    def failed(self) -> List[JobResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def throughput(self) -> float:
+        """每秒完成的报告数（只算成功的）。"""
+        if self.wall_seconds <= 0:
+            return 0.0
+        return self.succeeded / self.wall_seconds
+
+    def format(self) -> str:
+        total = len(self.results)
+        lines = [
+            f"{self.succeeded}/{total} report(s) generated "
+            f"in {self.wall_seconds:.1f}s with {self.workers} worker(s) "
+            f"({self.throughput:.2f} report/s)."
+        ]
+        job_times = [r.seconds for r in self.results if r.ok]
+        if job_times:
+            lines.append(
+                f"Per report: mean {sum(job_times) / len(job_times):.2f}s, "
+                f"max {max(job_times):.2f}s."
+            )
+            sizes = [r.size_bytes for r in self.results if r.ok]
+            lines.append(
+                f"Document size: total {format_file_size(sum(sizes))}, "
+                f"max {format_file_size(max(sizes))}."
+            )
+        for r in self.failed:
+            lines.append(f"  [Failed] {r.output_path} - {r.error}")
+        return "\n".join(lines)
+
+
+# -----------------------------
+# worker 进程内部
+# -----------------------------
+# 每个 worker 进程只建一次 service（以及解析缓存），后续任务复用
+_worker_services: Optional[Tuple[DscParseService, ReportService]] = None
+_worker_profile = False
+
+
+def _init_worker(
+    use_cache: bool,
+    figure_options: Optional[FigureOptions] = None,
+    stream: Optional[bool] = None,
+    profile: bool = False,
+) -> None:
+    global _worker_services, _worker_profile
+    _worker_profile = profile
+    if use_cache:
+        _worker_services = (
+            DscParseService(cache=ParseCache()),
+            ReportService(figure_cache=FigureCache(), figure_options=figure_options, stream=stream),
+        )
+    else:
+        _worker_services = (DscParseService(), ReportService(figure_options=figure_options, stream=stream))
+
+
+def _run_job(job: ReportJob) -> JobResult:
+    """在 worker 里跑一份报告；异常在这里就转成 JobResult，不让它炸掉进程池。"""
+    if _worker_services is None:
+        _init_worker(use_cache=True)
+    parse_service, report_service = _worker_services
+    profiler = Profiler() if _worker_profile else None
+
+    start = time.perf_counter()
+    try:
+        with span(profiler, "report", output=os.path.basename(job.output_path)):
+            size = run_report_job(job, parse_service, report_service, profiler)
+        result = JobResult(job.output_path, True, time.perf_counter() - start, size_bytes=size)
+    except Exception as e:
+        result = JobResult(
+            job.output_path,
+            False,
+            time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+
+    if profiler is not None:
+        # 失败的报告也写 trace：能看出卡在哪个阶段
+        result.timings = profiler.format_breakdown()
+        try:
+            profiler.export_chrome_trace(trace_path_for(job.output_path))
+        except OSError as e:
+            result.timings.append(f"[trace not written] {e}")
+    return result
+
+
+def _kill_executor(executor: ProcessPoolExecutor) -> None:
+    """
+    超时的任务没法在 worker 内部打断，只能把整个池子的进程杀掉。
+    ProcessPoolExecutor 没有公开的 terminate 接口，这里用私有的 _processes
+    （pid -> Process；以后改名了就只能 shutdown，test_batch_engine 里有测试盯着）。
+    """
+    processes = []
+    if hasattr(executor, "_processes"):
+        processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for p in processes:
+        try:
+            p.terminate()
+        except Exception:
+            pass
+
+
+# -----------------------------
+# 对外入口
+# -----------------------------
+def run_batch(
+    jobs: List[ReportJob],
+    *,
+    workers: Optional[int] = None,
+    timeout: Optional[float] = None,
+    use_cache: bool = True,
+    figure_options: Optional[FigureOptions] = None,
+    stream: Optional[bool] = None,
+    profile: bool = False,
+    on_result: Optional[Callable[[JobResult], None]] = None,
+) -> BatchSummary:
+    """
+    用进程池并行生成多份报告（解析、填模板、PDF 渲染、doc.save 都在 worker 里完成）。
+
+    - workers: 进程数，默认 os.cpu_count()；workers=1 且不设 timeout 时在当前进程顺序执行
+    - timeout: 单份报告的超时时间（秒）。同时在跑的任务不超过 workers 个，
+      所以“提交时间”就是开始时间；有任务超时时杀掉整个池子，
+      超时任务记为失败，其它在跑的任务重新排队。
+    - worker 进程崩掉（BrokenProcessPool）时，池子里在跑的任务都会收到这个异常，分不清是谁弄崩的：
+      这些任务各重跑一次，而且重跑时单独占一个池子；重跑又把池子弄崩的才记为失败。
+    - figure_options: 曲线图的 dpi / 编码格式，默认用 config 里的设置
+    - stream: 流式写出 docx（True / False 强制；None 按样品数自动，见 ReportService）
+    - profile: 每份报告记录各阶段耗时，JobResult.timings 里是分解，docx 旁边写 .trace.json
+    - on_result: 每完成一份报告回调一次（用于打印进度）
+    结果按 jobs 的原始顺序返回。
+    """
+    workers = max(1, workers or os.cpu_count() or 1)
+    summary = BatchSummary(workers=workers)
+    results: List[Optional[JobResult]] = [None] * len(jobs)
+
+    def _record(idx: int, result: JobResult) -> None:
+        results[idx] = result
+        if on_result is not None:
+            on_result(result)
+
+    wall_start = time.perf_counter()
+
+    # 单进程且不限时：直接在当前进程里顺序跑，省掉起进程的开销，也方便调试
+    if workers == 1 and timeout is None:
+        _init_worker(use_cache, figure_options, stream, profile)
+        for idx, job in enumerate(jobs):
+            _record(idx, _run_job(job))
+        summary.results = [r for r in results if r is not None]
+        summary.wall_seconds = time.perf_counter() - wall_start
+        return summary
+
+    queue: Deque[int] = deque(range(len(jobs)))
+    inflight: Dict[object, Tuple[int, float]] = {}
+    suspects: Set[int] = set()      # 在崩掉的池子里跑过的任务
+    executor: Optional[ProcessPoolExecutor] = None
+
+    def _on_broken(idx: int, error: str) -> Optional[int]:
+        """池子崩了时在跑的任务：第一次放回队列（返回 idx），单独重跑还崩就记为失败。"""
+        if idx in suspects:
+            _record(idx, JobResult(jobs[idx].output_path, False, 0.0, error))
+            return None
+        suspects.add(idx)
+        return idx
+
+    try:
+        while queue or inflight:
+            if executor is None:
+                executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=(use_cache, figure_options, stream, profile),
+                )
+
+            while queue and len(inflight) < workers:
+                # 嫌疑任务单独跑：不和别的任务同时在池子里
+                if inflight and (queue[0] in suspects or any(i in suspects for i, _ in inflight.values())):
+                    break
+                idx = queue.popleft()
+                fut = executor.submit(_run_job, jobs[idx])
+                inflight[fut] = (idx, time.monotonic())
+
+            done, _ = wait(list(inflight), timeout=0.5, return_when=FIRST_COMPLETED)
+
+            broken_error = ""
+            requeue: List[int] = []
+            for fut in done:
+                idx, _ = inflight.pop(fut)
+                try:
+                    _record(idx, fut.result())
+                except BrokenProcessPool as e:
+                    # worker 进程本身挂了：池子里所有在跑的任务都会收到这个异常
+                    broken_error = f"{type(e).__name__}: {e}"
+                    if _on_broken(idx, broken_error) is not None:
+                        requeue.append(idx)
+                except Exception as e:
+                    # 任务本身提交不上去（比如 pickle 失败），池子还是好的
+                    _record(idx, JobResult(jobs[idx].output_path, False, 0.0, f"{type(e).__name__}: {e}"))
+
+            expired: List[object] = []
+            if timeout is not None:
+                now = time.monotonic()
+                expired = [f for f, (_, t0) in inflight.items() if now - t0 > timeout]
+
+            if expired or broken_error:
+                for fut in expired:
+                    idx, t0 = inflight.pop(fut)
+                    _record(
+                        idx,
+                        JobResult(
+                            jobs[idx].output_path,
+                            False,
+                            time.monotonic() - t0,
+                            error=f"Timeout after {timeout:g}s",
+                        ),
+                    )
+                for idx, _ in inflight.values():
+                    if not broken_error:
+                        # 没超时但被连带杀掉的任务：原样重跑
+                        requeue.append(idx)
+                    elif _on_broken(idx, broken_error) is not None:
+                        requeue.append(idx)
+                # 池子要重建：放回队首，保持原来的先后
+                for idx in sorted(requeue, reverse=True):
+                    queue.appendleft(idx)
+                inflight.clear()
+                _kill_executor(executor)
+                executor = None
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    summary.results = [r for r in results if r is not None]
+    summary.wall_seconds = time.perf_counter() - wall_start
+    return summary
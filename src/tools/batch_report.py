@@ -0,0 +1,428 @@
+#!/usr/bin/env python
+"""
+batch_report.py
+
+无界面批量生成 DSC 报告：不创建 QApplication、不 import PyQt6，
+直接驱动 DscParseService + ReportService，适合在没有显示器的服务器上跑夜间任务。
+
+用法示例（在项目根目录下）：
+    python -m src.tools.batch_report manifest.json
+    python -m src.tools.batch_report manifest.csv --template "data/DSC Report-Empty-2512.docx"
+    python -m src.tools.batch_report manifest.json --workers 8 --timeout 300
+    python -m src.tools.batch_report campaign.json --stream on     # 几百个样品的大报告：流式写出
+    python -m src.tools.batch_report manifest.json --profile       # 每份报告的阶段耗时 + .trace.json
+
+manifest.json：
+    {
+      "template": "data/DSC Report-Empty-2512.docx",      # 可选，缺省用 config.DEFAULT_TEMPLATE_PATH
+      "reports": [
+        {
+          "output": "out/R-001.docx",
+          "request": {"Request_id": "R-001", "Customer_information": "...", ...},
+          "samples": [
+            {"txt": "CF130G/PrnRes.txt", "pdf": "CF130G/curve.pdf",
+             "name": "CF130G", "sample_id": "S1", "nature": "powder", "assign_to": "WX"}
+          ]
+        }
+      ]
+    }
+
+manifest.csv：每行一个样品，按 output 列分组成报告；
+    固定列：output, template, txt, pdf, name, sample_id, nature, assign_to
+    其余列都当作 request 字段（列名即占位符名，如 Request_id）。
+
+相对路径一律相对 manifest 文件所在目录解析。
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.config.config import (
+    DEFAULT_TEMPLATE_PATH,
+    FIGURE_DPI,
+    FIGURE_FORMAT,
+    FIGURE_JPEG_QUALITY,
+    FIGURE_MAX_BYTES,
+    FIGURE_MODE,
+)
+from src.models.models import SampleItem
+from src.tools.dsc_services import (
+    DscParseService,
+    ReportService,
+    apply_basic_to_sample,
+    format_file_size,
+    latest_end_date,
+)
+from src.utils.figure_cache import FIGURE_FORMATS, FIGURE_MODES, FigureOptions
+from src.utils.profiling import Profiler, span
+
+
+# GUI Step3 里 Request 区的字段（占位符名去掉花括号）
+REQUEST_FIELDS = (
+    "LSMP_code",
+    "Request_id",
+    "Customer_information",
+    "Request_Name",
+    "Submission_Date",
+    "Request_Number",
+    "Project_Account",
+    "Deadline",
+    "Test_Date",
+    "Receive_Date",
+    "Report_Date",
+    "Request_desc",
+)
+DEFAULT_LSMP_CODE = "LSMP-21 F01v04"
+
+_SAMPLE_COLUMNS = ("output", "template", "txt", "pdf", "name", "sample_id", "nature", "assign_to")
+
+
+@dataclass
+class SampleSpec:
+    """manifest 里的一个样品：文件路径 + Step3 的手动字段。"""
+    txt_path: str
+    pdf_path: Optional[str] = None
+    name: str = ""
+    sample_id: str = ""
+    nature: str = ""
+    assign_to: str = ""
+
+
+@dataclass
+class ReportJob:
+    """一份报告 = 模板 + 输出路径 + request 字段 + 若干样品。"""
+    output_path: str
+    template_path: str
+    samples: List[SampleSpec] = field(default_factory=list)
+    request: Dict[str, str] = field(default_factory=dict)
+
+
+# -----------------------------
+# manifest 读取
+# -----------------------------
+def _resolve(base_dir: Path, path: Optional[str]) -> Optional[str]:
+    if not path:
+        return None
+    p = Path(path).expanduser()
+    if not p.is_absolute():
+        p = base_dir / p
+    return str(p)
+
+
+def _sample_from_dict(base_dir: Path, raw: dict) -> SampleSpec:
+    txt = raw.get("txt") or raw.get("txt_path")
+    if not txt:
+        raise ValueError(f"sample without txt: {raw}")
+    return SampleSpec(
+        txt_path=_resolve(base_dir, txt),
+        pdf_path=_resolve(base_dir, raw.get("pdf") or raw.get("pdf_path")),
+        name=(raw.get("name") or "").strip(),
+        sample_id=(raw.get("sample_id") or "").strip(),
+        nature=(raw.get("nature") or "").strip(),
+        assign_to=(raw.get("assign_to") or "").strip(),
+    )
+
+
+def _load_json_manifest(path: Path, default_template: str) -> List[ReportJob]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    base_dir = path.parent
+
+    if isinstance(data, list):
+        reports, top_template = data, None
+    else:
+        reports, top_template = data.get("reports", []), data.get("template")
+
+    jobs: List[ReportJob] = []
+    for raw in reports:
+        output = raw.get("output")
+        if not output:
+            raise ValueError(f"report without output: {raw}")
+        template = raw.get("template") or top_template
+        jobs.append(
+            ReportJob(
+                output_path=_resolve(base_dir, output),
+                template_path=_resolve(base_dir, template) if template else default_template,
+                samples=[_sample_from_dict(base_dir, s) for s in raw.get("samples", [])],
+                request={str(k): str(v) for k, v in (raw.get("request") or {}).items()},
+            )
+        )
+    return jobs
+
+
+def _load_csv_manifest(path: Path, default_template: str) -> List[ReportJob]:
+    base_dir = path.parent
+    jobs: Dict[str, ReportJob] = {}
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            row = {(k or "").strip(): (v or "").strip() for k, v in row.items()}
+            output = row.get("output")
+            if not output:
+                raise ValueError(f"row without output: {row}")
+
+            job = jobs.get(output)
+            if job is None:
+                template = row.get("template")
+                job = ReportJob(
+                    output_path=_resolve(base_dir, output),
+                    template_path=_resolve(base_dir, template) if template else default_template,
+                )
+                jobs[output] = job
+
+            # request 字段：同一报告内取第一个非空值
+            for key, value in row.items():
+                if key in _SAMPLE_COLUMNS or not value:
+                    continue
+                job.request.setdefault(key, value)
+
+            job.samples.append(_sample_from_dict(base_dir, row))
+
+    return list(jobs.values())
+
+
+def load_manifest(path: str, default_template: Optional[str] = None) -> List[ReportJob]:
+    """按扩展名读取 JSON / CSV manifest，返回报告任务列表。"""
+    p = Path(path)
+    template = default_template or str(DEFAULT_TEMPLATE_PATH)
+    if p.suffix.lower() == ".csv":
+        jobs = _load_csv_manifest(p, template)
+    else:
+        jobs = _load_json_manifest(p, template)
+
+    for job in jobs:
+        if not job.samples:
+            raise ValueError(f"report has no samples: {job.output_path}")
+    return jobs
+
+
+# -----------------------------
+# 单份报告
+# -----------------------------
+def build_job_mapping(job: ReportJob, samples: List[SampleItem]) -> Dict[str, str]:
+    """
+    和 ReportController.build_mapping 对应的无界面版本：
+    - Request 字段来自 manifest
+    - 手动样品字段 / Auto 字段取第一个样品（GUI 里是“当前样品”）
+    - End_Date 取所有样品里最新的一天
+    """
+    mapping: Dict[str, str] = {}
+    for key in REQUEST_FIELDS:
+        mapping["{{" + key + "}}"] = ""
+    mapping["{{LSMP_code}}"] = DEFAULT_LSMP_CODE
+
+    for key, value in job.request.items():
+        placeholder = key if key.startswith("{{") else "{{" + key + "}}"
+        mapping[placeholder] = value.strip()
+
+    first = samples[0]
+    mf = first.manual_fields
+    af = first.auto_fields
+    mapping["{{Sample_id}}"] = mf.sample_id
+    mapping["{{Nature}}"] = mf.nature
+    mapping["{{Assign_to}}"] = mf.assign_to
+
+    mapping["{{Sample_name}}"] = af.sample_name
+    mapping["{{Sample_mass}}"] = af.sample_mass
+    mapping["{{Operator}}"] = af.operator
+    mapping["{{Instrument}}"] = af.instrument
+    mapping["{{Atmosphere}}"] = af.atmosphere
+    mapping["{{Crucible}}"] = af.crucible
+    mapping["{{Temp.Calib}}"] = af.temp_calib
+    mapping["{{End_Date}}"] = latest_end_date(samples, fallback=af.end_date)
+    return mapping
+
+
+def parse_job_samples(
+    job: ReportJob,
+    parse_service: DscParseService,
+    profiler: Optional[Profiler] = None,
+) -> List[SampleItem]:
+    """把 SampleSpec 解析成 SampleItem（basic + segments + auto/manual 字段）。"""
+    samples: List[SampleItem] = []
+    for idx, spec in enumerate(job.samples, start=1):
+        sample = SampleItem(
+            id=idx,
+            name=spec.name,
+            txt_path=spec.txt_path,
+            pdf_path=spec.pdf_path,
+        )
+        result = parse_service.parse_one(spec.txt_path, pdf_path=spec.pdf_path, profiler=profiler)
+        apply_basic_to_sample(sample, result)
+
+        # manifest 里给了 name 就以它为准（等同于 GUI 里手动改 Sample Name）
+        if spec.name:
+            sample.auto_fields.sample_name = spec.name
+        else:
+            sample.name = sample.auto_fields.sample_name or Path(spec.txt_path).stem
+
+        mf = sample.manual_fields
+        mf.sample_id = spec.sample_id
+        mf.nature = spec.nature
+        mf.assign_to = spec.assign_to
+        samples.append(sample)
+    return samples
+
+
+def run_report_job(
+    job: ReportJob,
+    parse_service: DscParseService,
+    report_service: ReportService,
+    profiler: Optional[Profiler] = None,
+) -> int:
+    """解析样品 -> 组 mapping / discussion -> 填模板保存，返回输出文件大小（字节）。"""
+    if not os.path.exists(job.template_path):
+        raise FileNotFoundError(f"Template don't exist: {job.template_path}")
+
+    with span(profiler, "parse_samples", samples=len(job.samples)):
+        samples = parse_job_samples(job, parse_service, profiler)
+    mapping = build_job_mapping(job, samples)
+
+    first = samples[0]
+    sample_name_for_segments = (
+        first.auto_fields.sample_name
+        or first.manual_fields.sample_id
+        or first.name
+    )
+
+    out_dir = os.path.dirname(job.output_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+
+    return report_service.generate_report(
+        job.template_path,
+        job.output_path,
+        mapping,
+        segments=first.segments,
+        discussion_text=report_service.build_discussion(samples),
+        pdf_path=first.pdf_path,
+        sample_name_for_segments=sample_name_for_segments,
+        figure_number="1",
+        samples=samples,
+        profiler=profiler,
+    )
+
+
+# -----------------------------
+# CLI
+# -----------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Generate DSC reports from a JSON/CSV manifest without the GUI."
+    )
+    parser.add_argument("manifest", type=str, help="manifest 路径（.json 或 .csv）")
+    parser.add_argument(
+        "--template",
+        type=str,
+        default=None,
+        help="默认模板路径（manifest 里没写 template 时使用）",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="不使用磁盘解析缓存",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="并行进程数（默认 CPU 核数；1 = 在当前进程里顺序生成）",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="单份报告超时时间（秒），超时记为失败",
+    )
+    parser.add_argument(
+        "--figure-mode",
+        choices=FIGURE_MODES,
+        default=FIGURE_MODE,
+        help="曲线图模式：raster = 位图；vector = 嵌入 SVG（Word 2016+）；target-size = 每张图不超过 --figure-max-kb",
+    )
+    parser.add_argument(
+        "--figure-max-kb",
+        type=int,
+        default=FIGURE_MAX_BYTES // 1024,
+        help="target-size 模式下每张图的大小上限（KB）",
+    )
+    parser.add_argument(
+        "--figure-format",
+        choices=FIGURE_FORMATS,
+        default=FIGURE_FORMAT,
+        help="曲线图编码格式（jpeg / png-gray / png-palette 体积更小）",
+    )
+    parser.add_argument(
+        "--figure-dpi",
+        type=int,
+        default=FIGURE_DPI,
+        help="曲线图渲染分辨率",
+    )
+    parser.add_argument(
+        "--jpeg-quality",
+        type=int,
+        default=FIGURE_JPEG_QUALITY,
+        help="--figure-format jpeg 时的压缩质量（1-95）",
+    )
+    parser.add_argument(
+        "--stream",
+        choices=("auto", "on", "off"),
+        default="auto",
+        help="流式写出 docx（数据行和曲线图直接写进 zip，内存占用不随样品数增长）；"
+             "auto = 样品数达到 config.STREAM_REPORT_MIN_SAMPLES 时开启",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="记录每份报告各阶段的耗时 / CPU / 内存：打印分解，并在 docx 旁边写 <报告名>.trace.json（Chrome trace）",
+    )
+    args = parser.parse_args(argv)
+    figure_options = FigureOptions(
+        mode=args.figure_mode,
+        dpi=args.figure_dpi,
+        fmt=args.figure_format,
+        jpeg_quality=args.jpeg_quality,
+        max_bytes=args.figure_max_kb * 1024,
+    )
+
+    try:
+        jobs = load_manifest(args.manifest, default_template=args.template)
+    except (OSError, ValueError) as e:
+        print(f"[Manifest Failed] {args.manifest} - {e}", file=sys.stderr)
+        return 2
+
+    # 放在这里 import：batch_engine 反过来依赖本模块的 ReportJob / run_report_job
+    from src.tools.batch_engine import run_batch
+
+    def _print_result(result) -> None:
+        if result.ok:
+            print(
+                f"[Generate Successful] {result.output_path} "
+                f"({result.seconds:.2f}s, {format_file_size(result.size_bytes)})"
+            )
+            for line in result.timings:
+                print(f"    {line}")
+        else:
+            print(f"[Generate Failed] {result.output_path} - {result.error}", file=sys.stderr)
+
+    summary = run_batch(
+        jobs,
+        workers=args.workers,
+        timeout=args.timeout,
+        use_cache=not args.no_cache,
+        figure_options=figure_options,
+        stream={"auto": None, "on": True, "off": False}[args.stream],
+        profile=args.profile,
+        on_result=_print_result,
+    )
+    print(summary.format())
+    return 1 if summary.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
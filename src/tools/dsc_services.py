@@ -1,12 +1,19 @@
 # src/tools/dsc_services.py
 from __future__ import annotations
 
+import os
 from dataclasses import dataclass
-from typing import Optional, List, Dict
+from datetime import datetime
+from typing import Callable, Optional, List, Dict
 
+from src.config.config import STREAM_REPORT_MIN_SAMPLES
+from src.models.event_table import DscEventTable
 from src.models.models import DscBasicInfo, DscSegment, SampleItem
-from src.utils.parser_dsc import parse_dsc_txt_basic, parse_dsc_segments
-from src.utils.templating import fill_template_with_mapping
+from src.utils.parser_dsc import scan_dsc_txt, apply_pdf_ranges
+from src.utils.parse_cache import ParseCache
+from src.utils.figure_cache import FigureCache, FigureOptions
+from src.utils.profiling import Profiler, span
+from src.utils.template_cache import TemplateCache
 from src.utils.dsc_text import generate_dsc_summary
 
 
@@ -17,16 +24,125 @@ class ParseResult:
 
 
 class DscParseService:
-    """负责：给定 txt/pdf 路径，解析出 basic + segments"""
+    """
+    负责：给定 txt/pdf 路径，解析出 basic + segments
+    传入 cache 时先查磁盘缓存，命中就跳过 TXT 正则和 PyMuPDF 读 Range。
+    """
 
-    def parse_one(self, txt_path: str, pdf_path: Optional[str] = None) -> ParseResult:
-        basic = parse_dsc_txt_basic(txt_path)
-        segments = parse_dsc_segments(txt_path, pdf_path=pdf_path)  # 允许内部抛异常给上层处理
-        return ParseResult(basic=basic, segments=segments)
+    def __init__(self, cache: Optional[ParseCache] = None):
+        self.cache = cache
+
+    def parse_one(
+        self,
+        txt_path: str,
+        pdf_path: Optional[str] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> ParseResult:
+        """profiler: 传入时记录 cache_lookup / scan_txt / pdf_ranges / cache_store 各段耗时。"""
+        with span(profiler, "parse_one", file=os.path.basename(txt_path)):
+            if self.cache is not None:
+                with span(profiler, "cache_lookup"):
+                    hit = self.cache.get(txt_path, pdf_path)
+                if hit is not None:
+                    basic, segments = hit
+                    return ParseResult(basic=basic, segments=segments)
+
+            # TXT 只解码、遍历一次，同时拿到 basic + segments；允许内部抛异常给上层处理
+            with span(profiler, "scan_txt"):
+                basic, segments = scan_dsc_txt(txt_path)
+            with span(profiler, "pdf_ranges"):
+                segments = apply_pdf_ranges(segments, pdf_path)
+
+            if self.cache is not None:
+                with span(profiler, "cache_store"):
+                    self.cache.put(txt_path, pdf_path, basic, segments)
+            return ParseResult(basic=basic, segments=segments)
+
+
+def apply_basic_to_sample(sample: SampleItem, result: ParseResult) -> None:
+    """
+    把解析结果写回 sample：basic_info / segments + 右侧 Auto 字段的初始文本。
+    segments 存成列式的 DscEventTable（兼容 List[DscSegment] 的属性访问），event 多的时候省内存。
+    """
+    basic = result.basic
+    sample.basic_info = basic
+    sample.segments = DscEventTable.from_segments(result.segments).segments
+
+    af = sample.auto_fields
+    af.sample_name = basic.sample_name or ""
+    if basic.sample_mass_mg is not None:
+        af.sample_mass = f"{basic.sample_mass_mg:.3f} mg"
+    else:
+        af.sample_mass = ""
+    af.operator = basic.operator or ""
+    af.instrument = basic.instrument or ""
+    af.atmosphere = basic.atmosphere or ""
+    af.crucible = basic.crucible or ""
+    af.temp_calib = basic.temp_calib or ""
+    af.end_date = basic.end_date or ""
+
+
+def format_file_size(num_bytes: int) -> str:
+    """1536 -> '1.5 KB'，日志和汇总里显示报告大小用。"""
+    if num_bytes < 1024:
+        return f"{num_bytes} B"
+    if num_bytes < 1024 * 1024:
+        return f"{num_bytes / 1024:.1f} KB"
+    return f"{num_bytes / (1024 * 1024):.1f} MB"
+
+
+def latest_end_date(samples: List[SampleItem], fallback: str = "") -> str:
+    """
+    在所有样品的 auto_fields.end_date 里取最新的日期（保持原始写法返回）；
+    一个能解析的都没有时返回 fallback。
+    """
+    candidates: list[tuple[datetime, str]] = []
+    for s in samples:
+        raw = (s.auto_fields.end_date or "").strip()
+        if not raw:
+            continue
+        dt = None
+        for fmt in ("%Y/%m/%d", "%Y-%m-%d", "%Y.%m.%d"):
+            try:
+                dt = datetime.strptime(raw, fmt)
+                break
+            except ValueError:
+                continue
+        if dt is not None:
+            candidates.append((dt, raw))
+
+    if not candidates:
+        return fallback
+
+    _, latest_raw = max(candidates, key=lambda x: x[0])
+    return latest_raw
 
 
 class ReportService:
-    """负责：discussion 文本生成 + 调用模板填充"""
+    """
+    负责：discussion 文本生成 + 调用模板填充
+    传入 figure_cache 时，PDF 曲线图的渲染结果走磁盘缓存；
+    figure_options 决定曲线图的 dpi / 编码格式。
+    模板总是经过内存里的 TemplateCache：同一个 service 生成多份报告时模板只解析一次。
+    stream：True / False 强制开关流式写出 docx；None 时样品数达到 STREAM_REPORT_MIN_SAMPLES 自动开启。
+    """
+
+    def __init__(
+        self,
+        figure_cache: Optional[FigureCache] = None,
+        figure_options: Optional[FigureOptions] = None,
+        template_cache: Optional[TemplateCache] = None,
+        stream: Optional[bool] = None,
+    ):
+        self.figure_cache = figure_cache
+        self.figure_options = figure_options or FigureOptions()
+        self.template_cache = template_cache or TemplateCache()
+        self.stream = stream
+
+    def use_stream(self, samples: List[SampleItem]) -> bool:
+        if self.stream is not None:
+            return self.stream
+        return len(samples or []) >= STREAM_REPORT_MIN_SAMPLES
 
     def build_discussion(self, samples: List[SampleItem]) -> str:
         pieces: list[str] = []
@@ -51,15 +167,29 @@ class ReportService:
         sample_name_for_segments: str,
         figure_number: str,
         samples: List[SampleItem],
-    ) -> None:
-        fill_template_with_mapping(
-            template_path,
-            output_path,
-            mapping,
-            segments=segments,
-            sample_name_for_segments=sample_name_for_segments,
-            discussion_text=discussion_text,
-            pdf_path=pdf_path,
-            figure_number=figure_number,
-            samples=samples,
-        )
\ No newline at end of file
+        progress: Optional[Callable[[str], None]] = None,
+        profiler: Optional[Profiler] = None,
+    ) -> int:
+        """填模板并保存，返回输出文件大小（字节）。profiler 传入时记录各阶段耗时。"""
+        # python-docx / lxml 在第一次生成报告时才导入（GUI 启动时不加载）
+        from src.utils.templating import fill_template_with_mapping
+
+        stream = self.use_stream(samples)
+        with span(profiler, "generate_report", samples=len(samples or []), stream=stream):
+            return fill_template_with_mapping(
+                template_path,
+                output_path,
+                mapping,
+                segments=segments,
+                sample_name_for_segments=sample_name_for_segments,
+                discussion_text=discussion_text,
+                pdf_path=pdf_path,
+                figure_number=figure_number,
+                samples=samples,
+                progress=progress,
+                figure_cache=self.figure_cache,
+                figure_options=self.figure_options,
+                template_cache=self.template_cache,
+                stream=stream,
+                profiler=profiler,
+            )
\ No newline at end of file
@@ -19,18 +19,8 @@ class FormController:
     # Step3: 手动样品字段 UI -> sample.manual_fields
     # -----------------------------
     def sync_manual_fields_from_ui(self) -> None:
-        v = self.view
-        if not v.samples:
-            return
-
-        for sample in v.samples:
-            widgets = v.sample_manual_widgets.get(sample.id)
-            if not widgets:
-                continue
-            mf = sample.manual_fields
-            mf.sample_id = widgets["sample_id"].text().strip()
-            mf.nature = widgets["nature"].text().strip()
-            mf.assign_to = widgets["assign_to"].text().strip()
+        # 手动字段表编辑时已经直接写回 sample.manual_fields，只需提交还开着的编辑器
+        self.view._sync_manual_fields_from_ui()
 
     # -----------------------------
     # mapping：Request 区
@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+normalize_template.py
+
+把 Word 模板里被拆到多个 run 的占位符（如 "{{Request" + "_id}}"）合并回一个 run，
+另存为规范化后的模板。GUI / 批量生成加载模板时也会在内存里做同样的处理，
+这个脚本用于把结果固化到模板文件本身（方便检查，也省掉每次加载时的合并）。
+
+用法示例：
+    python -m src.tools.normalize_template "DSC Report-Empty-2512.docx"
+    python -m src.tools.normalize_template in.docx -o out.docx
+"""
+
+import argparse
+from pathlib import Path
+
+from docx import Document
+
+from src.utils.template_index import build_template_index, normalize_split_placeholders
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Merge placeholders split across Word runs.")
+    parser.add_argument("template", type=str, help="模板 .docx 路径")
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=str,
+        default=None,
+        help="输出路径（默认：<模板名>-normalized.docx）",
+    )
+    args = parser.parse_args(argv)
+
+    src = Path(args.template)
+    if not src.exists():
+        print(f"Template don't exist: {src}")
+        return 2
+    out = Path(args.output) if args.output else src.with_name(f"{src.stem}-normalized{src.suffix}")
+
+    doc = Document(str(src))
+    merged = normalize_split_placeholders(doc)
+    doc.save(str(out))
+
+    index = build_template_index(doc)
+    print(f"Merged {merged} split placeholder(s); {len(index.tokens())} distinct placeholder(s).")
+    print(f"Saved: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,62 @@
+# src/tools/parse_worker.py
+from __future__ import annotations
+
+from typing import Optional
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.models.sample_registry import sample_content_hash
+from src.tools.dsc_services import DscParseService
+
+
+class ParseSignals(QObject):
+    """QRunnable 不是 QObject，信号挂在这个小对象上（在 GUI 线程里创建）。"""
+    finished = pyqtSignal(int, object, object)   # sample_id, ParseResult, 内容哈希（str 或 None）
+    failed = pyqtSignal(int, str)        # sample_id, 错误信息
+
+
+class ParseTask(QRunnable):
+    """
+    在 QThreadPool 里解析一个样品（TXT 扫描 + PDF Range 读取）。
+    - 结果通过 signals 回到 GUI 线程（跨线程信号自动排队）
+    - 顺带算好 TXT（+ PDF）的内容哈希一起发回去，SampleRegistry 的内容索引不用在 GUI 线程里读文件
+      （开着 ParseCache 时文件刚被哈希过，这一步直接命中 sha256 缓存）
+    - cancel() 之后，即使解析已经在跑，结果也不会再发出去
+    """
+
+    def __init__(
+        self,
+        sample_id: int,
+        txt_path: str,
+        pdf_path: Optional[str],
+        parse_service: DscParseService,
+    ):
+        super().__init__()
+        # 由 SampleController 持有引用并负责生命周期，线程池不要自动删除
+        self.setAutoDelete(False)
+        self.sample_id = sample_id
+        self.txt_path = txt_path
+        self.pdf_path = pdf_path
+        self.parse_service = parse_service
+        self.signals = ParseSignals()
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def run(self) -> None:
+        if self._cancelled:
+            return
+        try:
+            result = self.parse_service.parse_one(self.txt_path, pdf_path=self.pdf_path)
+            content_hash = sample_content_hash(self.txt_path, self.pdf_path)
+        except Exception as e:
+            if not self._cancelled:
+                self.signals.failed.emit(self.sample_id, str(e))
+            return
+        if not self._cancelled:
+            self.signals.finished.emit(self.sample_id, result, content_hash)
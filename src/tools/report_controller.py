@@ -4,7 +4,24 @@ from __future__ import annotations
 import os
 from typing import Optional
 
-from PyQt6.QtWidgets import QMessageBox, QDialog, QVBoxLayout, QTextEdit, QHBoxLayout, QPushButton
+from PyQt6.QtCore import Qt, QThreadPool
+from PyQt6.QtWidgets import (
+    QMessageBox, QDialog, QVBoxLayout, QTextEdit, QHBoxLayout, QPushButton, QProgressDialog,
+)
+
+from src.config.config import PROFILE_REPORTS, REPORT_STAGES
+from src.tools.dsc_services import format_file_size
+from src.tools.report_worker import ReportTask
+from src.utils.profiling import Profiler, trace_path_for
+
+# 进度对话框里显示的阶段说明
+_STAGE_LABELS = {
+    "tables": "Filling tables…",
+    "discussion": "Writing discussion…",
+    "figures": "Rendering DSC figures…",
+    "placeholders": "Replacing placeholders…",
+    "save": "Saving document…",
+}
 
 class ReportController:
     """
@@ -14,6 +31,11 @@ class ReportController:
 
     def __init__(self, view):
         self.view = view
+        # 正在后台生成的报告（同一时间只允许一份）
+        self._report_task: Optional[ReportTask] = None
+        self._progress_dlg: Optional[QProgressDialog] = None
+        # 开了 PROFILE_REPORTS 时，当前这份报告的分阶段计时
+        self._profiler: Optional[Profiler] = None
 
     # -----------------------------
     # Confirm 流程：弹窗 -> 点击 Generate report -> 生成报告
@@ -185,6 +207,10 @@ class ReportController:
     def generate_report(self):
         v = self.view
 
+        # 上一份还在后台生成
+        if self._report_task is not None:
+            return
+
         # 基础校验
         if not v.txt_path:
             QMessageBox.warning(v, "Info", "Choosing TXT")
@@ -227,25 +253,118 @@ class ReportController:
 
         discussion_text = v.report_service.build_discussion(v.samples)
         figure_number = "1"
-
-        try:
-            v.report_service.generate_report(
-                v.template_path,
-                v.output_path,
-                mapping,
+        self._profiler = Profiler() if PROFILE_REPORTS else None
+
+        # 填模板 / 渲染 PDF / doc.save 都放到线程池里，GUI 只负责进度条
+        task = ReportTask(
+            v.report_service,
+            dict(
+                template_path=v.template_path,
+                output_path=v.output_path,
+                mapping=mapping,
                 segments=segments,
                 discussion_text=discussion_text,
                 pdf_path=v.pdf_path if v.pdf_path else None,
                 sample_name_for_segments=sample_name_for_segments,
                 figure_number=figure_number,
                 samples=v.samples,
-            )
-            v._add_file_log(f"[Generate Successful] {os.path.basename(v.output_path)}")
-            # ✅ 成功提示：带“打开文件/文件夹”按钮
-            if hasattr(v, "show_report_success_dialog"):
-                v.show_report_success_dialog(v.output_path)
-            else:
-                QMessageBox.information(v, "Successful", "Generate Successful!\nCan open word and check")
-        except Exception as e:
-            v._add_file_log(f"[Generate Failed] {os.path.basename(v.output_path)} - {e}")
-            QMessageBox.critical(v, "Error", f"Generate Failed\n{e}")
\ No newline at end of file
+                profiler=self._profiler,
+            ),
+        )
+        task.signals.stage.connect(self._on_report_stage)
+        task.signals.finished.connect(self._on_report_finished)
+        task.signals.failed.connect(self._on_report_failed)
+        task.signals.cancelled.connect(self._on_report_cancelled)
+
+        # 窗口级模态：生成期间不能改样品数据（samples 是直接传给后台的）
+        dlg = QProgressDialog("Preparing…", "Cancel", 0, len(REPORT_STAGES), v)
+        dlg.setWindowTitle("Generating report")
+        dlg.setWindowModality(Qt.WindowModality.WindowModal)
+        dlg.setAutoClose(False)
+        dlg.setAutoReset(False)
+        dlg.setMinimumDuration(0)
+        dlg.canceled.connect(self._on_report_cancel_clicked)
+        dlg.setValue(0)
+        dlg.show()
+
+        self._report_task = task
+        self._progress_dlg = dlg
+        QThreadPool.globalInstance().start(task)
+
+    # -----------------------------
+    # 后台生成回调（都在 GUI 线程里执行）
+    # -----------------------------
+    def is_generating(self) -> bool:
+        return self._report_task is not None
+
+    def _on_report_cancel_clicked(self):
+        if self._report_task is None:
+            return
+        self._report_task.cancel()
+        if self._progress_dlg is not None:
+            self._progress_dlg.setLabelText("Cancelling…")
+
+    def _on_report_stage(self, index: int, name: str):
+        if self._progress_dlg is None or self._report_task is None:
+            return
+        if self._report_task.cancelled:
+            return
+        self._progress_dlg.setValue(index)
+        self._progress_dlg.setLabelText(_STAGE_LABELS.get(name, name))
+
+    def _finish_report_task(self) -> str:
+        """收尾：关掉进度框，返回这次生成的输出路径。"""
+        task, self._report_task = self._report_task, None
+        dlg, self._progress_dlg = self._progress_dlg, None
+        if dlg is not None:
+            # close() 会再发一次 canceled，先断开
+            dlg.canceled.disconnect(self._on_report_cancel_clicked)
+            dlg.close()
+            dlg.deleteLater()
+        return task.kwargs["output_path"] if task is not None else ""
+
+    def _report_timings(self, output_path: str) -> str:
+        """
+        取出这份报告的分阶段计时：写进日志，并在 docx 旁边导出 Chrome trace。
+        没开 PROFILE_REPORTS 时返回空字符串。
+        """
+        profiler, self._profiler = self._profiler, None
+        if profiler is None:
+            return ""
+        v = self.view
+        lines = profiler.format_breakdown()
+        for line in lines:
+            v._add_file_log(f"[Timing] {line}")
+        trace_path = trace_path_for(output_path)
+        try:
+            profiler.export_chrome_trace(trace_path)
+            lines.append(f"Trace: {trace_path}")
+        except OSError as e:
+            v._add_file_log(f"[Timing] trace not written - {e}")
+        return "\n".join(lines)
+
+    def _on_report_finished(self, size_bytes: int):
+        v = self.view
+        output_path = self._finish_report_task()
+        v._add_file_log(
+            f"[Generate Successful] {os.path.basename(output_path)} ({format_file_size(size_bytes)})"
+        )
+        timings = self._report_timings(output_path)
+        # ✅ 成功提示：带“打开文件/文件夹”按钮
+        if hasattr(v, "show_report_success_dialog"):
+            v.show_report_success_dialog(output_path, details=timings)
+        else:
+            QMessageBox.information(v, "Successful", "Generate Successful!\nCan open word and check")
+
+    def _on_report_failed(self, error: str):
+        v = self.view
+        output_path = self._finish_report_task()
+        v._add_file_log(f"[Generate Failed] {os.path.basename(output_path)} - {error}")
+        self._report_timings(output_path)
+        QMessageBox.critical(v, "Error", f"Generate Failed\n{error}")
+
+    def _on_report_cancelled(self):
+        v = self.view
+        output_path = self._finish_report_task()
+        v._add_file_log(f"[Generate Cancelled] {os.path.basename(output_path)}")
+        self._profiler = None
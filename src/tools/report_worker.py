@@ -0,0 +1,60 @@
+# src/tools/report_worker.py
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+from src.config.config import REPORT_STAGES
+from src.tools.dsc_services import ReportService
+
+
+class ReportCancelled(Exception):
+    """用户点了 Cancel：在下一个阶段开始前抛出，中断 fill_template_with_mapping。"""
+
+
+class ReportSignals(QObject):
+    stage = pyqtSignal(int, str)    # 阶段序号（从 0 开始）、阶段名
+    finished = pyqtSignal(int)      # 生成的 docx 大小（字节）
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class ReportTask(QRunnable):
+    """
+    在 QThreadPool 里跑一次 ReportService.generate_report。
+    - 每个阶段开始时发 stage 信号，GUI 用来刷新进度条
+    - cancel() 只在阶段之间生效：正在进行的阶段（比如某张图的渲染）会先跑完
+    - 取消发生在 save 之前，所以不会留下写了一半的 docx
+    """
+
+    def __init__(self, report_service: ReportService, kwargs: Dict[str, Any]):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.report_service = report_service
+        self.kwargs = kwargs
+        self.signals = ReportSignals()
+        self._cancelled = False
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def _on_stage(self, name: str) -> None:
+        if self._cancelled:
+            raise ReportCancelled()
+        self.signals.stage.emit(REPORT_STAGES.index(name), name)
+
+    def run(self) -> None:
+        try:
+            size = self.report_service.generate_report(progress=self._on_stage, **self.kwargs)
+        except ReportCancelled:
+            self.signals.cancelled.emit()
+            return
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(size)
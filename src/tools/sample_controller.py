@@ -3,31 +3,74 @@ from __future__ import annotations
 
 from typing import Optional
 
+from PyQt6.QtCore import QThreadPool
+
+from src.tools.parse_worker import ParseTask
+
 
 class SampleController:
     def __init__(self, view):
         self.view = view
+        # 后台解析：sample_id -> 正在跑 / 排队中的 ParseTask
+        self._parse_tasks: dict[int, ParseTask] = {}
+        self._pool = QThreadPool.globalInstance()
 
     # -----------------------------
     # 基础：当前样品/索引
     # -----------------------------
     def get_current_sample(self):
         v = self.view
-        if v.current_sample_id is None:
-            return None
-        for s in v.samples:
-            if s.id == v.current_sample_id:
-                return s
-        return None
+        return v.samples.get(v.current_sample_id)
 
     def get_current_sample_index(self) -> int:
         v = self.view
-        if v.current_sample_id is None or not v.samples:
-            return -1
-        for idx, s in enumerate(v.samples):
-            if s.id == v.current_sample_id:
-                return idx
-        return -1
+        return v.samples.index_of(v.current_sample_id)
+
+    # -----------------------------
+    # 后台解析（QThreadPool）
+    # -----------------------------
+    def is_parsing(self, sample_id: int) -> bool:
+        return sample_id in self._parse_tasks
+
+    def start_parse(self, sample) -> None:
+        """把样品的 TXT/PDF 解析丢进线程池；同一个样品已在解析时不重复提交。"""
+        v = self.view
+        if not sample.txt_path or sample.id in self._parse_tasks:
+            return
+
+        task = ParseTask(sample.id, sample.txt_path, sample.pdf_path, v.parse_service)
+        task.signals.finished.connect(self._on_parse_finished)
+        task.signals.failed.connect(self._on_parse_failed)
+        self._parse_tasks[sample.id] = task
+        self._pool.start(task)
+        v.samples.mark_changed(sample.id)   # 列表里显示 “Parsing…”
+
+    def cancel_parse(self, sample_id: int) -> None:
+        """样品被删除时调用：还没开始的直接从队列里拿掉，已经在跑的丢弃结果。"""
+        task = self._parse_tasks.pop(sample_id, None)
+        if task is None:
+            return
+        task.cancel()
+        self._pool.tryTake(task)
+
+    def _on_parse_finished(self, sample_id: int, result, content_hash) -> None:
+        task = self._parse_tasks.pop(sample_id, None)
+        if task is None or task.cancelled:
+            return
+        sample = self.view.samples.get(sample_id)
+        if sample is None:
+            return
+        self.view.samples.set_content_hash(sample_id, content_hash)
+        self.view._on_sample_parsed(sample, result)
+
+    def _on_parse_failed(self, sample_id: int, error: str) -> None:
+        task = self._parse_tasks.pop(sample_id, None)
+        if task is None or task.cancelled:
+            return
+        sample = self.view.samples.get(sample_id)
+        if sample is None:
+            return
+        self.view._on_sample_parse_failed(sample, error)
 
     # -----------------------------
     # Step2：顶部样品 header 刷新
@@ -124,11 +167,12 @@ class SampleController:
     def on_sample_card_clicked(self, sample_id: int):
         v = self.view
 
+        # 正在解析的样品 UI 里只是占位内容，不回写
         current = self.get_current_sample()
-        if current is not None:
+        if current is not None and not self.is_parsing(current.id):
             self.store_ui_to_sample(current)
 
-        sample = next((s for s in v.samples if s.id == sample_id), None)
+        sample = v.samples.get(sample_id)
         if not sample:
             return
 
@@ -154,12 +198,10 @@ class SampleController:
             return
 
         new_name = text.strip()
-        sample.name = new_name
         sample.auto_fields.sample_name = new_name
 
-        v._sync_manual_fields_from_ui()
-        v._rebuild_sample_list_ui()
-        v._rebuild_manual_sample_forms()
+        # 每敲一个字都会进来：registry 更新名字索引，列表 / 手动字段表只刷新这一行
+        v.samples.rename(sample.id, new_name)
         self.update_auto_sample_header()
 
     # -----------------------------
@@ -167,21 +209,22 @@ class SampleController:
     # -----------------------------
     def add_new_sample(self, sample_name: str, txt_path: str, pdf_path: Optional[str]):
         v = self.view
-
         sample = v.SampleItem(
-            id=v._next_sample_id,
+            id=v.samples.new_id(),
             name=sample_name,
             txt_path=txt_path,
             pdf_path=pdf_path,
         )
-        v._next_sample_id += 1
 
-        v.samples.append(sample)
+        # 切换前先保存当前样品的编辑（新样品解析期间 Step2 会显示占位状态）
+        current = self.get_current_sample()
+        if current is not None and not self.is_parsing(current.id):
+            self.store_ui_to_sample(current)
+
+        v.samples.add(sample)
         v.current_sample_id = sample.id
 
         v._parse_sample(sample)
-        v._rebuild_sample_list_ui()
-        v._rebuild_manual_sample_forms()
         self.update_auto_sample_header()
 
     # -----------------------------
@@ -189,7 +232,7 @@ class SampleController:
     # -----------------------------
     def remove_sample(self, sample_id: int):
         v = self.view
-        target = next((s for s in v.samples if s.id == sample_id), None)
+        target = v.samples.get(sample_id)
         if not target:
             return
 
@@ -197,7 +240,9 @@ class SampleController:
         if not ok:
             return
 
-        v.samples = [s for s in v.samples if s.id != sample_id]
+        # 还没解析完就被删掉：取消后台任务，结果直接丢弃
+        self.cancel_parse(sample_id)
+        v.samples.remove(sample_id)
 
         if v.current_sample_id == sample_id:
             if v.samples:
@@ -231,8 +276,6 @@ class SampleController:
 
                 v.segments_ctrl.reset()
 
-        v._rebuild_sample_list_ui()
-        v._rebuild_manual_sample_forms()
         self.update_auto_sample_header()
 
         v._add_file_log(f"[Sample Removed] {target.name}")
\ No newline at end of file
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+startup_profile.py
+
+启动路径的导入耗时报告：在子进程里用 `python -X importtime` 导入目标模块（默认 GUI 入口 src.ui.ui_main），
+按累计耗时列出最慢的模块，并检查 PyMuPDF / python-docx / lxml 有没有被提前导入
+（见 src/utils/lazy_imports.py 的约定）。
+
+用法示例（在项目根目录下）：
+    python -m src.tools.startup_profile
+    python -m src.tools.startup_profile --module main --top 30
+    python -m src.tools.startup_profile --check --budget-ms 150     # CI：有重模块被导入 / 超预算就返回 1
+    python -m src.tools.startup_profile --json startup.json
+
+注意：每次都是新进程冷导入，但操作系统的文件缓存是热的；第一次跑往往偏慢，看第二次的数。
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from dataclasses import asdict, dataclass, field
+from typing import List, Optional
+
+from src.config.config import BASE_DIR
+from src.utils.lazy_imports import HEAVY_MODULES
+
+
+@dataclass
+class ImportEntry:
+    name: str
+    self_us: int
+    cumulative_us: int
+    depth: int          # 0 = 目标模块本身，1 = 它直接导入的模块，以此类推
+
+
+@dataclass
+class ImportProfile:
+    module: str
+    total_ms: float                          # 目标模块自身的累计导入时间
+    heavy_loaded: List[str] = field(default_factory=list)
+    entries: List[ImportEntry] = field(default_factory=list)
+
+    def slowest(self, top: int = 20) -> List[ImportEntry]:
+        return sorted(self.entries, key=lambda e: e.cumulative_us, reverse=True)[:top]
+
+
+def _parse_importtime(stderr: str) -> List[ImportEntry]:
+    """
+    解析 -X importtime 的输出：
+        import time: self [us] | cumulative | imported package
+        import time:       290 |       5835 |     docx.opc.oxml
+    包名前面的缩进（每层两个空格）就是嵌套深度。
+    """
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue
+        raw_name = parts[2].rstrip()
+        name = raw_name.lstrip()
+        depth = (len(raw_name) - len(name) - 1) // 2
+        entries.append(ImportEntry(name, int(parts[0]), int(parts[1]), depth))
+    return entries
+
+
+def profile_imports(module: str = "src.ui.ui_main") -> ImportProfile:
+    """在新的子进程里导入 module，返回导入耗时和提前导入了的重模块。"""
+    script = (
+        f"import {module}\n"
+        "import json, sys\n"
+        f"print(json.dumps([m for m in {list(HEAVY_MODULES)!r} if m in sys.modules]))\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", script],
+        capture_output=True,
+        text=True,
+        cwd=str(BASE_DIR),
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr.strip().splitlines()[-1]}")
+
+    heavy = json.loads(proc.stdout.strip().splitlines()[-1])
+    entries = _parse_importtime(proc.stderr)
+    # 目标模块那一行在它所有子模块之后；再往后是脚本自己的 json / sys，不算
+    target_idx = next((i for i, e in enumerate(entries) if e.name == module and e.depth == 0), None)
+    if target_idx is None:
+        # 目标在解释器启动阶段就已经被导入过了
+        return ImportProfile(module=module, total_ms=0.0, heavy_loaded=heavy)
+    entries = entries[:target_idx + 1]
+    total_ms = entries[-1].cumulative_us / 1000
+    return ImportProfile(module=module, total_ms=total_ms, heavy_loaded=heavy, entries=entries)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report import time on the application startup path.")
+    parser.add_argument("--module", type=str, default="src.ui.ui_main", help="要导入的模块（默认 GUI 主窗口）")
+    parser.add_argument("--top", type=int, default=20, help="列出最慢的前 N 个模块")
+    parser.add_argument("--check", action="store_true", help="有重模块（PyMuPDF / python-docx / lxml）被导入时返回 1")
+    parser.add_argument("--budget-ms", type=float, default=None, help="目标模块累计导入时间超过这个值时返回 1")
+    parser.add_argument("--json", type=str, default=None, help="把完整结果写成 JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        profile = profile_imports(args.module)
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    print(f"import {profile.module}: {profile.total_ms:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for e in profile.slowest(args.top):
+        print(f"{e.cumulative_us / 1000:14.1f} {e.self_us / 1000:9.1f}  {'  ' * e.depth}{e.name}")
+
+    if profile.heavy_loaded:
+        print(f"Heavy modules loaded at import: {', '.join(profile.heavy_loaded)}")
+    else:
+        print("Heavy modules loaded at import: none")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(asdict(profile), f, indent=2)
+
+    failed = False
+    if args.check and profile.heavy_loaded:
+        print("[Check Failed] heavy modules are imported on the startup path", file=sys.stderr)
+        failed = True
+    if args.budget_ms is not None and profile.total_ms > args.budget_ms:
+        print(f"[Check Failed] {profile.total_ms:.1f} ms > budget {args.budget_ms:.1f} ms", file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
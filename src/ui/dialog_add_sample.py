@@ -8,7 +8,7 @@ from PyQt6.QtWidgets import (
     QLineEdit, QFileDialog, QMessageBox, QFrame, QGridLayout, QSizePolicy
 )
 from PyQt6.QtCore import Qt
-from src.utils.parser_dsc import parse_dsc_txt_basic
+from src.utils.parser_dsc import read_dsc_sample_name
 
 
 class AddSampleDialog(QDialog):
@@ -173,8 +173,8 @@ class AddSampleDialog(QDialog):
 
         if not self.edit_name.text().strip():
             try:
-                basic = parse_dsc_txt_basic(path)
-                auto_name = basic.sample_name or ""
+                # 只读到 Sample name 行为止，完整解析留给 DscParseService
+                auto_name = read_dsc_sample_name(path)
                 if not auto_name:
                     auto_name = Path(path).stem
                 self.edit_name.setText(auto_name)
@@ -2,22 +2,25 @@
 import os
 from typing import Optional, List
 from pathlib import Path
-from datetime import datetime
 
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QPushButton, QFileDialog, QTextEdit, QFormLayout,
     QMessageBox, QScrollArea, QSizePolicy, QFrame, QDialog, QStackedWidget,
-    QSpacerItem, QGridLayout, QApplication, QStyle
+    QGridLayout, QApplication, QStyle, QTableView, QHeaderView, QAbstractItemView
 )
-from PyQt6.QtCore import Qt, QUrl
+from PyQt6.QtCore import Qt, QTimer, QUrl
 from PyQt6.QtGui import QPixmap, QResizeEvent, QFont, QDesktopServices
 
-from src.config.config import DEFAULT_TEMPLATE_PATH, LOGO_PATH
-from src.utils.parser_dsc import parse_dsc_txt_basic
+from src.config.config import DEFAULT_TEMPLATE_PATH, FONT_SCALE_BUCKETS, FONT_SCALE_DEBOUNCE_MS, LOGO_PATH
 from src.models.models import DscBasicInfo, DscSegment, SampleItem
+from src.models.sample_registry import (
+    SAMPLE_ABOUT_TO_REMOVE, SAMPLE_ABOUT_TO_RESET, SAMPLE_INSERTED, SAMPLE_REMOVED, SAMPLE_RESET, SampleRegistry,
+)
 from src.ui.dialog_add_sample import AddSampleDialog
-from src.tools.dsc_services import DscParseService, ReportService
+from src.tools.dsc_services import DscParseService, ReportService, apply_basic_to_sample, latest_end_date
+from src.utils.parse_cache import ParseCache
+from src.utils.figure_cache import FigureCache
 
 from src.tools.workflow_controller import WorkflowController
 from src.tools.sample_controller import SampleController
@@ -25,9 +28,21 @@ from src.tools.segments_controller import SegmentsController
 from src.tools.report_controller import ReportController
 
 from src.tools.theme_controller import ThemeController
+from src.ui.widgets.sample_views import (
+    ManualFieldsDelegate, ManualFieldsModel, SampleCardDelegate, SampleListModel, SampleListView,
+)
+from src.ui.widgets.segments_view import SegmentsDelegate, SegmentsModel
 from src.ui.widgets.toggle_switch import ToggleSwitch
 
 
+def font_bucket_for_width(width: int) -> int:
+    """窗口宽度 -> 基础字号（FONT_SCALE_BUCKETS 里的一档）。"""
+    for min_width, size in FONT_SCALE_BUCKETS:
+        if width >= min_width:
+            return size
+    return FONT_SCALE_BUCKETS[-1][1]
+
+
 class MainWindow(QMainWindow):
     SampleItem = SampleItem
 
@@ -46,23 +61,22 @@ class MainWindow(QMainWindow):
         self.parsed_segments: Optional[List[DscSegment]] = None
         self.confirmed: bool = False
 
-        self.parse_service = DscParseService()
-        self.report_service = ReportService()
+        self.parse_service = DscParseService(cache=ParseCache())
+        self.report_service = ReportService(figure_cache=FigureCache())
 
         self._auto_edits: list[QLineEdit] = []
 
-        self.samples: list[SampleItem] = []
+        # 样品集合：按 id / 行号 / 名字查找都是 O(1)，增删改通过订阅通知到样品列表和手动字段表
+        # （先于两个 model 订阅：删除前要先提交手动字段表里还开着的编辑器）
+        self.samples = SampleRegistry()
+        self.samples.subscribe(self._on_samples_event)
         self.current_sample_id: Optional[int] = None
-        self._next_sample_id: int = 1
-
-        self.sample_manual_widgets: dict[int, dict[str, QLineEdit]] = {}
 
         self.file_logs: List[str] = []
         self.confirm_block: Optional[str] = None
 
         self.current_step: int = 0
         self.step_completed: List[bool] = [False, False, False]
-        self.add_sample_btn: Optional[QPushButton] = None
 
         # ✅ Step1 files grid metrics
         self._files_grid: Optional[QGridLayout] = None
@@ -71,6 +85,15 @@ class MainWindow(QMainWindow):
         self._tpl_box_layout: Optional[QHBoxLayout] = None
         self._out_box_layout: Optional[QHBoxLayout] = None
 
+        # ✅ 字体缩放：只在字号档位变化时重设；要缩放的控件登记成 (控件, 相对基础字号的增量, 是否加粗)，
+        # 不再每次 findChildren 扫整棵控件树（控件都在 __init__ 里建好，列表 / 表格只换 model 不重建）
+        self._font_bucket: Optional[int] = None
+        self._font_widgets: list[tuple[QWidget, int, bool]] = []
+        self._font_scale_timer = QTimer(self)
+        self._font_scale_timer.setSingleShot(True)
+        self._font_scale_timer.setInterval(FONT_SCALE_DEBOUNCE_MS)
+        self._font_scale_timer.timeout.connect(self._apply_font_scaling)
+
         # ==== Theme Controller ====
         app = QApplication.instance()
         project_root = Path(__file__).resolve().parents[2]  # src/ui/ui_main.py -> project root
@@ -138,6 +161,7 @@ class MainWindow(QMainWindow):
 
         self.title_label = QLabel("DSC Reports Generation Tool")
         self.title_label.setObjectName("AppTitle")
+        self._register_font(self.title_label, 6, bold=True)
         top_row.addWidget(self.title_label, 0)
 
         top_row.addStretch(1)
@@ -175,6 +199,7 @@ class MainWindow(QMainWindow):
             btn.setEnabled(False)
             btn.setProperty("state", "todo")
             self.step_buttons.append(btn)
+            self._register_font(btn, 2)
             step_bar_layout.addWidget(btn)
 
             if i < len(step_titles) - 1:
@@ -194,6 +219,8 @@ class MainWindow(QMainWindow):
 
         self.btn_next = QPushButton("Next")
         self.btn_next.setObjectName("StepNavButtonPrimary")
+        self._register_font(self.btn_prev)
+        self._register_font(self.btn_next)
 
         root_layout.addWidget(header_widget)
         root_layout.addWidget(_create_separator("h"))
@@ -221,6 +248,7 @@ class MainWindow(QMainWindow):
         # =====================================================================
         def _new_input() -> QLineEdit:
             e = QLineEdit()
+            self._register_font(e)
             e.setMinimumWidth(140)
             e.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
             return e
@@ -228,6 +256,7 @@ class MainWindow(QMainWindow):
         def _add_form_row(form: QFormLayout, text: str, widget: QWidget):
             label = QLabel(text)
             label.setObjectName("FieldLabel")
+            self._register_font(label)
             form.addRow(label, widget)
 
         # =====================================================================
@@ -312,6 +341,8 @@ class MainWindow(QMainWindow):
         self._header_field_labels = [lbl_tpl, lbl_out]
         self._header_field_values = [self.label_tpl, self.output_label]
         self._header_field_buttons = [btn_tpl, btn_out]
+        for wdg in (lbl_tpl, lbl_out, *self._header_field_values, *self._header_field_buttons):
+            self._register_font(wdg)
 
         s1_layout.addWidget(files_group, 0, Qt.AlignmentFlag.AlignHCenter)
 
@@ -323,23 +354,29 @@ class MainWindow(QMainWindow):
 
         lbl_samples = QLabel("Samples")
         lbl_samples.setObjectName("sectionTitle")
+        self._register_font(lbl_samples, 2, bold=True)
         sample_group_layout.addWidget(lbl_samples)
 
-        self.sample_scroll = QScrollArea()
-        self.sample_scroll.setWidgetResizable(True)
-
-        self.sample_list_container = QWidget()
-        self.sample_list_layout = QVBoxLayout(self.sample_list_container)
-        self.sample_list_layout.setContentsMargins(0, 0, 0, 0)
-        self.sample_list_layout.setSpacing(8)
-
-        self.sample_scroll.setWidget(self.sample_list_container)
-        sample_group_layout.addWidget(self.sample_scroll)
+        self.add_sample_btn = QPushButton("+ Add Sample")
+        self.add_sample_btn.setObjectName("AddSampleButton")
+        self.add_sample_btn.clicked.connect(self.on_add_sample_clicked)
+        self._register_font(self.add_sample_btn)
+        sample_group_layout.addWidget(self.add_sample_btn)
+        sample_group_layout.addSpacing(6)
+
+        # 样品列表：model 直接读 self.samples，卡片由 delegate 画（见 src/ui/widgets/sample_views.py）
+        self.sample_list_model = SampleListModel(self.samples, lambda sid: self.sample_ctrl.is_parsing(sid), self)
+        self.sample_list_view = SampleListView()
+        self.sample_list_view.setObjectName("SampleList")
+        self.sample_list_view.setModel(self.sample_list_model)
+        self.sample_card_delegate = SampleCardDelegate(self.sample_list_view)
+        self.sample_list_view.setItemDelegate(self.sample_card_delegate)
+        self._register_font(self.sample_list_view)
+        sample_group_layout.addWidget(self.sample_list_view, 1)
 
         s1_layout.addWidget(sample_group, stretch=1)
         self.step_stack.addWidget(step1)
 
-        self._rebuild_sample_list_ui()
         self._set_output_empty_style()
 
         # =====================================================================
@@ -361,6 +398,8 @@ class MainWindow(QMainWindow):
 
         self.btn_next_sample = QPushButton("▶")
         self.btn_next_sample.setObjectName("SampleNavButton")
+        for wdg in (self.label_current_sample, self.btn_prev_sample, self.btn_next_sample):
+            self._register_font(wdg)
 
         auto_header_layout.addWidget(self.label_current_sample)
         auto_header_layout.addWidget(self.btn_prev_sample)
@@ -382,6 +421,7 @@ class MainWindow(QMainWindow):
 
         def _new_auto_input() -> QLineEdit:
             e = QLineEdit()
+            self._register_font(e)
             e.setMinimumWidth(260)
             e.setMaximumWidth(520)
             e.setSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.Fixed)
@@ -400,6 +440,7 @@ class MainWindow(QMainWindow):
 
         title_auto = QLabel("Automatically identified fields:")
         title_auto.setObjectName("sectionTitle")
+        self._register_font(title_auto, 2, bold=True)
         auto_form.addRow(title_auto)
 
         _add_form_row(auto_form, "Sample Name:", self.auto_sample_name)
@@ -411,17 +452,35 @@ class MainWindow(QMainWindow):
         _add_form_row(auto_form, "Temp.Calib.:", self.auto_temp_calib)
         _add_form_row(auto_form, "End Date:", self.auto_end_date)
 
+        auto_scroll.setWidget(auto_container)
+        s2_layout.addWidget(auto_scroll)
+
+        # Segments 编辑表放在滚动区外面，拿走剩下的高度（表自己滚动、按需加载行）
+        seg_header_layout = QHBoxLayout()
         seg_title = QLabel("Segments:")
         seg_title.setObjectName("sectionTitle")
-        auto_vbox.addWidget(seg_title)
-
-        self.segment_area_layout = QVBoxLayout()
-        self.segment_area_layout.setContentsMargins(0, 0, 0, 0)
-        self.segment_area_layout.setSpacing(4)
-        auto_vbox.addLayout(self.segment_area_layout)
-
-        auto_scroll.setWidget(auto_container)
-        s2_layout.addWidget(auto_scroll, stretch=1)
+        self._register_font(seg_title, 2, bold=True)
+        self.segments_status_label = QLabel("")
+        self.segments_status_label.setObjectName("FieldLabel")
+        self._register_font(self.segments_status_label)
+        seg_header_layout.addWidget(seg_title)
+        seg_header_layout.addWidget(self.segments_status_label, 1)
+        s2_layout.addLayout(seg_header_layout)
+
+        self.segments_model = SegmentsModel(self)
+        self.segments_table = QTableView()
+        self.segments_table.setModel(self.segments_model)
+        self.segments_table.setItemDelegate(SegmentsDelegate(self.segments_table))
+        self.segments_table.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        self.segments_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.segments_table.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.segments_table.setWordWrap(False)
+        self.segments_table.verticalHeader().setVisible(False)
+        self.segments_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.segments_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.segments_table.horizontalHeader().setStretchLastSection(True)
+        self._register_font(self.segments_table)
+        s2_layout.addWidget(self.segments_table, stretch=1)
         self.step_stack.addWidget(step2)
         self._refresh_auto_edits_width()
 
@@ -435,6 +494,7 @@ class MainWindow(QMainWindow):
 
         lbl_manual_title = QLabel("Manual request & sample information")
         lbl_manual_title.setObjectName("sectionTitle")
+        self._register_font(lbl_manual_title, 2, bold=True)
         s3_layout.addWidget(lbl_manual_title)
 
         manual_block = QWidget()
@@ -455,6 +515,7 @@ class MainWindow(QMainWindow):
         self.input_report_date = _new_input()
 
         self.input_request_desc = QTextEdit()
+        self._register_font(self.input_request_desc)
         self.input_request_desc.setAcceptRichText(False)
         self.input_request_desc.setMinimumWidth(140)
         self.input_request_desc.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
@@ -482,24 +543,36 @@ class MainWindow(QMainWindow):
 
         scroll_request.setWidget(request_container)
 
-        scroll_sample = QScrollArea()
-        scroll_sample.setWidgetResizable(True)
-        sample_container = QWidget()
-
-        self.sample_manual_layout = QVBoxLayout(sample_container)
-        self.sample_manual_layout.setContentsMargins(0, 0, 0, 0)
-        self.sample_manual_layout.setSpacing(8)
-
-        scroll_sample.setWidget(sample_container)
+        sample_pane = QWidget()
+        sample_pane_layout = QVBoxLayout(sample_pane)
+        sample_pane_layout.setContentsMargins(0, 0, 0, 0)
+        sample_pane_layout.setSpacing(8)
+
+        self.manual_empty_label = QLabel("No samples. Please add samples in Step 1.")
+        sample_pane_layout.addWidget(self.manual_empty_label)
+
+        # 每个样品一行（Sample | Sample Id | Nature | Assign To），单击即可编辑，改动直接写回 sample.manual_fields
+        self.manual_fields_model = ManualFieldsModel(self.samples, self)
+        self.manual_table = QTableView()
+        self.manual_table.setModel(self.manual_fields_model)
+        self.manual_table.setItemDelegate(ManualFieldsDelegate(self.manual_table))
+        self.manual_table.setEditTriggers(QAbstractItemView.EditTrigger.AllEditTriggers)
+        self.manual_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.manual_table.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.manual_table.verticalHeader().setVisible(False)
+        self.manual_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.manual_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self._register_font(self.manual_table)
+        sample_pane_layout.addWidget(self.manual_table, 1)
 
         manual_hbox.addWidget(scroll_request, 2)
         manual_hbox.addWidget(_create_separator("v"), 0)
-        manual_hbox.addWidget(scroll_sample, 3)
+        manual_hbox.addWidget(sample_pane, 3)
 
         s3_layout.addWidget(manual_block, stretch=1)
         self.step_stack.addWidget(step3)
 
-        self._rebuild_manual_sample_forms()
+        self._update_manual_empty_state()
         self._init_placeholders()
 
         if not os.path.exists(self.template_path):
@@ -516,7 +589,7 @@ class MainWindow(QMainWindow):
         # =====================================================================
         self.workflow = WorkflowController(self)
         self.sample_ctrl = SampleController(self)
-        self.segments_ctrl = SegmentsController(self, self.segment_area_layout)
+        self.segments_ctrl = SegmentsController(self, self.segments_table, self.segments_status_label)
         self.report_ctrl = ReportController(self)
 
         self.btn_prev.clicked.connect(self.workflow.on_prev_clicked)
@@ -524,6 +597,11 @@ class MainWindow(QMainWindow):
         self.btn_prev_sample.clicked.connect(self.sample_ctrl.goto_prev_sample)
         self.btn_next_sample.clicked.connect(self.sample_ctrl.goto_next_sample)
         self.auto_sample_name.textChanged.connect(self.sample_ctrl.on_auto_sample_name_changed)
+        self.sample_card_delegate.cardClicked.connect(self.sample_ctrl.on_sample_card_clicked)
+        # 排队执行：删除会弹确认框、改动 model，别在列表自己的鼠标事件里做
+        self.sample_card_delegate.removeClicked.connect(
+            self.sample_ctrl.remove_sample, Qt.ConnectionType.QueuedConnection
+        )
 
         self.workflow.update_step_states()
         self.workflow.update_nav_buttons()
@@ -546,7 +624,7 @@ class MainWindow(QMainWindow):
 
         # 切换后强制同步一次，避免控件sizeHint不一致
         self._sync_theme_switch_metrics()
-        self._apply_font_scaling()
+        self._apply_font_scaling(force=True)
         self.updateGeometry()
 
     def _sync_theme_switch_metrics(self):
@@ -613,92 +691,34 @@ class MainWindow(QMainWindow):
     # =====================================================================
     # 字体缩放
     # =====================================================================
-    def _apply_font_scaling(self):
+    def _register_font(self, widget: QWidget, delta: int = 0, bold: bool = False) -> None:
+        """登记 __init__ 里建好的控件：字号 = 基础字号 + delta。"""
+        self._font_widgets.append((widget, delta, bold))
+
+    def _apply_font_scaling(self, force: bool = False):
+        """
+        按窗口宽度所在的档位重设字体；档位没变时直接返回（force=True 时照样重设，比如切换主题后）。
+        """
         app = QApplication.instance()
         if app is None:
             return
 
-        w = max(self.width(), 900)
-        if w >= 1700:
-            base = 20
-        elif w >= 1300:
-            base = 18
-        else:
-            base = 16
+        base = font_bucket_for_width(self.width())
+        if base == self._font_bucket and not force:
+            return
+        self._font_bucket = base
 
         app_font = QFont(app.font())
         app_font.setPointSize(base)
         app.setFont(app_font)
 
-        title_size = base + 6
-        tf = QFont(self.title_label.font())
-        tf.setPointSize(title_size)
-        tf.setBold(True)
-        self.title_label.setFont(tf)
-
-        step_size = base + 2
-        for btn in self.step_buttons:
-            f = QFont(btn.font())
-            f.setPointSize(step_size)
-            btn.setFont(f)
-
-        for lbl in self.findChildren(QLabel, "sectionTitle"):
-            f = QFont(lbl.font())
-            f.setPointSize(step_size)
-            f.setBold(True)
-            lbl.setFont(f)
-
-        for lbl in self.findChildren(QLabel, "SampleManualTitle"):
-            f = QFont(lbl.font())
-            f.setPointSize(step_size - 1)
-            f.setBold(True)
-            lbl.setFont(f)
-
-        nav_size = base
-        for btn in (self.btn_prev, self.btn_next, self.btn_prev_sample, self.btn_next_sample):
-            f = QFont(btn.font())
-            f.setPointSize(nav_size)
-            btn.setFont(f)
-
-        f_lbl = QFont(self.label_current_sample.font())
-        f_lbl.setPointSize(nav_size)
-        self.label_current_sample.setFont(f_lbl)
-
-        for lbl in self.findChildren(QLabel, "HeaderLabel"):
-            f = QFont(lbl.font())
-            f.setPointSize(base)
-            lbl.setFont(f)
-
-        for lbl in self.findChildren(QLabel, "FieldLabel"):
-            f = QFont(lbl.font())
-            f.setPointSize(base)
-            lbl.setFont(f)
-
-        for e in self.findChildren(QLineEdit):
-            f = QFont(e.font())
-            f.setPointSize(base)
-            e.setFont(f)
-
-        for t in self.findChildren(QTextEdit):
-            f = QFont(t.font())
-            f.setPointSize(base)
-            t.setFont(f)
-
-        for lbl in getattr(self, "_header_field_labels", []):
-            f = QFont(lbl.font())
-            f.setPointSize(base)
-            lbl.setFont(f)
-
-        for wdg in getattr(self, "_header_field_values", []) + getattr(self, "_header_field_buttons", []):
+        for wdg, delta, bold in self._font_widgets:
             f = QFont(wdg.font())
-            f.setPointSize(base)
+            f.setPointSize(base + delta)
+            if bold:
+                f.setBold(True)
             wdg.setFont(f)
 
-        if getattr(self, "add_sample_btn", None) is not None:
-            f = QFont(self.add_sample_btn.font())
-            f.setPointSize(base)
-            self.add_sample_btn.setFont(f)
-
         self._refresh_auto_edits_width()
 
         if self._files_grid is not None:
@@ -708,10 +728,27 @@ class MainWindow(QMainWindow):
 
         self._sync_files_grid_metrics()
         self._sync_theme_switch_metrics()
+        self._sync_sample_views_metrics()
+
+    def _sync_sample_views_metrics(self):
+        """字号变了之后：手动字段表 / Segments 表的行高跟着字体走，样品列表按新的 sizeHint 重新排。"""
+        for table in (self.manual_table, self.segments_table):
+            fm = table.fontMetrics()
+            table.verticalHeader().setDefaultSectionSize(fm.height() + 14)
+        self.segments_table.setMinimumHeight((fm.height() + 14) * 5)
+        # Part / 数值列按表头和 “-0000.00” 定宽，不按内容量（那要扫所有行）；Segment 列由 SegmentsController 按段名定
+        for col, (_, title, _) in enumerate(SegmentsModel.COLUMNS[1:-1], start=1):
+            width = max(fm.horizontalAdvance(title), fm.horizontalAdvance("-0000.00")) + 16
+            self.segments_table.setColumnWidth(col, width)
+        self.sample_list_view.doItemsLayout()
 
     def resizeEvent(self, event: QResizeEvent) -> None:
         super().resizeEvent(event)
-        self._apply_font_scaling()
+        # 拖动窗口边缘时几乎每个像素都有一次 resize：只有跨过档位才（合并后）重设字体
+        if font_bucket_for_width(self.width()) != self._font_bucket:
+            self._font_scale_timer.start()
+        elif self._font_scale_timer.isActive():
+            self._font_scale_timer.stop()   # 跨过阈值又拖回来了
 
     # =====================================================================
     # Auto inputs width
@@ -775,68 +812,18 @@ class MainWindow(QMainWindow):
         self.auto_end_date.setPlaceholderText("YYYY/MM/DD")
 
     # =====================================================================
-    # Step 1: Sample list
+    # Step 1 / Step 3: samples 的增删改（两个 model 自己订阅 self.samples，只刷新受影响的行）
     # =====================================================================
-    def _rebuild_sample_list_ui(self):
-        while self.sample_list_layout.count():
-            item = self.sample_list_layout.takeAt(0)
-            w = item.widget()
-            if w is not None:
-                w.deleteLater()
-
-        add_btn = QPushButton("+ Add Sample")
-        add_btn.setObjectName("AddSampleButton")
-        add_btn.clicked.connect(self.on_add_sample_clicked)
-        self.sample_list_layout.addWidget(add_btn)
-        self.add_sample_btn = add_btn
-
-        self.sample_list_layout.addSpacerItem(
-            QSpacerItem(0, 12, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
-        )
-
-        for sample in self.samples:
-            card = self._create_sample_card(sample)
-            self.sample_list_layout.addWidget(card)
-
-        self.sample_list_layout.addStretch(1)
-
-    def _create_sample_card(self, sample: SampleItem) -> QWidget:
-        card = QWidget()
-        card.setObjectName("SampleCard")
-        layout = QHBoxLayout(card)
-        layout.setContentsMargins(8, 4, 8, 4)
-        layout.setSpacing(8)
-
-        icon_label = QLabel("🧪")
-        layout.addWidget(icon_label)
-
-        name_label = QLabel(sample.name)
-        name_label.setObjectName("SampleNameLabel")
-        layout.addWidget(name_label, 1)
-
-        txt_status = QLabel("TXT: ✓" if os.path.exists(sample.txt_path) else "TXT: ✗")
-        layout.addWidget(txt_status)
-
-        if sample.pdf_path:
-            pdf_status = QLabel("PDF: ✓" if os.path.exists(sample.pdf_path) else "PDF: ✗")
-        else:
-            pdf_status = QLabel("PDF: -")
-        layout.addWidget(pdf_status)
-
-        layout.addStretch(1)
-
-        btn_remove = QPushButton("Remove")
-        btn_remove.setObjectName("SampleRemoveButton")
-        btn_remove.setFixedHeight(30)
-        btn_remove.clicked.connect(lambda _, sid=sample.id: self.sample_ctrl.remove_sample(sid))
-        layout.addWidget(btn_remove)
-
-        def on_card_clicked(event):
-            if event.button() == Qt.MouseButton.LeftButton:
-                self.sample_ctrl.on_sample_card_clicked(sample.id)
+    def _on_samples_event(self, event: str, row: int, sample: Optional[SampleItem]):
+        if event in (SAMPLE_ABOUT_TO_REMOVE, SAMPLE_ABOUT_TO_RESET):
+            self._sync_manual_fields_from_ui()
+        elif event in (SAMPLE_INSERTED, SAMPLE_REMOVED, SAMPLE_RESET):
+            self._update_manual_empty_state()
 
-        card.mousePressEvent = on_card_clicked
-        return card
+    def _update_manual_empty_state(self):
+        has_samples = bool(self.samples)
+        self.manual_empty_label.setVisible(not has_samples)
+        self.manual_table.setVisible(has_samples)
 
     def on_add_sample_clicked(self):
         dlg = AddSampleDialog(self)
@@ -852,123 +839,50 @@ class MainWindow(QMainWindow):
     # =====================================================================
     # Step 3: Manual sample forms
     # =====================================================================
-    def _rebuild_manual_sample_forms(self):
-        self._sync_manual_fields_from_ui()
-
-        while self.sample_manual_layout.count():
-            item = self.sample_manual_layout.takeAt(0)
-            w = item.widget()
-            if w is not None:
-                w.deleteLater()
-        self.sample_manual_widgets.clear()
-
-        if not self.samples:
-            placeholder = QLabel("No samples. Please add samples in Step 1.")
-            self.sample_manual_layout.addWidget(placeholder)
-            self.sample_manual_layout.addStretch(1)
-            return
-
-        for idx, sample in enumerate(self.samples):
-            group = QWidget()
-            group_layout = QVBoxLayout(group)
-            group_layout.setContentsMargins(0, 4, 0, 4)
-            group_layout.setSpacing(4)
-
-            title = QLabel(sample.name)
-            title.setObjectName("SampleManualTitle")
-            group_layout.addWidget(title)
-
-            row = QHBoxLayout()
-            row.setSpacing(6)
-
-            edit_sample_id = QLineEdit()
-            edit_nature = QLineEdit()
-            edit_assign_to = QLineEdit()
-
-            mf = sample.manual_fields
-            edit_sample_id.setText(mf.sample_id)
-            edit_nature.setText(mf.nature)
-            edit_assign_to.setText(mf.assign_to)
-
-            edit_sample_id.setPlaceholderText("Sample Id")
-            edit_nature.setPlaceholderText("Nature")
-            edit_assign_to.setPlaceholderText("Assign To")
-
-            for e in (edit_sample_id, edit_nature, edit_assign_to):
-                e.setMinimumWidth(120)
-                e.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-
-            row.addWidget(QLabel("Sample Id:"))
-            row.addWidget(edit_sample_id)
-            row.addWidget(QLabel("Nature:"))
-            row.addWidget(edit_nature)
-            row.addWidget(QLabel("Assign To:"))
-            row.addWidget(edit_assign_to)
-
-            group_layout.addLayout(row)
-            self.sample_manual_layout.addWidget(group)
-
-            self.sample_manual_widgets[sample.id] = {
-                "sample_id": edit_sample_id,
-                "nature": edit_nature,
-                "assign_to": edit_assign_to,
-            }
-
-            if idx < len(self.samples) - 1:
-                sep = QFrame()
-                sep.setFrameShape(QFrame.Shape.HLine)
-                sep.setFrameShadow(QFrame.Shadow.Plain)
-                sep.setStyleSheet("QFrame { border: none; border-top: 1px dashed #555555; }")
-                self.sample_manual_layout.addWidget(sep)
-
-        self.sample_manual_layout.addStretch(1)
-
     def _sync_manual_fields_from_ui(self):
-        if not self.samples:
-            return
-        for sample in self.samples:
-            widgets = self.sample_manual_widgets.get(sample.id)
-            if not widgets:
-                continue
-            mf = sample.manual_fields
-            mf.sample_id = widgets["sample_id"].text().strip()
-            mf.nature = widgets["nature"].text().strip()
-            mf.assign_to = widgets["assign_to"].text().strip()
+        """
+        手动字段在编辑器提交时就写进 sample.manual_fields 了；
+        这里只把还开着的编辑器里的内容提交掉（生成报告 / 确认前调用）。
+        """
+        editor = QApplication.focusWidget()
+        if editor is not None and self.manual_table.isAncestorOf(editor):
+            self.manual_table.itemDelegate().commitData.emit(editor)
 
     # =====================================================================
     # Parse sample txt
     # =====================================================================
     def _parse_sample(self, sample: SampleItem):
+        """
+        解析放到后台线程池里跑（见 SampleController.start_parse），
+        这里先把 Step2 切到“Parsing…”占位状态，完成后由 _on_sample_parsed 加载。
+        """
         if not sample.txt_path:
             return
 
-        try:
-            basic = parse_dsc_txt_basic(sample.txt_path)
-            sample.basic_info = basic
-
-            try:
-                result = self.parse_service.parse_one(sample.txt_path, pdf_path=sample.pdf_path)
-                segments = result.segments if result else []
-            except Exception as e_seg:
-                segments = []
-                self._add_file_log(f"[Segments Parsed Failed] {os.path.basename(sample.txt_path)} - {e_seg}")
-
-            sample.segments = segments
-
-            af = sample.auto_fields
-            af.sample_name = basic.sample_name or ""
-            if basic.sample_mass_mg is not None:
-                af.sample_mass = f"{basic.sample_mass_mg:.3f} mg"
-            else:
-                af.sample_mass = ""
-            af.operator = basic.operator or ""
-            af.instrument = basic.instrument or ""
-            af.atmosphere = basic.atmosphere or ""
-            af.crucible = basic.crucible or ""
-            af.temp_calib = basic.temp_calib or ""
-            af.end_date = basic.end_date or ""
-
-            self.current_sample_id = sample.id
+        self.current_sample_id = sample.id
+        self.txt_path = sample.txt_path
+        self.pdf_path = sample.pdf_path or ""
+        self.parsed_info = None
+        self.parsed_segments = None
+
+        self.sample_ctrl.start_parse(sample)
+        self._show_sample_parsing()
+
+    def _show_sample_parsing(self):
+        # 清空 Auto 字段时不要触发“改样品名联动”
+        self.auto_sample_name.blockSignals(True)
+        for e in self._auto_edits:
+            e.clear()
+        self.auto_sample_name.blockSignals(False)
+
+        self.segments_ctrl.show_parsing()
+        self.sample_ctrl.update_auto_sample_header()
+        self._refresh_auto_edits_width()
+
+    def _on_sample_parsed(self, sample: SampleItem, result):
+        apply_basic_to_sample(sample, result)
+
+        if sample.id == self.current_sample_id:
             self.txt_path = sample.txt_path
             self.pdf_path = sample.pdf_path or ""
             self.parsed_info = sample.basic_info
@@ -976,29 +890,33 @@ class MainWindow(QMainWindow):
 
             self.sample_ctrl.load_sample_to_ui(sample)
 
-            self.confirmed = False
-            self.confirm_block = None
+        self.confirmed = False
+        self.confirm_block = None
 
-            has_txt = bool(sample.txt_path)
-            has_pdf = bool(sample.pdf_path)
+        has_txt = bool(sample.txt_path)
+        has_pdf = bool(sample.pdf_path)
 
-            if has_txt and has_pdf:
-                file_info = f"{sample.name} (TXT + PDF)"
-            elif has_txt:
-                file_info = f"{sample.name} (TXT)"
-            elif has_pdf:
-                file_info = f"{sample.name} (PDF)"
-            else:
-                file_info = sample.name
+        if has_txt and has_pdf:
+            file_info = f"{sample.name} (TXT + PDF)"
+        elif has_txt:
+            file_info = f"{sample.name} (TXT)"
+        elif has_pdf:
+            file_info = f"{sample.name} (PDF)"
+        else:
+            file_info = sample.name
 
-            self._add_file_log(f"[Parsing Successful] {file_info}")
+        self._add_file_log(f"[Parsing Successful] {file_info}")
+        self.samples.mark_changed(sample.id)
 
-        except Exception as e:
-            sample.basic_info = None
-            sample.segments = []
+    def _on_sample_parse_failed(self, sample: SampleItem, error: str):
+        sample.basic_info = None
+        sample.segments = []
+        if sample.id == self.current_sample_id:
             self.parsed_info = None
             self.parsed_segments = None
-            self._add_file_log(f"[Parsing Failed] {sample.name} - {e}")
+            self.segments_ctrl.build([])
+        self._add_file_log(f"[Parsing Failed] {sample.name} - {error}")
+        self.samples.mark_changed(sample.id)
 
     # =====================================================================
     # File choose
@@ -1020,29 +938,10 @@ class MainWindow(QMainWindow):
     # End date
     # =====================================================================
     def _get_latest_end_date_from_samples(self) -> str:
+        fallback = self.auto_end_date.text().strip()
         if not self.samples:
-            return self.auto_end_date.text().strip()
-
-        candidates: list[tuple[datetime, str]] = []
-        for s in self.samples:
-            raw = (s.auto_fields.end_date or "").strip()
-            if not raw:
-                continue
-            dt = None
-            for fmt in ("%Y/%m/%d", "%Y-%m-%d", "%Y.%m.%d"):
-                try:
-                    dt = datetime.strptime(raw, fmt)
-                    break
-                except ValueError:
-                    continue
-            if dt is not None:
-                candidates.append((dt, raw))
-
-        if not candidates:
-            return self.auto_end_date.text().strip()
-
-        _, latest_raw = max(candidates, key=lambda x: x[0])
-        return latest_raw
+            return fallback
+        return latest_end_date(self.samples, fallback=fallback)
 
     # =====================================================================
     # Logs
@@ -1059,8 +958,11 @@ class MainWindow(QMainWindow):
         print(msg)
 
 
-    def show_report_success_dialog(self, output_path: str):
-        """生成成功提示：Open File(橙色) + OK(灰色)，对勾 icon，路径橙色高亮。"""
+    def show_report_success_dialog(self, output_path: str, details: str = ""):
+        """
+        生成成功提示：Open File(橙色) + OK(灰色)，对勾 icon，路径橙色高亮。
+        details 非空时（开了 DSC_REPORT_PROFILE）放进 “Show Details…”，显示各阶段耗时。
+        """
         if not output_path:
             QMessageBox.information(self, "Success", "Report generated successfully.")
             return
@@ -1093,6 +995,9 @@ class MainWindow(QMainWindow):
             b.style().unpolish(b)
             b.style().polish(b)
 
+        if details:
+            box.setDetailedText(details)
+
         box.setDefaultButton(btn_open_file)
         box.exec()
 
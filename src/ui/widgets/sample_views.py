@@ -0,0 +1,327 @@
+# src/ui/widgets/sample_views.py
+"""
+Step1 样品列表和 Step3 样品手动字段的 model/view 实现（原来每次都删掉重建整组 QWidget）：
+
+- SampleListModel / ManualFieldsModel 都直接读 MainWindow.samples（SampleRegistry），不复制数据
+- 两个 model 都订阅 registry：增删样品时包上 begin/end Insert/RemoveRows；
+  改名、解析完成只对那一行发 dataChanged，视图只重画这一行
+- 样品卡片由 SampleCardDelegate 直接画（颜色从 QSS 的 qproperty-* 读，跟随主题）；
+  手动字段表用 QTableView + 默认的行内编辑器，编辑结果直接写进 sample.manual_fields
+"""
+from __future__ import annotations
+
+import os
+from typing import Callable, Optional
+
+from PyQt6.QtCore import (
+    Qt, QAbstractListModel, QAbstractTableModel, QEvent, QModelIndex, QRect, QRectF, QSize,
+    pyqtProperty, pyqtSignal,
+)
+from PyQt6.QtGui import QColor, QPainter, QPalette, QPen
+from PyQt6.QtWidgets import QLineEdit, QListView, QStyle, QStyledItemDelegate
+
+from src.models.models import SampleItem
+from src.models.sample_registry import (
+    SAMPLE_ABOUT_TO_INSERT, SAMPLE_ABOUT_TO_REMOVE, SAMPLE_ABOUT_TO_RESET, SAMPLE_CHANGED,
+    SAMPLE_INSERTED, SAMPLE_REMOVED, SAMPLE_RESET, SampleRegistry,
+)
+
+SampleRole = int(Qt.ItemDataRole.UserRole) + 1        # -> SampleItem
+ParsingRole = int(Qt.ItemDataRole.UserRole) + 2       # -> bool，后台还在解析
+FileStatusRole = int(Qt.ItemDataRole.UserRole) + 3    # -> ("TXT: ✓", "PDF: -")
+
+
+class _SampleRowsMixin:
+    """两个 model 共用：按行取样品，把 registry 的通知翻译成 Qt 的行插入 / 删除 / 刷新。"""
+
+    _samples: SampleRegistry
+    _last_column = 0
+
+    def _attach(self, samples: SampleRegistry) -> None:
+        self._samples = samples
+        samples.subscribe(self._on_samples_event)
+
+    def sample_at(self, row: int) -> Optional[SampleItem]:
+        return self._samples.at(row)
+
+    def row_of(self, sample_id: int) -> int:
+        return self._samples.index_of(sample_id)
+
+    def _on_samples_event(self, event: str, row: int, sample: Optional[SampleItem]) -> None:
+        if event == SAMPLE_ABOUT_TO_INSERT:
+            self.beginInsertRows(QModelIndex(), row, row)
+        elif event == SAMPLE_INSERTED:
+            self.endInsertRows()
+        elif event == SAMPLE_ABOUT_TO_REMOVE:
+            self.beginRemoveRows(QModelIndex(), row, row)
+        elif event == SAMPLE_REMOVED:
+            self._invalidate_row(sample.id)
+            self.endRemoveRows()
+        elif event == SAMPLE_CHANGED:
+            self._invalidate_row(sample.id)
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self._last_column))
+        elif event == SAMPLE_ABOUT_TO_RESET:
+            self.beginResetModel()
+        elif event == SAMPLE_RESET:
+            self._invalidate_row(None)
+            self.endResetModel()
+
+    def _invalidate_row(self, sample_id: Optional[int]) -> None:
+        """清掉某个样品（None = 全部）的派生缓存。"""
+
+
+class SampleListModel(_SampleRowsMixin, QAbstractListModel):
+    """Step1 样品列表：一行一个样品。"""
+
+    def __init__(self, samples: SampleRegistry, is_parsing: Callable[[int], bool], parent=None):
+        super().__init__(parent)
+        self._attach(samples)
+        self._is_parsing = is_parsing
+        # TXT / PDF 是否存在：只在行刷新时查一次文件系统，不在每次重画时查
+        self._file_status: dict[int, tuple[str, str]] = {}
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._samples)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        sample = self.sample_at(index.row()) if index.isValid() else None
+        if sample is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return sample.name
+        if role == SampleRole:
+            return sample
+        if role == ParsingRole:
+            return self._is_parsing(sample.id)
+        if role == FileStatusRole:
+            status = self._file_status.get(sample.id)
+            if status is None:
+                txt = "TXT: ✓" if os.path.exists(sample.txt_path) else "TXT: ✗"
+                if sample.pdf_path:
+                    pdf = "PDF: ✓" if os.path.exists(sample.pdf_path) else "PDF: ✗"
+                else:
+                    pdf = "PDF: -"
+                status = self._file_status[sample.id] = (txt, pdf)
+            return status
+        return None
+
+    def _invalidate_row(self, sample_id: Optional[int]) -> None:
+        if sample_id is None:
+            self._file_status.clear()
+        else:
+            self._file_status.pop(sample_id, None)
+
+
+class ManualFieldsModel(_SampleRowsMixin, QAbstractTableModel):
+    """Step3 样品手动字段：一行一个样品，第一列是样品名（只读），后面三列可编辑。"""
+
+    COLUMNS = (
+        ("name", "Sample"),
+        ("sample_id", "Sample Id"),
+        ("nature", "Nature"),
+        ("assign_to", "Assign To"),
+    )
+    _last_column = len(COLUMNS) - 1
+
+    def __init__(self, samples: SampleRegistry, parent=None):
+        super().__init__(parent)
+        self._attach(samples)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._samples)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section][1]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() > 0:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        sample = self.sample_at(index.row()) if index.isValid() else None
+        if sample is None:
+            return None
+        if role == SampleRole:
+            return sample
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            key = self.COLUMNS[index.column()][0]
+            return sample.name if key == "name" else getattr(sample.manual_fields, key)
+        return None
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        sample = self.sample_at(index.row()) if index.isValid() else None
+        if sample is None or role != Qt.ItemDataRole.EditRole or index.column() == 0:
+            return False
+        setattr(sample.manual_fields, self.COLUMNS[index.column()][0], str(value or "").strip())
+        self.dataChanged.emit(index, index)
+        return True
+
+
+class SampleListView(QListView):
+    """
+    样品卡片列表。卡片的颜色在 QSS 里用 qproperty-* 配（app.qss / app_light.qss 的 QListView#SampleList）。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._hover_border = QColor("#5f6368")
+        self._card_background = QColor(Qt.GlobalColor.transparent)
+        self._parsing_color = QColor("#ffb74d")
+        self._remove_color = QColor("#d32f2f")
+
+        self.setUniformItemSizes(True)
+        self.setSpacing(4)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+        self.setSelectionMode(QListView.SelectionMode.NoSelection)
+        self.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QListView.ScrollMode.ScrollPerPixel)
+        self.setFrameShape(QListView.Shape.NoFrame)
+
+    def _color_property(name: str):
+        def fget(self) -> QColor:
+            return getattr(self, name)
+
+        def fset(self, color: QColor) -> None:
+            setattr(self, name, QColor(color))
+            self.viewport().update()
+
+        return pyqtProperty(QColor, fget=fget, fset=fset)
+
+    hoverBorderColor = _color_property("_hover_border")
+    cardBackground = _color_property("_card_background")
+    parsingColor = _color_property("_parsing_color")
+    removeColor = _color_property("_remove_color")
+    del _color_property
+
+
+class SampleCardDelegate(QStyledItemDelegate):
+    """
+    画一张样品卡片：🧪 名称 …… TXT: ✓  PDF: ✓  Parsing…  [Remove]
+    点卡片（按下）发 cardClicked，点 Remove（松开）发 removeClicked。
+    """
+
+    cardClicked = pyqtSignal(int)     # sample_id
+    removeClicked = pyqtSignal(int)   # sample_id
+
+    MARGIN = 8
+    BUTTON_HEIGHT = 30
+
+    def sizeHint(self, option, index) -> QSize:
+        fm = option.fontMetrics
+        return QSize(fm.horizontalAdvance("M") * 20, max(fm.height() + 16, self.BUTTON_HEIGHT + 8))
+
+    def _remove_rect(self, option) -> QRect:
+        fm = option.fontMetrics
+        w = fm.horizontalAdvance("Remove") + 28
+        h = min(self.BUTTON_HEIGHT, option.rect.height() - 4)
+        r = option.rect
+        return QRect(r.right() - self.MARGIN - w, r.center().y() - h // 2, w, h)
+
+    def paint(self, painter: QPainter, option, index) -> None:
+        view = option.widget
+        sample: SampleItem = index.data(SampleRole)
+        if sample is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(option.font)
+        fm = option.fontMetrics
+        card = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -0.5)
+
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        painter.setPen(QPen(view.hoverBorderColor, 1) if hovered else Qt.PenStyle.NoPen)
+        painter.setBrush(view.cardBackground)
+        painter.drawRoundedRect(card, 10, 10)
+
+        text_color = option.palette.color(QPalette.ColorRole.Text)
+        flags = Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft
+        rect = option.rect
+
+        # Remove 按钮
+        btn = self._remove_rect(option)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(view.removeColor)
+        painter.drawRoundedRect(QRectF(btn), 6, 6)
+        painter.setPen(QColor("#ffffff"))
+        painter.drawText(btn, Qt.AlignmentFlag.AlignCenter, "Remove")
+
+        # 右侧状态：从按钮往左排
+        right = btn.left() - self.MARGIN
+        statuses = [(s, text_color, False) for s in index.data(FileStatusRole)]
+        if index.data(ParsingRole):
+            statuses.append(("Parsing…", view.parsingColor, True))
+        for text, color, italic in reversed(statuses):
+            font = painter.font()
+            font.setItalic(italic)
+            painter.setFont(font)
+            w = painter.fontMetrics().horizontalAdvance(text)
+            painter.setPen(color)
+            painter.drawText(QRect(right - w, rect.top(), w, rect.height()), flags, text)
+            right -= w + self.MARGIN
+            font.setItalic(False)
+            painter.setFont(font)
+
+        # 左侧：图标 + 名称（放不下就省略）
+        x = rect.left() + self.MARGIN
+        icon = "🧪"
+        icon_w = fm.horizontalAdvance(icon)
+        painter.setPen(text_color)
+        painter.drawText(QRect(x, rect.top(), icon_w, rect.height()), flags, icon)
+        x += icon_w + self.MARGIN
+
+        name_font = painter.font()
+        name_font.setWeight(500)
+        painter.setFont(name_font)
+        name_w = max(0, right - x)
+        name = painter.fontMetrics().elidedText(sample.name, Qt.TextElideMode.ElideRight, name_w)
+        painter.drawText(QRect(x, rect.top(), name_w, rect.height()), flags, name)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            return False
+        if event.button() != Qt.MouseButton.LeftButton:
+            return False
+        sample: SampleItem = index.data(SampleRole)
+        if sample is None:
+            return False
+
+        on_remove = self._remove_rect(option).contains(event.position().toPoint())
+        if event.type() == QEvent.Type.MouseButtonPress:
+            if not on_remove:
+                self.cardClicked.emit(sample.id)
+        elif on_remove:
+            self.removeClicked.emit(sample.id)
+        return True
+
+
+class ManualFieldsDelegate(QStyledItemDelegate):
+    """样品名加粗；空的可编辑格显示灰色占位文字，编辑器也带同样的 placeholder。"""
+
+    def initStyleOption(self, option, index) -> None:
+        super().initStyleOption(option, index)
+        if index.column() == 0:
+            option.font.setBold(True)
+        elif not option.text:
+            option.text = index.model().headerData(index.column(), Qt.Orientation.Horizontal)
+            option.palette.setColor(
+                QPalette.ColorRole.Text, option.palette.color(QPalette.ColorRole.PlaceholderText)
+            )
+
+    def createEditor(self, parent, option, index):
+        editor = super().createEditor(parent, option, index)
+        if isinstance(editor, QLineEdit):
+            editor.setPlaceholderText(index.model().headerData(index.column(), Qt.Orientation.Horizontal))
+        return editor
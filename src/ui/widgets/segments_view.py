@@ -0,0 +1,210 @@
+# src/ui/widgets/segments_view.py
+"""
+Step2 的 Segments 编辑表（原来每个 DscPeakPart 五个 QLineEdit，切换样品就全部重建）：
+
+- SegmentsModel 直接包着样品的 List[DscSegment]，一行一个 part；行索引只是 (段号, part 号) 的列表，
+  切换样品只是换一份列表 + reset，不建任何控件
+- 行按批次懒加载（canFetchMore / fetchMore），视图只排它滚到的那些行
+- 编辑先记在 model 的 dirty 表里（显示的是编辑后的值），apply() 时只把改过的格子写回 part；
+  没动过的格子保持原始精度，不会被显示格式（.1f / .3f）截断
+- SegmentsDelegate 给数值列的编辑器挂 QDoubleValidator，输不进非数字；清空 = None
+"""
+from __future__ import annotations
+
+from typing import Optional
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QLocale, QModelIndex
+from PyQt6.QtGui import QDoubleValidator
+from PyQt6.QtWidgets import QLineEdit, QStyledItemDelegate
+
+from src.models.models import DscSegment
+
+
+class SegmentsModel(QAbstractTableModel):
+    # (DscPeakPart 字段 / 伪列, 表头, 数值显示格式；None = 不是数值列)
+    COLUMNS = (
+        ("segment", "Segment", None),
+        ("part", "Part", None),
+        ("value_temp_c", "Value(°C)", ".1f"),
+        ("onset_c", "Onset(°C)", ".1f"),
+        ("peak_c", "Peak(°C)", ".1f"),
+        ("area_report", "Area", ".3f"),
+        ("comment", "Comment", None),
+    )
+    FIRST_EDITABLE = 2
+    FETCH_BATCH = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._segments: list[DscSegment] = []
+        self._rows: list[tuple[int, int]] = []    # (段下标, part 下标)；没有 part 的段占一行，part 下标为 -1
+        self._fetched = 0
+        self._dirty: dict[tuple[int, int, str], object] = {}
+
+    # -----------------------------
+    # 数据源
+    # -----------------------------
+    def set_segments(self, segments: list[DscSegment]) -> None:
+        """换一份 segments（切换样品）；没写回的编辑直接丢弃，调用方应先 apply()。"""
+        self.beginResetModel()
+        self._segments = segments
+        self._rows = [
+            (si, pi)
+            for si, seg in enumerate(segments)
+            for pi in (range(len(seg.parts)) if seg.parts else (-1,))
+        ]
+        self._fetched = min(len(self._rows), self.FETCH_BATCH)
+        self._dirty.clear()
+        self.endResetModel()
+
+    def segments(self) -> list[DscSegment]:
+        return self._segments
+
+    def dirty_count(self) -> int:
+        return len(self._dirty)
+
+    def apply(self, segments: list[DscSegment]) -> int:
+        """把改过的格子写回 segments（必须是 set_segments 给的那一份），返回写回的格子数。"""
+        if segments is not self._segments:
+            return 0
+        for (si, pi, field), value in self._dirty.items():
+            setattr(segments[si].parts[pi], field, value)
+        count = len(self._dirty)
+        self._dirty.clear()
+        return count
+
+    # -----------------------------
+    # 懒加载
+    # -----------------------------
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._fetched < len(self._rows)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        if parent.isValid():
+            return
+        end = min(len(self._rows), self._fetched + self.FETCH_BATCH)
+        if end <= self._fetched:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, end - 1)
+        self._fetched = end
+        self.endInsertRows()
+
+    # -----------------------------
+    # QAbstractTableModel
+    # -----------------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._fetched
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.COLUMNS[section][1]
+        return None
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() >= self.FIRST_EDITABLE and self._rows[index.row()][1] >= 0:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def _value(self, si: int, pi: int, field: str):
+        key = (si, pi, field)
+        if key in self._dirty:
+            return self._dirty[key]
+        return getattr(self._segments[si].parts[pi], field)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        si, pi = self._rows[index.row()]
+        field, _, fmt = self.COLUMNS[index.column()]
+
+        if field == "segment":
+            # 段名只写在这一段的第一行
+            if pi > 0:
+                return ""
+            return segment_title(si, self._segments[si])
+        if pi < 0:
+            return ""
+        if field == "part":
+            return f"Part {pi + 1}"
+
+        value = self._value(si, pi, field)
+        if fmt is None:
+            return value or ""
+        return "" if value is None else format(value, fmt)
+
+    def setData(self, index: QModelIndex, value, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        if not self.flags(index) & Qt.ItemFlag.ItemIsEditable:
+            return False
+
+        text = str(value or "").strip()
+        # 编辑器关闭时总会提交一次；文本没变就不算改动（否则显示用的 .1f 会把原始值截断）
+        if text == self.data(index, Qt.ItemDataRole.EditRole):
+            return True
+
+        si, pi = self._rows[index.row()]
+        field, _, fmt = self.COLUMNS[index.column()]
+        if fmt is None:
+            new_value: object = text
+        elif not text:
+            new_value = None
+        else:
+            try:
+                new_value = float(text)
+            except ValueError:
+                return False
+
+        key = (si, pi, field)
+        if new_value == getattr(self._segments[si].parts[pi], field):
+            self._dirty.pop(key, None)
+        else:
+            self._dirty[key] = new_value
+        self.dataChanged.emit(index, index)
+        return True
+
+
+class SegmentsDelegate(QStyledItemDelegate):
+    """段名加粗；数值列的编辑器只接受数字（C locale，小数点是 “.”），空着表示没有这个值。"""
+
+    def initStyleOption(self, option, index) -> None:
+        super().initStyleOption(option, index)
+        if index.column() == 0:
+            option.font.setBold(True)
+
+    def createEditor(self, parent, option, index):
+        editor = super().createEditor(parent, option, index)
+        if not isinstance(editor, QLineEdit):
+            return editor
+        _, title, fmt = SegmentsModel.COLUMNS[index.column()]
+        editor.setPlaceholderText(title)
+        if fmt is not None:
+            validator = QDoubleValidator(editor)
+            validator.setLocale(QLocale.c())
+            validator.setNotation(QDoubleValidator.Notation.ScientificNotation)
+            editor.setValidator(validator)
+        return editor
+
+    def setModelData(self, editor, model, index) -> None:
+        # “-”、“1e” 这种还没输完的内容不提交，保留原值
+        if isinstance(editor, QLineEdit) and editor.text().strip() and not editor.hasAcceptableInput():
+            return
+        super().setModelData(editor, model, index)
+
+
+def segment_title(seg_index: int, seg: DscSegment) -> str:
+    """Segment 列显示的段名（seg_index 从 0 开始）。"""
+    return f"Segment {seg_index + 1}: {seg.desc_display}"
+
+
+def segment_count_text(segments: Optional[list[DscSegment]]) -> str:
+    if not segments:
+        return "No valid segment detected."
+    parts = sum(len(seg.parts) for seg in segments)
+    return f"{len(segments)} segment(s), {parts} part(s) detected"
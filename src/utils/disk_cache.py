@@ -0,0 +1,137 @@
+# src/utils/disk_cache.py
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+
+# 绝对路径 -> (size, mtime_ns, sha256)；同一进程里重复算同一个文件的哈希时直接复用。
+# 按路径存一份：文件重新保存后旧条目被覆盖，不会随会话越攒越多
+_digest_memo: Dict[str, Tuple[int, int, str]] = {}
+
+
+def _digest(path: str, st: os.stat_result) -> str:
+    memo_key = os.path.abspath(path)
+    cached = _digest_memo.get(memo_key)
+    if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+        return cached[2]
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    digest = h.hexdigest()
+    _digest_memo[memo_key] = (st.st_size, st.st_mtime_ns, digest)
+    return digest
+
+
+def file_digest(path: str) -> str:
+    """文件内容 sha256（不含 mtime：内容相同的两个文件得到同一个值）。"""
+    return _digest(path, os.stat(path))
+
+
+def file_fingerprint(path: str) -> str:
+    """
+    文件指纹：内容 sha256 + 文件大小 + mtime。
+    任意一项变化都会得到不同的指纹，缓存 key 都基于它来算。
+    """
+    st = os.stat(path)
+    return f"{_digest(path, st)}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def make_key(*parts: str) -> str:
+    """把若干字符串拼成一个定长 key（用作缓存文件名）。"""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class DiskLruCache:
+    """
+    一个目录 = 一个缓存；每个条目一个文件，文件名就是 key。
+    - get 命中时刷新文件 mtime，作为“最近使用”时间
+    - put 之后如果目录总大小超过 max_bytes，按 mtime 从旧到新删除
+    所有 IO 错误都吞掉：缓存坏了只会退化成“没命中”，不影响主流程。
+    """
+
+    def __init__(self, root: Path, max_bytes: int, suffix: str = ".bin"):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+
+    def path_for(self, key: str) -> Path:
+        return self.root / f"{key}{self.suffix}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self.path_for(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self.path_for(key)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(data)
+            # 先写临时文件（按进程 + 线程区分）再原子替换，并发写同一个 key 时不会读到半个文件
+            os.replace(tmp, path)
+        except OSError:
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """总大小超过上限时，从最久未使用的条目开始删除。"""
+        entries = []
+        total = 0
+        try:
+            with os.scandir(self.root) as it:
+                for entry in it:
+                    if not entry.name.endswith(self.suffix):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime_ns, st.st_size, entry.path))
+                    total += st.st_size
+        except OSError:
+            return
+
+        if total <= self.max_bytes:
+            return
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+
+    def clear(self) -> None:
+        try:
+            with os.scandir(self.root) as it:
+                for entry in it:
+                    if entry.name.endswith(self.suffix):
+                        try:
+                            os.remove(entry.path)
+                        except OSError:
+                            pass
+        except OSError:
+            pass
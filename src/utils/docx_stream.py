@@ -0,0 +1,219 @@
+# src/utils/docx_stream.py
+import os
+import re
+import zipfile
+from typing import Dict, Iterable, List, Tuple
+
+from docx import Document
+from docx.opc.constants import CONTENT_TYPE as CT
+from docx.opc.constants import NAMESPACE as NS
+from docx.opc.constants import RELATIONSHIP_TARGET_MODE as RTM
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.opc.oxml import serialize_part_xml
+from docx.opc.packuri import CONTENT_TYPES_URI, PACKAGE_URI, PackURI
+from docx.opc.part import Part
+from lxml import etree
+
+# 流式写出时新增的图片走扩展名默认类型，[Content_Types].xml 一开始就要写好，这里预先声明
+_MEDIA_CONTENT_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "svg": "image/svg+xml",
+}
+
+_SENTINEL_PREFIX = "docx-stream:"
+_XMLNS_RE = re.compile(rb' xmlns:([A-Za-z0-9_.-]+)="([^"]*)"')
+
+# (rId, 关系类型, Target, 是否外部链接)
+RelTuple = Tuple[str, str, str, bool]
+
+
+def _to_xml(root) -> bytes:
+    return etree.tostring(root, encoding="UTF-8", xml_declaration=True, standalone=True)
+
+
+def _content_types_xml(parts: Iterable[Part], defaults: Dict[str, str]) -> bytes:
+    """
+    [Content_Types].xml：扩展名能对上 defaults 的 part 不用单独写，其余每个 part 一条 Override。
+    defaults 里多声明的扩展名（流式加的图片）没有对应 part 也没关系。
+    """
+    root = etree.Element(f"{{{NS.OPC_CONTENT_TYPES}}}Types", nsmap={None: NS.OPC_CONTENT_TYPES})
+    for ext, content_type in sorted(defaults.items()):
+        etree.SubElement(root, f"{{{NS.OPC_CONTENT_TYPES}}}Default", Extension=ext, ContentType=content_type)
+    for part in sorted(parts, key=lambda p: str(p.partname)):
+        if defaults.get(part.partname.ext.lower()) == part.content_type:
+            continue
+        etree.SubElement(
+            root, f"{{{NS.OPC_CONTENT_TYPES}}}Override",
+            PartName=str(part.partname), ContentType=part.content_type,
+        )
+    return _to_xml(root)
+
+
+def _rels_xml(rels: Iterable[RelTuple]) -> bytes:
+    root = etree.Element(f"{{{NS.OPC_RELATIONSHIPS}}}Relationships", nsmap={None: NS.OPC_RELATIONSHIPS})
+    for r_id, reltype, target, external in rels:
+        rel = etree.SubElement(root, f"{{{NS.OPC_RELATIONSHIPS}}}Relationship", Id=r_id, Type=reltype, Target=target)
+        if external:
+            rel.set("TargetMode", RTM.EXTERNAL)
+    return _to_xml(root)
+
+
+def _part_rels(rels) -> List[RelTuple]:
+    """python-docx 的 part.rels / package.rels -> RelTuple 列表。"""
+    return [(r.rId, r.reltype, r.target_ref, r.is_external) for r in rels.values()]
+
+
+class StreamingDocxWriter:
+    """
+    把已经填好“小部分”的 python-docx 文档流式写成 .docx：
+    - 除正文外的 part（styles / header / footer / 主题 / 模板自带图片…）原样写进 zip
+    - add_media() 的图片字节直接写进 zip，只记下 rId 和路径，字节本身不留在内存；
+      [Content_Types].xml 和正文的 rels（模板原有的关系 + 这些图片）都由这里自己生成，
+      不往 python-docx 的 package 里加东西
+    - word/document.xml 按“模板片段 + 展开内容”逐段写出：
+      replace() / insert_after() 在树里放一个占位注释，write_document() 时
+      注释的位置换成对应迭代器逐个产出的元素（写完一个就可以丢掉一个）
+    克隆行、图片都不进 python-docx 的对象树，内存占用和样品数基本无关。
+
+    用法：
+        with StreamingDocxWriter(doc, out_path) as writer:   # 出异常时自动删掉半个文件
+            r_id = writer.add_media(png_bytes, "png")
+            key = writer.replace(template_tr)
+            writer.write_document({key: iter_rows()})
+    """
+
+    def __init__(self, doc: Document, output_path: str):
+        self.doc = doc
+        self.output_path = output_path
+        self._zip = zipfile.ZipFile(output_path, "w", compression=zipfile.ZIP_DEFLATED)
+        self._sentinels = 0
+        self._document_written = False
+
+        package = doc.part.package
+        self._parts: List[Part] = list(package.iter_parts())
+        self._used_partnames = {str(p.partname) for p in self._parts}
+        self._media_count = 0
+        self._media_rels: List[RelTuple] = []
+        self._used_rids = set(doc.part.rels.keys())
+
+        # 根节点声明的命名空间：展开出来的元素单独序列化时会重复声明它们，写出时去掉
+        self._root_ns = {
+            (prefix or "").encode(): uri.encode()
+            for prefix, uri in doc.element.nsmap.items()
+        }
+
+        defaults = {"rels": CT.OPC_RELATIONSHIPS, "xml": CT.XML}
+        defaults.update(_MEDIA_CONTENT_TYPES)
+        self._write(CONTENT_TYPES_URI, _content_types_xml(self._parts, defaults))
+        self._write(PACKAGE_URI.rels_uri, _rels_xml(_part_rels(package.rels)))
+        for part in self._parts:
+            if part is doc.part:
+                continue
+            self._write(part.partname, part.blob)
+            if len(part.rels):
+                self._write(part.partname.rels_uri, _rels_xml(_part_rels(part.rels)))
+
+    # -----------------------------
+    # zip
+    # -----------------------------
+    def _write(self, partname: PackURI, blob: bytes) -> None:
+        self._zip.writestr(partname.membername, blob)
+
+    def add_media(self, blob: bytes, ext: str) -> str:
+        """把一张图片直接写进 zip，返回正文引用它用的 rId。只能在 write_document() 之前调用。"""
+        if self._document_written:
+            raise RuntimeError("add_media() must be called before write_document()")
+        ext = ext.lower()
+        while True:
+            self._media_count += 1
+            partname = PackURI(f"/word/media/image{self._media_count}.{ext}")
+            if str(partname) not in self._used_partnames:
+                break
+        self._used_partnames.add(str(partname))
+        self._write(partname, blob)
+
+        r_id = self._next_rid()
+        target = partname.relative_ref(self.doc.part.partname.baseURI)
+        self._media_rels.append((r_id, RT.IMAGE, target, False))
+        return r_id
+
+    def _next_rid(self) -> str:
+        n = len(self._used_rids) + 1
+        while f"rId{n}" in self._used_rids:
+            n += 1
+        r_id = f"rId{n}"
+        self._used_rids.add(r_id)
+        return r_id
+
+    # -----------------------------
+    # 正文
+    # -----------------------------
+    def _sentinel(self) -> "etree._Comment":
+        self._sentinels += 1
+        return etree.Comment(f"{_SENTINEL_PREFIX}{self._sentinels}")
+
+    def replace(self, element) -> str:
+        """写出时用展开内容替换 element（element 从树里拿掉）。返回展开的 key。"""
+        sentinel = self._sentinel()
+        element.addprevious(sentinel)
+        element.getparent().remove(element)
+        return sentinel.text
+
+    def insert_after(self, element) -> str:
+        """写出时在 element 后面插入展开内容。返回展开的 key。"""
+        sentinel = self._sentinel()
+        element.addnext(sentinel)
+        return sentinel.text
+
+    def _fragment(self, element) -> bytes:
+        """单个元素的 XML，去掉和根节点重复的命名空间声明（只看开始标签）。"""
+        raw = etree.tostring(element, encoding="UTF-8")
+        end = raw.index(b">")
+
+        def _keep(m: "re.Match[bytes]") -> bytes:
+            return b"" if self._root_ns.get(m.group(1)) == m.group(2) else m.group(0)
+
+        return _XMLNS_RE.sub(_keep, raw[:end]) + raw[end:]
+
+    def write_document(self, expansions: Dict[str, Iterable]) -> None:
+        """
+        流式写出 word/document.xml：模板部分一次序列化，
+        每个占位注释的位置依次写入 expansions[key] 产出的元素。
+        """
+        xml = serialize_part_xml(self.doc.element)
+        with self._zip.open(self.doc.part.partname.membername, "w", force_zip64=True) as f:
+            pos = 0
+            for m in re.finditer(rb"<!--" + _SENTINEL_PREFIX.encode() + rb"\d+-->", xml):
+                f.write(xml[pos:m.start()])
+                key = m.group(0)[4:-3].decode()
+                for element in expansions.get(key, ()):
+                    f.write(self._fragment(element))
+                pos = m.end()
+            f.write(xml[pos:])
+        self._document_written = True
+
+    def close(self) -> None:
+        # 正文的 rels 最后写：模板原有的关系 + add_media() 加的图片
+        try:
+            if self._document_written:
+                rels = _part_rels(self.doc.part.rels) + self._media_rels
+                self._write(self.doc.part.partname.rels_uri, _rels_xml(rels))
+        finally:
+            self._zip.close()
+
+    def abort(self) -> None:
+        """出错 / 取消时调用：关掉 zip 并删除写了一半的文件。"""
+        self._zip.close()
+        if os.path.exists(self.output_path):
+            os.remove(self.output_path)
+
+    def __enter__(self) -> "StreamingDocxWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.abort()
+        else:
+            self.close()
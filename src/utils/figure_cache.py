@@ -0,0 +1,200 @@
+# src/utils/figure_cache.py
+import io
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Tuple
+
+from src.config.config import (
+    CACHE_DIR,
+    FIGURE_CACHE_MAX_BYTES,
+    FIGURE_DPI,
+    FIGURE_FORMAT,
+    FIGURE_JPEG_QUALITY,
+    FIGURE_MAX_BYTES,
+    FIGURE_MODE,
+    FIGURE_VECTOR_FALLBACK_DPI,
+)
+from src.utils.disk_cache import DiskLruCache, file_fingerprint, make_key
+
+# 渲染逻辑（页码、编码方式等）变了就改这个版本号，旧图自动失效
+FIGURE_RENDER_VERSION = 3
+
+# 裁剪框：PDF 坐标 (x0, y0, x1, y1)，None 表示整页
+Clip = Optional[Tuple[float, float, float, float]]
+
+# - raster:      按 dpi / fmt 栅格化（原行为）
+# - vector:      嵌入 PDF 页面导出的 SVG（Word 2016+ 显示矢量图），附一张低分辨率 PNG 备用
+# - target-size: 自动降 dpi / 换 JPEG，让每张图不超过 max_bytes
+FIGURE_MODES = ("raster", "vector", "target-size")
+
+# - png:         24 位彩色 PNG（原行为）
+# - jpeg:        有损压缩，质量由 jpeg_quality 决定
+# - png-gray:    8 位灰度 PNG，不需要额外依赖
+# - png-palette: 256 色调色板 PNG，需要 Pillow；没装时退回普通 png
+FIGURE_FORMATS = ("png", "jpeg", "png-gray", "png-palette")
+
+# target-size 模式依次尝试的 dpi（只取不超过 options.dpi 的）
+_TARGET_SIZE_DPIS = (250, 200, 150, 120, 96, 72)
+
+
+@dataclass(frozen=True)
+class FigureOptions:
+    """PDF 曲线图的渲染参数；所有字段都会进缓存 key。"""
+    mode: str = FIGURE_MODE
+    dpi: int = FIGURE_DPI
+    fmt: str = FIGURE_FORMAT
+    jpeg_quality: int = FIGURE_JPEG_QUALITY
+    clip: Clip = None
+    max_bytes: int = FIGURE_MAX_BYTES
+
+    def __post_init__(self):
+        if self.mode not in FIGURE_MODES:
+            raise ValueError(f"Unknown figure mode: {self.mode!r} (expected one of {FIGURE_MODES})")
+        if self.fmt not in FIGURE_FORMATS:
+            raise ValueError(f"Unknown figure format: {self.fmt!r} (expected one of {FIGURE_FORMATS})")
+
+    def cache_parts(self) -> Tuple[str, ...]:
+        clip_part = ",".join(f"{v:g}" for v in self.clip) if self.clip else "-"
+        if self.mode == "raster":
+            quality = str(self.jpeg_quality) if self.fmt == "jpeg" else "-"
+            detail = f"dpi={self.dpi};fmt={self.fmt};q={quality}"
+        elif self.mode == "target-size":
+            detail = f"dpi<={self.dpi};q={self.jpeg_quality};max={self.max_bytes}"
+        else:
+            detail = f"fallback-dpi={FIGURE_VECTOR_FALLBACK_DPI}"
+        return (f"mode={self.mode}", detail, f"clip={clip_part}")
+
+
+@dataclass
+class RenderedFigure:
+    """一张曲线图：image 是位图字节；vector 模式下另有 svg，image 只作备用图。"""
+    image: bytes
+    svg: Optional[bytes] = None
+
+
+def _encode_palette_png(pix) -> bytes:
+    try:
+        from PIL import Image
+    except ImportError:
+        print("[figure] png-palette 需要 Pillow，改用普通 PNG")
+        return pix.tobytes("png")
+    img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    buf = io.BytesIO()
+    img.quantize(colors=256).save(buf, format="PNG", optimize=True)
+    return buf.getvalue()
+
+
+def _pixmap(page, dpi: int, clip: Clip, gray: bool = False):
+    import fitz
+
+    return page.get_pixmap(
+        dpi=dpi,
+        colorspace=fitz.csGRAY if gray else fitz.csRGB,
+        clip=fitz.Rect(clip) if clip else None,
+        alpha=False,
+    )
+
+
+def _encode(pix, fmt: str, jpeg_quality: int) -> bytes:
+    if fmt == "jpeg":
+        return pix.tobytes("jpg", jpg_quality=jpeg_quality)
+    if fmt == "png-palette":
+        return _encode_palette_png(pix)
+    return pix.tobytes("png")
+
+
+def _render_within_budget(page, options: FigureOptions) -> bytes:
+    """
+    从高 dpi 往低试：每个 dpi 先试 PNG（曲线图这类线稿通常 PNG 更小），再试 JPEG。
+    第一个不超过 max_bytes 的就用；都超了就用最小的那个。
+    """
+    dpis = [d for d in _TARGET_SIZE_DPIS if d <= options.dpi] or [options.dpi]
+    if dpis[0] != options.dpi:
+        dpis.insert(0, options.dpi)
+
+    smallest: Optional[bytes] = None
+    for dpi in dpis:
+        pix = _pixmap(page, dpi, options.clip)
+        for fmt in ("png", "jpeg"):
+            data = _encode(pix, fmt, options.jpeg_quality)
+            if len(data) <= options.max_bytes:
+                return data
+            if smallest is None or len(data) < len(smallest):
+                smallest = data
+    return smallest
+
+
+def _page_svg(page, clip: Clip) -> bytes:
+    import fitz
+
+    if clip:
+        page.set_cropbox(fitz.Rect(clip))
+    # 文字转成路径：Word 那边不一定有 PDF 里的字体
+    return page.get_svg_image(text_as_path=True).encode("utf-8")
+
+
+def render_pdf_figure(pdf_path: str, options: FigureOptions = FigureOptions()) -> RenderedFigure:
+    """把 PDF 第 0 页（或其中的 clip 区域）按 options 渲染，全程在内存里完成。"""
+    # PyMuPDF 在第一次渲染时才导入（GUI 启动时不加载，见 src/utils/lazy_imports.py）
+    import fitz
+
+    doc_pdf = fitz.open(pdf_path)
+    try:
+        page = doc_pdf.load_page(0)
+        if options.mode == "target-size":
+            return RenderedFigure(_render_within_budget(page, options))
+        if options.mode == "vector":
+            fallback = _pixmap(page, FIGURE_VECTOR_FALLBACK_DPI, options.clip).tobytes("png")
+            return RenderedFigure(fallback, svg=_page_svg(page, options.clip))
+        pix = _pixmap(page, options.dpi, options.clip, gray=options.fmt == "png-gray")
+        return RenderedFigure(_encode(pix, options.fmt, options.jpeg_quality))
+    finally:
+        doc_pdf.close()
+
+
+class FigureCache:
+    """
+    DSC 曲线 PDF 渲染结果（位图字节，vector 模式另存 SVG）的持久化缓存。
+
+    key = 渲染版本 + PDF 指纹 + FigureOptions（模式 / dpi / 格式 / 质量 / 裁剪框 / 字节上限），
+    改个错别字重新生成报告时，同一张曲线不用再栅格化一遍。
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = FIGURE_CACHE_MAX_BYTES):
+        self._store = DiskLruCache(
+            Path(root) if root is not None else CACHE_DIR / "figures",
+            max_bytes,
+            suffix=".img",
+        )
+
+    def key_for(self, pdf_path: str, options: FigureOptions) -> str:
+        return make_key(
+            f"figure-v{FIGURE_RENDER_VERSION}",
+            file_fingerprint(pdf_path),
+            *options.cache_parts(),
+        )
+
+    def get_or_render(self, pdf_path: str, options: FigureOptions = FigureOptions()) -> RenderedFigure:
+        """命中直接返回缓存的图；否则渲染并写入缓存。渲染本身的异常照常抛出。"""
+        try:
+            key = self.key_for(pdf_path, options)
+        except OSError:
+            key = None
+        svg_key = make_key(key, "svg") if key is not None else None
+        want_svg = options.mode == "vector"
+
+        if key is not None:
+            image = self._store.get(key)
+            svg = self._store.get(svg_key) if want_svg else None
+            if image is not None and (svg is not None or not want_svg):
+                return RenderedFigure(image, svg=svg)
+
+        figure = render_pdf_figure(pdf_path, options)
+        if key is not None:
+            self._store.put(key, figure.image)
+            if figure.svg is not None:
+                self._store.put(svg_key, figure.svg)
+        return figure
+
+    def clear(self) -> None:
+        self._store.clear()
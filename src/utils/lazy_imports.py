@@ -0,0 +1,61 @@
+# src/utils/lazy_imports.py
+"""
+重依赖（PyMuPDF / python-docx / lxml）的延迟加载约定：
+
+- GUI 启动路径（main.py -> ui_main -> controllers / services）上的模块顶层不 import 它们，
+  改在第一次真正用到的函数里 import（parser_dsc / figure_cache / template_cache / ReportService）
+- 窗口显示出来之后，prewarm_imports() 在后台线程里把它们导入一遍，
+  用户第一次解析 / 生成报告时就不用再等（导入有模块级锁，前台同时用到时会等后台导完，不会导两遍）
+- python -m src.tools.startup_profile 报告启动路径的导入耗时，并检查 HEAVY_MODULES 有没有被提前导入
+
+PyInstaller 会扫描函数体里的 import，打包时这些依赖照样会被收进去。
+"""
+
+import importlib
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+# 启动时不该出现在 sys.modules 里的模块（按导入顺序：后面的依赖前面的）
+HEAVY_MODULES = ("fitz", "lxml.etree", "docx", "src.utils.templating")
+
+
+def heavy_modules_loaded(modules: Iterable[str] = HEAVY_MODULES) -> List[str]:
+    """已经被导入的重模块。"""
+    return [m for m in modules if m in sys.modules]
+
+
+def import_modules(modules: Iterable[str] = HEAVY_MODULES) -> Dict[str, float]:
+    """依次导入，返回 {模块名: 秒}；导入失败的记为 -1（让真正用到的地方再报错）。"""
+    timings: Dict[str, float] = {}
+    for name in modules:
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"[prewarm] import {name} failed: {e}")
+            timings[name] = -1.0
+            continue
+        timings[name] = time.perf_counter() - t0
+    return timings
+
+
+def prewarm_imports(
+    modules: Iterable[str] = HEAVY_MODULES,
+    on_done: Optional[Callable[[Dict[str, float]], None]] = None,
+) -> threading.Thread:
+    """
+    在后台 daemon 线程里导入 modules，立即返回线程对象。
+    on_done 在后台线程里调用（要更新界面请自己转回 GUI 线程）。
+    """
+    modules = tuple(modules)
+
+    def _run() -> None:
+        timings = import_modules(modules)
+        if on_done is not None:
+            on_done(timings)
+
+    thread = threading.Thread(target=_run, name="prewarm-imports", daemon=True)
+    thread.start()
+    return thread
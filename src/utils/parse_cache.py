@@ -0,0 +1,77 @@
+# src/utils/parse_cache.py
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.config.config import CACHE_DIR, PARSE_CACHE_MAX_BYTES
+from src.models.models import DscBasicInfo, DscPeakPart, DscSegment
+from src.utils.disk_cache import DiskLruCache, file_fingerprint, make_key
+from src.utils.parser_dsc import parser_fingerprint
+
+
+def _dump_result(basic: DscBasicInfo, segments: List[DscSegment]) -> bytes:
+    payload = {
+        "basic": asdict(basic),
+        "segments": [asdict(seg) for seg in segments],
+    }
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _load_result(data: bytes) -> Tuple[DscBasicInfo, List[DscSegment]]:
+    payload = json.loads(data.decode("utf-8"))
+    basic = DscBasicInfo(**payload["basic"])
+    segments: List[DscSegment] = []
+    for raw in payload["segments"]:
+        parts = [DscPeakPart(**p) for p in raw.pop("parts", [])]
+        segments.append(DscSegment(parts=parts, **raw))
+    return basic, segments
+
+
+class ParseCache:
+    """
+    DSC 解析结果的持久化缓存（basic + segments，已合并 PDF Range）。
+
+    key = 解析器版本戳 + TXT 指纹 + PDF 指纹（内容 sha256 + 大小 + mtime），
+    所以文件内容、文件时间或解析正则任意一个变化都不会命中旧结果。
+    每次 get 都反序列化出一份新对象，UI 里的编辑不会污染缓存。
+    """
+
+    def __init__(self, root: Optional[Path] = None, max_bytes: int = PARSE_CACHE_MAX_BYTES):
+        self._store = DiskLruCache(
+            Path(root) if root is not None else CACHE_DIR / "parse",
+            max_bytes,
+            suffix=".json",
+        )
+
+    def key_for(self, txt_path: str, pdf_path: Optional[str] = None) -> str:
+        pdf_fp = file_fingerprint(pdf_path) if pdf_path else "-"
+        return make_key(parser_fingerprint(), file_fingerprint(txt_path), pdf_fp)
+
+    def get(
+        self, txt_path: str, pdf_path: Optional[str] = None
+    ) -> Optional[Tuple[DscBasicInfo, List[DscSegment]]]:
+        try:
+            data = self._store.get(self.key_for(txt_path, pdf_path))
+            if data is None:
+                return None
+            return _load_result(data)
+        except (OSError, ValueError, KeyError, TypeError):
+            # 文件不可读 / 缓存条目损坏：当作没命中，交给正常解析
+            return None
+
+    def put(
+        self,
+        txt_path: str,
+        pdf_path: Optional[str],
+        basic: DscBasicInfo,
+        segments: List[DscSegment],
+    ) -> None:
+        try:
+            key = self.key_for(txt_path, pdf_path)
+        except OSError:
+            return
+        self._store.put(key, _dump_result(basic, segments))
+
+    def clear(self) -> None:
+        self._store.clear()
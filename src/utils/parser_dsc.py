@@ -1,8 +1,7 @@
 # src/utils/parser_dsc.py
 import re
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-import fitz
 from src.models.models import DscBasicInfo, DscSegment, DscPeakPart
 
 
@@ -25,6 +24,9 @@ def parse_segment_ranges_from_pdf(pdf_path: str) -> list[str]:
     if not pdf_path:
         return []
 
+    # PyMuPDF 很重（几十 ms），不放在模块顶层：GUI 启动时不加载，第一次读 PDF 才导入
+    import fitz
+
     try:
         doc = fitz.open(pdf_path)
         page = doc.load_page(0)
@@ -120,6 +122,269 @@ def _merge_segments_with_pdf_ranges(
     return segments
 
 
+# ================== TXT 单遍扫描 ==================
+
+# 基础信息：每个字段只取全文第一次出现的值
+_SAMPLE_NAME_RE = re.compile(r"Sample name:\s*(.+)")
+_SAMPLE_MASS_RE = re.compile(r"Sample Mass:\s*([\d\.]+)\s*mg")
+_OPERATOR_RE = re.compile(r"Operator:\s*(.+)")
+_INSTRUMENT_RE = re.compile(r"Instrument:\s*(.+)")
+_ATMOSPHERE_RE = re.compile(r"Atmosphere:\s*(.+)")
+_CRUCIBLE_RE = re.compile(r"Crucible:\s*(.+)")
+_TEMP_CALIB_RE = re.compile(r"Temp\.Calib\.\s*:\s*([0-9]{2})-([0-9]{2})-([0-9]{4})")
+_END_DATE_RE = re.compile(r"End Date/Time:\s*([0-9]{4})/([0-9]{1,2})/([0-9]{1,2})")
+
+# Segments：例如  Segments:             1/3   :   -20°C/10.0(K/min)/150°C
+_SEG_HEADER_RE = re.compile(r"Segments:\s*(\d+)\s*/\s*(\d+)\s*:\s*(.+)")
+
+# Complex Peak (DSC) block：块头之后依次出现 Area / Peak / Onset 行
+_PEAK_AREA_RE = re.compile(r"Area\s+([-\d\.]+)\s+J/g")
+_PEAK_PEAK_RE = re.compile(r"Peak:\s+([-\d\.]+)\s+°C")
+_PEAK_ONSET_RE = re.compile(r"Onset:\s+([-\d\.]+)\s+°C")
+
+# Value (DSC) 行：Value 数值 + 温度
+_VALUE_RE = re.compile(r"Value \(DSC\)\s+([-\d\.]+)\s+mW/mg\s+([-\d\.]+)\s+°C")
+
+
+# 解析器版本：改动配对 / 取值逻辑时手动 +1。
+# 磁盘上的解析缓存以 parser_fingerprint() 作为版本戳，正则一改旧缓存自动失效。
+PARSER_VERSION = 1
+
+
+def parser_fingerprint() -> str:
+    """PARSER_VERSION + 所有解析正则的 pattern 拼出来的版本戳。"""
+    patterns = (
+        _RANGE_PATTERN,
+        _SAMPLE_NAME_RE, _SAMPLE_MASS_RE, _OPERATOR_RE, _INSTRUMENT_RE,
+        _ATMOSPHERE_RE, _CRUCIBLE_RE, _TEMP_CALIB_RE, _END_DATE_RE,
+        _SEG_HEADER_RE, _PEAK_AREA_RE, _PEAK_PEAK_RE, _PEAK_ONSET_RE, _VALUE_RE,
+    )
+    return f"v{PARSER_VERSION}|" + "|".join(p.pattern for p in patterns)
+
+
+def _detect_txt_encoding(txt_path: str) -> str:
+    """
+    NETZSCH 导出的 PrnRes TXT 一般是带 BOM 的 UTF-16；
+    没有 BOM 时看前 4KB 里有没有大量 NUL 字节，再决定按 UTF-16 还是 UTF-8 读。
+    """
+    with open(txt_path, "rb") as f:
+        head = f.read(4096)
+
+    if head.startswith((b"\xff\xfe", b"\xfe\xff")):
+        return "utf-16"
+    if head.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
+    if head and head.count(b"\x00") * 4 >= len(head):
+        return "utf-16-le"
+    return "utf-8"
+
+
+def _iter_txt_lines(txt_path: str):
+    """按行流式读取 TXT（只解码一次，不把全文读进内存）。"""
+    encoding = _detect_txt_encoding(txt_path)
+    with open(txt_path, "r", encoding=encoding, errors="ignore") as f:
+        for line in f:
+            yield line.rstrip("\r\n")
+
+
+def _fill_basic_field(info: DscBasicInfo, found: set, line: str) -> None:
+    """
+    在单行里尝试匹配尚未找到的基础字段（每个字段只取第一次出现）。
+    - Crucible 只取逗号前一段
+    - Temp.Calib.: 09-04-2025 14:25  ->  2025/04/09
+    - End Date/Time: 2025/5/6 10:57:06 (UTC+8)  ->  2025/05/06
+    """
+    if "sample_name" not in found and "Sample name:" in line:
+        m = _SAMPLE_NAME_RE.search(line)
+        if m:
+            info.sample_name = m.group(1).strip()
+            found.add("sample_name")
+        return
+
+    if "sample_mass_mg" not in found and "Sample Mass:" in line:
+        m = _SAMPLE_MASS_RE.search(line)
+        if m:
+            try:
+                info.sample_mass_mg = float(m.group(1))
+            except ValueError:
+                info.sample_mass_mg = None
+            found.add("sample_mass_mg")
+        return
+
+    for key, marker, pattern in (
+        ("operator", "Operator:", _OPERATOR_RE),
+        ("instrument", "Instrument:", _INSTRUMENT_RE),
+        ("atmosphere", "Atmosphere:", _ATMOSPHERE_RE),
+    ):
+        if key not in found and marker in line:
+            m = pattern.search(line)
+            if m:
+                setattr(info, key, m.group(1).strip())
+                found.add(key)
+
+    if "crucible" not in found and "Crucible:" in line:
+        m = _CRUCIBLE_RE.search(line)
+        if m:
+            full = m.group(1).strip()
+            info.crucible = full.split(",", 1)[0].strip() if "," in full else full
+            found.add("crucible")
+
+    if "temp_calib" not in found and "Temp.Calib." in line:
+        m = _TEMP_CALIB_RE.search(line)
+        if m:
+            day, month, year = m.groups()
+            info.temp_calib = f"{year}/{int(month):02d}/{int(day):02d}"
+            found.add("temp_calib")
+
+    if "end_date" not in found and "End Date/Time:" in line:
+        m = _END_DATE_RE.search(line)
+        if m:
+            year, month, day = m.groups()
+            info.end_date = f"{year}/{int(month):02d}/{int(day):02d}"
+            found.add("end_date")
+
+
+def _pair_segment_parts(seg: DscSegment, peaks: list, value_temps: list) -> None:
+    """
+    把一个 segment 内收集到的 Complex Peak 和 Value 行按顺序“配对”生成小 part：
+    - 有对应的 Complex Peak -> 填 Onset / Peak / Area / Comment（Area 取相反数）
+    - 有对应的 Value 行 -> 只要温度，不要 mW/mg 数值
+    """
+    n = max(len(peaks), len(value_temps))
+    for idx in range(n):
+        part = DscPeakPart()
+
+        if idx < len(peaks):
+            area_raw, peak_c, onset_c = peaks[idx]
+            area_report = -area_raw
+
+            if area_report > 0:
+                comment = "Endothermic"
+            elif area_report < 0:
+                comment = "Exothermic"
+            else:
+                comment = ""
+
+            part.onset_c = onset_c
+            part.peak_c = peak_c
+            part.area_raw = area_raw
+            part.area_report = area_report
+            part.comment = comment
+
+        if idx < len(value_temps):
+            part.value_temp_c = value_temps[idx]
+
+        seg.parts.append(part)
+
+
+def scan_dsc_txt(txt_path: str, with_segments: bool = True) -> Tuple[DscBasicInfo, List[DscSegment]]:
+    """
+    单遍扫描 DSC txt：只解码一次、逐行遍历，同时填充
+    - DscBasicInfo（基础信息）
+    - DscSegment 列表（with_segments=False 时跳过，返回空列表）
+
+    Complex Peak block 的识别是一个小状态机：
+        "Complex Peak (DSC)" -> Area 行 -> Peak: 行 -> Onset: 行
+    中间允许夹杂其它行；遇到下一个 Segments 头时丢弃未完成的 block。
+    """
+    info = DscBasicInfo()
+    found: set = set()
+    n_basic = 8
+
+    segments: List[DscSegment] = []
+    seg: Optional[DscSegment] = None
+    peaks: list = []
+    value_temps: list = []
+
+    # Complex Peak 状态：0=无，1=等 Area，2=等 Peak，3=等 Onset
+    peak_state = 0
+    area_raw = peak_c = 0.0
+
+    for line in _iter_txt_lines(txt_path):
+        if len(found) < n_basic:
+            _fill_basic_field(info, found, line)
+
+        if not with_segments:
+            if len(found) >= n_basic:
+                break
+            continue
+
+        if "Segments:" in line:
+            m = _SEG_HEADER_RE.search(line)
+            if m:
+                if seg is not None:
+                    _pair_segment_parts(seg, peaks, value_temps)
+                    segments.append(seg)
+
+                raw_desc = m.group(3).strip()
+                seg = DscSegment(
+                    index=int(m.group(1)),
+                    total=int(m.group(2)),
+                    raw_desc=raw_desc,
+                    desc_display=_normalize_segment_desc(raw_desc),
+                )
+                peaks = []
+                value_temps = []
+                peak_state = 0
+                continue
+
+        if seg is None:
+            continue
+
+        if peak_state == 0:
+            if "Complex Peak (DSC)" in line:
+                peak_state = 1
+        elif peak_state == 1:
+            if line.startswith("Area"):
+                m = _PEAK_AREA_RE.match(line)
+                if m:
+                    area_raw = float(m.group(1))
+                    peak_state = 2
+        elif peak_state == 2:
+            if line.startswith("Peak:"):
+                m = _PEAK_PEAK_RE.match(line)
+                if m:
+                    peak_c = float(m.group(1))
+                    peak_state = 3
+        elif peak_state == 3:
+            if line.startswith("Onset:"):
+                m = _PEAK_ONSET_RE.match(line)
+                if m:
+                    peaks.append((area_raw, peak_c, float(m.group(1))))
+                    peak_state = 0
+
+        if "Value (DSC)" in line:
+            m = _VALUE_RE.search(line)
+            if m:
+                value_temps.append(float(m.group(2)))
+
+    if seg is not None:
+        _pair_segment_parts(seg, peaks, value_temps)
+        segments.append(seg)
+
+    return info, segments
+
+
+def read_dsc_sample_name(txt_path: str) -> str:
+    """只读到第一条 `Sample name:` 为止，给“添加样品”弹窗预填样品名用。"""
+    for line in _iter_txt_lines(txt_path):
+        if "Sample name:" in line:
+            m = _SAMPLE_NAME_RE.search(line)
+            if m:
+                return m.group(1).strip()
+    return ""
+
+
+def apply_pdf_ranges(segments: List[DscSegment], pdf_path: Optional[str]) -> List[DscSegment]:
+    """如果提供了 PDF，尝试用底部的 Range 补齐 TXT 中缺失的段。"""
+    if not pdf_path:
+        return segments
+    pdf_ranges = parse_segment_ranges_from_pdf(pdf_path)
+    if not pdf_ranges:
+        return segments
+    return _merge_segments_with_pdf_ranges(segments, pdf_ranges)
+
+
 # ================== TXT 基础信息 ==================
 
 def parse_dsc_txt_basic(txt_path: str) -> DscBasicInfo:
@@ -133,70 +398,9 @@ def parse_dsc_txt_basic(txt_path: str) -> DscBasicInfo:
     - Crucible（只取逗号前一段）
     - Temp.Calib.（YYYY/MM/DD）
     - End Date/Time（YYYY/MM/DD）
+    基础字段都找到后就提前结束扫描，不再读 Segments 部分。
     """
-    # 优先按 UTF-16 读取
-    try:
-        with open(txt_path, "r", encoding="utf-16", errors="ignore") as f:
-            text = f.read()
-    except UnicodeError:
-        with open(txt_path, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
-
-    info = DscBasicInfo()
-
-    # Sample name
-    m = re.search(r"Sample name:\s*(.+)", text)
-    if m:
-        info.sample_name = m.group(1).strip()
-
-    # Sample Mass: 8.496 mg
-    m = re.search(r"Sample Mass:\s*([\d\.]+)\s*mg", text)
-    if m:
-        try:
-            info.sample_mass_mg = float(m.group(1))
-        except ValueError:
-            info.sample_mass_mg = None
-
-    # Operator:
-    m = re.search(r"Operator:\s*(.+)", text)
-    if m:
-        info.operator = m.group(1).strip()
-
-    # Instrument:
-    m = re.search(r"Instrument:\s*(.+)", text)
-    if m:
-        info.instrument = m.group(1).strip()
-
-    # Atmosphere:
-    m = re.search(r"Atmosphere:\s*(.+)", text)
-    if m:
-        info.atmosphere = m.group(1).strip()
-
-    # Crucible: 只保留逗号前一段
-    m = re.search(r"Crucible:\s*(.+)", text)
-    if m:
-        full = m.group(1).strip()
-        if "," in full:
-            head = full.split(",", 1)[0].strip()
-            info.crucible = head
-        else:
-            info.crucible = full
-
-    # Temp.Calib.: 09-04-2025 14:25  ->  2025/04/09
-    m = re.search(r"Temp\.Calib\.\s*:\s*([0-9]{2})-([0-9]{2})-([0-9]{4})", text)
-    if m:
-        day, month, year = m.groups()
-        info.temp_calib = f"{year}/{int(month):02d}/{int(day):02d}"
-
-    # End Date/Time: 2025/5/6 10:57:06 (UTC+8)
-    m = re.search(
-        r"End Date/Time:\s*([0-9]{4})/([0-9]{1,2})/([0-9]{1,2})",
-        text,
-    )
-    if m:
-        year, month, day = m.groups()
-        info.end_date = f"{year}/{int(month):02d}/{int(day):02d}"
-
+    info, _ = scan_dsc_txt(txt_path, with_segments=False)
     return info
 
 
@@ -210,103 +414,7 @@ def parse_dsc_segments(txt_path: str, pdf_path: Optional[str] = None) -> List[Ds
     - 每段下面的小 part：配对 Value(DSC) 温度 + Onset / Peak / Area；
     再根据 pdf_path（如果提供）去 PDF 底部读取 Range：
     - 若 PDF 段数更多，则为多出来的段生成“空值” segment（只有 desc，有一个空的 part）。
+    需要同时拿基础信息时请直接用 scan_dsc_txt，避免把文件读两遍。
     """
-    # 读取全文
-    try:
-        with open(txt_path, "r", encoding="utf-16", errors="ignore") as f:
-            text = f.read()
-    except UnicodeError:
-        with open(txt_path, "r", encoding="utf-8", errors="ignore") as f:
-            text = f.read()
-
-    segments: List[DscSegment] = []
-
-    # ---- 1) 找每个 Segment 的头 ----
-    # 例如：Segments:             1/3   :   -20°C/10.0(K/min)/150°C
-    seg_header_re = re.compile(r"Segments:\s*(\d+)\s*/\s*(\d+)\s*:\s*(.+)")
-    header_matches = list(seg_header_re.finditer(text))
-    if not header_matches:
-        # 如果 TXT 里完全没有 Segments，就直接看 PDF 有没有 Range
-        segments = []
-    else:
-        # Complex Peak (DSC) block：包含 Area / Peak / Onset
-        peak_block_re = re.compile(
-            r"Complex Peak \(DSC\).*?\n"
-            r"Area\s+([-\d\.]+)\s+J/g.*?\n"
-            r"Peak:\s+([-\d\.]+)\s+°C.*?\n"
-            r"Onset:\s+([-\d\.]+)\s+°C",
-            re.S,
-        )
-
-        # Value (DSC) 行：Value 数值 + 温度
-        value_re = re.compile(
-            r"Value \(DSC\)\s+([-\d\.]+)\s+mW/mg\s+([-\d\.]+)\s+°C"
-        )
-
-        # ---- 2) 遍历每一个 Segment ----
-        for i, m in enumerate(header_matches):
-            seg_idx = int(m.group(1))
-            seg_total = int(m.group(2))
-            raw_desc = m.group(3).strip()
-            desc_display = _normalize_segment_desc(raw_desc)
-
-            # 当前 segment 的文本范围：从当前 header 结束到下一个 header 开始
-            start_pos = m.end()
-            end_pos = header_matches[i + 1].start() if i + 1 < len(header_matches) else len(text)
-            seg_text = text[start_pos:end_pos]
-
-            seg = DscSegment(
-                index=seg_idx,
-                total=seg_total,
-                raw_desc=raw_desc,
-                desc_display=desc_display,
-            )
-
-            # ---- 2.1 收集 Complex Peak blocks 和 Value 行 ----
-            peak_matches = list(peak_block_re.finditer(seg_text))
-            value_matches = list(value_re.finditer(seg_text))
-
-            # ---- 2.2 按顺序“配对”生成小 part ----
-            n = max(len(peak_matches), len(value_matches))
-            for idx in range(n):
-                part = DscPeakPart()
-
-                # 有对应的 Complex Peak -> 填 Onset / Peak / Area / Comment
-                if idx < len(peak_matches):
-                    pm = peak_matches[idx]
-                    area_raw = float(pm.group(1))
-                    peak_c = float(pm.group(2))
-                    onset_c = float(pm.group(3))
-
-                    area_report = -area_raw  # 取相反数
-
-                    if area_report > 0:
-                        comment = "Endothermic"
-                    elif area_report < 0:
-                        comment = "Exothermic"
-                    else:
-                        comment = ""
-
-                    part.onset_c = onset_c
-                    part.peak_c = peak_c
-                    part.area_raw = area_raw
-                    part.area_report = area_report
-                    part.comment = comment
-
-                # 有对应的 Value 行 -> 只要温度，不要 mW/mg 数值
-                if idx < len(value_matches):
-                    vm = value_matches[idx]
-                    temp_c = float(vm.group(2))
-                    part.value_temp_c = temp_c
-
-                seg.parts.append(part)
-
-            segments.append(seg)
-
-    # ---- 3) 如果提供了 PDF，尝试用 Range 补齐缺失的段 ----
-    if pdf_path:
-        pdf_ranges = parse_segment_ranges_from_pdf(pdf_path)
-        if pdf_ranges:
-            segments = _merge_segments_with_pdf_ranges(segments, pdf_ranges)
-
-    return segments
\ No newline at end of file
+    _, segments = scan_dsc_txt(txt_path)
+    return apply_pdf_ranges(segments, pdf_path)
@@ -0,0 +1,235 @@
+# src/utils/profiling.py
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import resource   # 只有 Unix 有；Windows 上不记 RSS
+except ImportError:  # pragma: no cover
+    resource = None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """进程的 RSS 峰值（MB），拿不到时返回 None。"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 单位是 KB，macOS 是字节
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+@dataclass
+class Span:
+    """一段计时：墙钟时间、本线程 CPU 时间、内存峰值。"""
+    name: str
+    parent: Optional[int]           # 父 span 在 Profiler.spans 里的下标
+    depth: int
+    start: float                    # 相对 Profiler 创建时刻（秒）
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rss_peak_mb: Optional[float] = None   # 结束时的进程 RSS 峰值（单调不减，看 span 之间的增量）
+    py_peak_kb: Optional[float] = None    # span 内 Python 分配的峰值增量（memory=True 时才有）
+    tid: int = 0
+    args: Dict[str, Any] = field(default_factory=dict)
+    closed: bool = False
+    is_stage: bool = False
+
+
+class Profiler:
+    """
+    报告流水线的分阶段计时（默认不开；调用方传一个 Profiler 进去才记录）。
+
+    - span(name, **args)：with 块计一段，可以嵌套；退出时顺带关掉里面没关的 stage
+    - stage(name)：顺序阶段，关掉同一层上一个 stage 再开新的（对应 fill_template_with_mapping 的 progress 阶段）
+    - memory=True 时用 tracemalloc 记每段的 Python 分配峰值（会明显变慢；lxml / PyMuPDF 的内存看不到，看 RSS）
+    - export_chrome_trace(path)：写成 Chrome trace JSON（chrome://tracing、Perfetto 可直接打开）
+    - breakdown() / format_breakdown()：按层级汇总，给 GUI 日志和命令行看
+    同一个 Profiler 只在一个线程里用（GUI 的后台任务、batch 的 worker 都是一份报告一个 Profiler）。
+    """
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.spans: List[Span] = []
+        self._stack: List[Tuple[int, float, float, int]] = []   # (下标, wall 起点, cpu 起点, traced 起点)
+        self._origin = time.perf_counter()
+        self._started_tracemalloc = False
+        self._pid = os.getpid()
+
+    # -----------------------------
+    # 记录
+    # -----------------------------
+    def _flush_traced_peak(self) -> None:
+        """把当前的 tracemalloc 峰值记到所有打开的 span 上，然后清零峰值（嵌套 span 各自都能拿到峰值）。"""
+        _, peak = tracemalloc.get_traced_memory()
+        for idx, _, _, traced_start in self._stack:
+            span = self.spans[idx]
+            extra = (peak - traced_start) / 1024
+            if span.py_peak_kb is None or extra > span.py_peak_kb:
+                span.py_peak_kb = max(0.0, extra)
+        tracemalloc.reset_peak()
+
+    def begin(self, name: str, is_stage: bool = False, **args) -> None:
+        traced = 0
+        if self.memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+            self._flush_traced_peak()
+            traced = tracemalloc.get_traced_memory()[0]
+
+        parent = self._stack[-1][0] if self._stack else None
+        now = time.perf_counter()
+        span = Span(
+            name=name,
+            parent=parent,
+            depth=len(self._stack),
+            start=now - self._origin,
+            tid=threading.get_ident(),
+            args=args,
+            is_stage=is_stage,
+        )
+        self.spans.append(span)
+        self._stack.append((len(self.spans) - 1, now, time.thread_time(), traced))
+
+    def end(self) -> None:
+        """关掉最里层的 span。"""
+        if self.memory and tracemalloc.is_tracing():
+            self._flush_traced_peak()
+        idx, wall0, cpu0, _ = self._stack.pop()
+        span = self.spans[idx]
+        span.wall_s = time.perf_counter() - wall0
+        span.cpu_s = time.thread_time() - cpu0
+        span.rss_peak_mb = _peak_rss_mb()
+        span.closed = True
+
+    def _end_to_depth(self, depth: int) -> None:
+        while len(self._stack) > depth:
+            self.end()
+
+    @contextmanager
+    def span(self, name: str, **args) -> Iterator[None]:
+        self.begin(name, **args)
+        depth = len(self._stack)
+        try:
+            yield
+        finally:
+            # 里面还开着的 stage（最后一个阶段、或者中途抛了异常）一起关掉
+            self._end_to_depth(depth - 1)
+
+    def stage(self, name: str, **args) -> None:
+        self.end_stage()
+        self.begin(name, is_stage=True, **args)
+
+    def end_stage(self) -> None:
+        """关掉当前这一层打开的 stage（没有就什么都不做）。"""
+        if self._stack and self.spans[self._stack[-1][0]].is_stage:
+            self.end()
+
+    def close(self) -> None:
+        """关掉所有还开着的 span；memory=True 且 tracemalloc 是这里开的就停掉。"""
+        self._end_to_depth(0)
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    # -----------------------------
+    # 导出
+    # -----------------------------
+    def to_chrome_trace(self) -> dict:
+        events = []
+        for span in self.spans:
+            if not span.closed:
+                continue
+            args = dict(span.args)
+            args["cpu_ms"] = round(span.cpu_s * 1000, 3)
+            if span.rss_peak_mb is not None:
+                args["rss_peak_mb"] = round(span.rss_peak_mb, 1)
+            if span.py_peak_kb is not None:
+                args["py_peak_kb"] = round(span.py_peak_kb, 1)
+            events.append({
+                "name": span.name,
+                "cat": "stage" if span.is_stage else "span",
+                "ph": "X",
+                "ts": round(span.start * 1e6, 3),
+                "dur": round(span.wall_s * 1e6, 3),
+                "pid": self._pid,
+                "tid": span.tid,
+                "args": args,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome_trace(self, path: str) -> None:
+        self.close()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def breakdown(self, max_depth: int = 3) -> List[dict]:
+        """
+        按层级汇总已经结束的 span，同一父节点下同名的合并（比如每张图一个 figure span）。
+        返回 [{"depth", "name", "count", "wall_s", "cpu_s", "py_peak_kb"}]，父节点在前、子节点紧跟其后。
+        """
+        rows: Dict[tuple, dict] = {}
+        children: Dict[Optional[tuple], List[tuple]] = {None: []}
+        row_of_span: Dict[int, tuple] = {}
+        for idx, span in enumerate(self.spans):
+            if not span.closed or span.depth > max_depth:
+                continue
+            # 父节点用“父 span 所在的汇总行”标识，合并后的同名兄弟的子节点也合在一起
+            parent_row = row_of_span.get(span.parent) if span.parent is not None else None
+            key = (parent_row, span.name)
+            row = rows.get(key)
+            if row is None:
+                row = rows[key] = {
+                    "depth": span.depth, "name": span.name, "count": 0,
+                    "wall_s": 0.0, "cpu_s": 0.0, "py_peak_kb": None,
+                }
+                children.setdefault(parent_row, []).append(key)
+            row["count"] += 1
+            row["wall_s"] += span.wall_s
+            row["cpu_s"] += span.cpu_s
+            if span.py_peak_kb is not None:
+                row["py_peak_kb"] = max(row["py_peak_kb"] or 0.0, span.py_peak_kb)
+            row_of_span[idx] = key
+
+        ordered: List[dict] = []
+
+        def _walk(parent: Optional[tuple]) -> None:
+            for key in children.get(parent, ()):
+                ordered.append(rows[key])
+                _walk(key)
+
+        _walk(None)
+        return ordered
+
+    def format_breakdown(self, max_depth: int = 3) -> List[str]:
+        lines = []
+        for row in self.breakdown(max_depth):
+            name = "  " * row["depth"] + row["name"]
+            if row["count"] > 1:
+                name += f" ×{row['count']}"
+            line = f"{name:<34} {row['wall_s'] * 1000:9.1f} ms  cpu {row['cpu_s'] * 1000:9.1f} ms"
+            if row["py_peak_kb"] is not None:
+                line += f"  py peak {row['py_peak_kb'] / 1024:7.1f} MB"
+            lines.append(line)
+        peak = _peak_rss_mb()
+        if lines and peak is not None:
+            lines.append(f"peak RSS {peak:.1f} MB")
+        return lines
+
+
+def span(profiler: Optional[Profiler], name: str, **args):
+    """profiler 为 None 时什么都不做，调用处不用到处判断。"""
+    if profiler is None:
+        return nullcontext()
+    return profiler.span(name, **args)
+
+
+def trace_path_for(output_path: str) -> str:
+    """报告对应的 trace 文件：out/R-001.docx -> out/R-001.trace.json"""
+    return os.path.splitext(output_path)[0] + ".trace.json"
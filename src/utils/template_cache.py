@@ -0,0 +1,97 @@
+# src/utils/template_cache.py
+import os
+import threading
+from collections import OrderedDict
+from copy import deepcopy
+from typing import TYPE_CHECKING, Dict, Tuple
+
+if TYPE_CHECKING:
+    from docx.document import Document
+
+# python-docx / lxml 都在第一次 load / clone 时才导入：
+# ReportService 在 GUI 启动时就会建 TemplateCache，这里不能把 docx 拉进启动路径。
+
+
+def clone_document(doc: "Document") -> "Document":
+    """
+    在内存里复制一份已解析的 docx：
+    - XML part 用 lxml deepcopy（比重新解压 + 解析 XML 快得多），styles part 直接共享
+    - 二进制 part（图片、主题、缩略图…）的 blob 是 bytes，直接复用
+    - 关系（rels）按原 rId 重新连到新 part 上
+    """
+    from docx.opc.part import XmlPart
+    from docx.package import Package
+    from docx.parts.styles import StylesPart
+
+    # 克隆时直接共享、不复制的 XML part。
+    # 填模板只会读 styles（para.style = ... 只写段落自己的 pStyle），从不往里加样式；
+    # 它又往往是模板里最大的 XML（几百 KB），共享它是克隆便宜的关键。
+    shared_part_types = (StylesPart,)
+
+    src_pkg = doc.part.package
+    pkg = Package()
+
+    new_parts: Dict[int, object] = {}
+    for part in src_pkg.iter_parts():
+        if isinstance(part, shared_part_types):
+            new = type(part)(part.partname, part.content_type, part.element, pkg)
+        elif isinstance(part, XmlPart):
+            new = type(part)(part.partname, part.content_type, deepcopy(part.element), pkg)
+        else:
+            new = type(part).load(part.partname, part.content_type, part.blob, pkg)
+        new_parts[id(part)] = new
+
+    def _copy_rels(src_rels, dst_rels) -> None:
+        for r_id, rel in src_rels.items():
+            target = rel.target_ref if rel.is_external else new_parts[id(rel.target_part)]
+            dst_rels.add_relationship(rel.reltype, target, r_id, rel.is_external)
+
+    _copy_rels(src_pkg.rels, pkg.rels)
+    for part in src_pkg.iter_parts():
+        _copy_rels(part.rels, new_parts[id(part)].rels)
+
+    return pkg.main_document_part.document
+
+
+class TemplateCache:
+    """
+    已解析模板的内存缓存：key = (绝对路径, mtime, 文件大小)，模板文件改了自动重新加载。
+    加载时做一次“编译”：被 Word 拆开的占位符 run 先合并好（normalize_split_placeholders）。
+    load() 每次返回一份独立的克隆，缓存里的那份永远不会被填充代码改到。
+    一个 GUI 会话 / 一个批量 worker 进程里，同一个模板只解析一次。
+    """
+
+    def __init__(self, max_entries: int = 4):
+        self.max_entries = max_entries
+        self._docs: "OrderedDict[Tuple[str, int, int], Document]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, template_path: str) -> Tuple[str, int, int]:
+        st = os.stat(template_path)
+        return os.path.abspath(template_path), st.st_mtime_ns, st.st_size
+
+    def load(self, template_path: str) -> "Document":
+        from docx import Document
+
+        from src.utils.template_index import normalize_split_placeholders
+
+        key = self._key(template_path)
+        with self._lock:
+            master = self._docs.get(key)
+            if master is not None:
+                self._docs.move_to_end(key)
+        if master is None:
+            master = Document(template_path)
+            normalize_split_placeholders(master)
+            with self._lock:
+                # 同一路径的旧版本（mtime 变了）直接丢掉
+                for old in [k for k in self._docs if k[0] == key[0]]:
+                    del self._docs[old]
+                self._docs[key] = master
+                while len(self._docs) > self.max_entries:
+                    self._docs.popitem(last=False)
+        return clone_document(master)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._docs.clear()
@@ -0,0 +1,212 @@
+# src/utils/template_index.py
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from docx import Document
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+# 模板里的占位符：{{Request_id}}、{{SEG_VALUE}}、{{Temp.Calib}} ...
+PLACEHOLDER_RE = re.compile(r"\{\{[^{}]+\}\}")
+
+_W_P = qn("w:p")
+_W_R = qn("w:r")
+_W_T = qn("w:t")
+_W_TR = qn("w:tr")
+_W_TBL = qn("w:tbl")
+
+
+@dataclass
+class PlaceholderLocation:
+    """一个占位符在模板里的位置。"""
+    token: str                          # 带花括号的占位符，如 "{{Request_id}}"
+    paragraph: Paragraph
+    story: str                          # "body" / "header" / "footer"
+    table: Optional[Table] = None       # 所在（最内层）表格；不在表格里为 None
+    row_idx: Optional[int] = None       # 在 table 里的行号
+    runs: Tuple[int, int] = (-1, -1)    # 占位符覆盖的 run 下标 [first, last]；找不到为 (-1, -1)
+
+    @property
+    def split(self) -> bool:
+        """占位符被 Word 拆到了多个 run 里。"""
+        return self.runs[0] != self.runs[1]
+
+
+def _run_spans(run_texts: List[str], matches) -> List[Tuple[int, int]]:
+    """按 run 文本的累计偏移，算出每个匹配落在哪几个 run 上（matches 按位置升序）。"""
+    ends = []
+    offset = 0
+    for text in run_texts:
+        offset += len(text)
+        ends.append(offset)
+
+    spans = []
+    i = 0
+    for m in matches:
+        while i < len(ends) and ends[i] <= m.start():
+            i += 1
+        j = i
+        while j < len(ends) and ends[j] < m.end():
+            j += 1
+        spans.append((i, j) if j < len(ends) else (-1, -1))
+    return spans
+
+
+class TemplateIndex:
+    """
+    模板里所有 {{...}} 占位符的位置表，由 build_template_index 一次遍历建好。
+    各个填充步骤直接按占位符取目标段落 / 表格 / 行，不用再各自扫描整篇文档。
+
+    注意：索引记录的是建索引那一刻的元素；克隆出来的新行不在索引里，
+    被整段替换掉的段落（如 {{Discussion}}）也不会从索引里删除。
+    """
+
+    def __init__(self, locations: List[PlaceholderLocation]):
+        self.locations = locations
+        self._by_token: Dict[str, List[PlaceholderLocation]] = {}
+        for loc in locations:
+            self._by_token.setdefault(loc.token, []).append(loc)
+
+    def tokens(self) -> List[str]:
+        return list(self._by_token)
+
+    def find(self, token: str) -> List[PlaceholderLocation]:
+        return self._by_token.get(token, [])
+
+    def first(self, token: str) -> Optional[PlaceholderLocation]:
+        hits = self._by_token.get(token)
+        return hits[0] if hits else None
+
+    def table_with_any(self, tokens: Iterable[str]) -> Optional[Table]:
+        """第一个包含 tokens 中任意一个占位符的表格（按文档顺序）。"""
+        wanted = set(tokens)
+        for loc in self.locations:
+            if loc.token in wanted and loc.table is not None:
+                return loc.table
+        return None
+
+    def paragraphs_for(self, tokens: Iterable[str]) -> List[Paragraph]:
+        """包含 tokens 中任意占位符的段落，按文档顺序、去重。"""
+        wanted = set(tokens)
+        seen = set()
+        result: List[Paragraph] = []
+        for loc in self.locations:
+            if loc.token not in wanted:
+                continue
+            key = id(loc.paragraph._p)
+            if key in seen:
+                continue
+            seen.add(key)
+            result.append(loc.paragraph)
+        return result
+
+
+def _index_story(root, parent, story: str, out: List[PlaceholderLocation]) -> None:
+    # iter 是深度优先的文档顺序，嵌套表格里的段落也会被遍历到
+    for p_el in root.iter(_W_P):
+        text = "".join(t.text or "" for t in p_el.iter(_W_T))
+        if "{{" not in text:
+            continue
+        matches = list(PLACEHOLDER_RE.finditer(text))
+        if not matches:
+            continue
+
+        # run 下标只对“段落文字全部来自直接子 run”的情况有意义（超链接等里面的 run 不算）
+        run_texts = ["".join(t.text or "" for t in r.iter(_W_T)) for r in p_el.iterchildren(_W_R)]
+        if "".join(run_texts) == text:
+            spans = _run_spans(run_texts, matches)
+        else:
+            spans = [(-1, -1)] * len(matches)
+
+        table = row_idx = None
+        tr = next(p_el.iterancestors(_W_TR), None)
+        if tr is not None:
+            tbl = next(tr.iterancestors(_W_TBL))
+            table = Table(tbl, parent)
+            row_idx = list(tbl.iterchildren(_W_TR)).index(tr)
+
+        paragraph = Paragraph(p_el, parent)
+        for m, span in zip(matches, spans):
+            out.append(
+                PlaceholderLocation(
+                    token=m.group(0),
+                    paragraph=paragraph,
+                    story=story,
+                    table=table,
+                    row_idx=row_idx,
+                    runs=span,
+                )
+            )
+
+
+def build_template_index(doc: Document) -> TemplateIndex:
+    """
+    一次遍历正文 + 各节 header / footer，记录所有占位符的位置。
+    只看有自己定义的 header / footer（is_linked_to_previous 为 False），
+    不会像直接访问 section.header.paragraphs 那样顺手给文档加空 header。
+    """
+    locations: List[PlaceholderLocation] = []
+    _index_story(doc.element.body, doc._body, "body", locations)
+
+    for section in doc.sections:
+        for story, parts in (
+            ("header", (section.header, section.first_page_header, section.even_page_header)),
+            ("footer", (section.footer, section.first_page_footer, section.even_page_footer)),
+        ):
+            for hf in parts:
+                if hf.is_linked_to_previous:
+                    continue
+                _index_story(hf._element, hf, story, locations)
+
+    return TemplateIndex(locations)
+
+
+def merge_split_placeholders(paragraph: Paragraph) -> int:
+    """
+    把一个段落里被拆到多个直接子 run 的占位符合并回它的第一个 run，返回合并的个数。
+    - 只移动占位符本身的字符：第一个 run 之前的文字、最后一个 run 之后的文字和各自格式都不动
+    - 中间被掏空的 run 留成空 run（不删元素，避免影响同段其它占位符的 run 下标）
+    """
+    # 这里按 Run.text（含 tab / 换行）算跨度，写回时用的也是 Run.text
+    runs = [Run(r, paragraph) for r in paragraph._p.iterchildren(_W_R)]
+    texts = [r.text for r in runs]
+    matches = list(PLACEHOLDER_RE.finditer("".join(texts)))
+    spans = _run_spans(texts, matches)
+    starts = []
+    offset = 0
+    for t in texts:
+        starts.append(offset)
+        offset += len(t)
+
+    merged = 0
+    # 从后往前：后面的合并不会改变前面占位符所在 run 的偏移
+    for m, (first, last) in zip(reversed(matches), reversed(spans)):
+        if first < 0 or first == last:
+            continue
+        local_end = m.end() - starts[last]
+        texts[first] += "".join(texts[first + 1: last]) + texts[last][:local_end]
+        for k in range(first + 1, last):
+            texts[k] = ""
+        texts[last] = texts[last][local_end:]
+        merged += 1
+
+    for run, text in zip(runs, texts):
+        if run.text != text:
+            run.text = text
+    return merged
+
+
+def normalize_split_placeholders(doc: Document) -> int:
+    """
+    模板编译步骤：把被 Word 拆到多个 run 里的占位符合并回它的第一个 run，返回合并的个数。
+    合并规则见 merge_split_placeholders；合并后每次填充都走 run 内替换的快路径。
+    """
+    paragraphs: Dict[int, Paragraph] = {}
+    for loc in build_template_index(doc).locations:
+        if loc.runs[0] >= 0 and loc.split:
+            paragraphs.setdefault(id(loc.paragraph._p), loc.paragraph)
+
+    return sum(merge_split_placeholders(p) for p in paragraphs.values())
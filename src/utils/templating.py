@@ -1,66 +1,140 @@
+import io
 import os
-import tempfile
-from typing import Dict, List, Optional
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 from copy import deepcopy
 
 from docx import Document
 from docx.shared import Inches
+from src.config.config import REPORT_STAGES   # progress 回调收到的阶段名（老代码从这里导入）
 from src.models.models import DscSegment, SampleItem
 from docx.enum.table import WD_ALIGN_VERTICAL
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.table import _Cell, _Row
 from docx.text.paragraph import Paragraph
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.image.image import Image as DocxImage
+from docx.opc.part import Part
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+from docx.oxml.shape import CT_Inline
+from lxml import etree
+
+from src.utils.docx_stream import StreamingDocxWriter
+from src.utils.figure_cache import FigureCache, FigureOptions, render_pdf_figure
+from src.utils.profiling import Profiler, span
+from src.utils.template_cache import TemplateCache
+from src.utils.template_index import (
+    PlaceholderLocation,
+    TemplateIndex,
+    build_template_index,
+    merge_split_placeholders,
+)
+
+# 样品信息(SAMPLES)表模板行里的占位符，每个样品一行
+SAMPLE_ROW_TOKENS = ("{{Sample_id}}", "{{Sample_name}}", "{{Nature}}", "{{Assign_to}}")
+
+
+@lru_cache(maxsize=64)
+def _key_pattern(keys: Tuple[str, ...]) -> "re.Pattern[str]":
+    """所有 key 编成一个正则（长的在前，避免短 key 抢先匹配到长 key 的前缀）。"""
+    ordered = sorted(keys, key=len, reverse=True)
+    return re.compile("|".join(re.escape(k) for k in ordered))
+
+
+def _replace_in_paragraph(p: Paragraph, mapping: Dict[str, str], pattern) -> None:
+    """
+    单段替换：一次扫描找出段落里所有占位符，再一次性改写受影响的 run。
+    - 占位符在单个 run 内：只改这个 run 的文字，格式不变
+    - 占位符被 Word 拆到多个 run：替换值写进第一个 run，后面几个 run 只删掉占位符那部分，
+      各 run 其余文字和格式都保留
+    """
+    runs = p.runs
+    run_texts = [r.text for r in runs]
+    full = "".join(run_texts)
+
+    matches = list(pattern.finditer(full))
+    if not matches:
+        # 占位符在超链接等非直接 run 里：沿用旧的兜底，整段文字放进第一个 run
+        text = p.text
+        if runs and pattern.search(text):
+            runs[0].text = pattern.sub(lambda m: mapping[m.group(0)], text)
+            for r in runs[1:]:
+                r.text = ""
+        return
 
+    # 每个 run 在整段文字里的起始偏移
+    starts = []
+    offset = 0
+    for t in run_texts:
+        starts.append(offset)
+        offset += len(t)
+
+    new_texts = list(run_texts)
+    # 从后往前改：后面的替换不会影响前面占位符在各自 run 里的偏移
+    for m in reversed(matches):
+        value = mapping[m.group(0)]
+        # bisect_right：起点相同的空 run 会被跳过，落在真正含这个字符的 run 上
+        i = bisect_right(starts, m.start()) - 1
+        j = bisect_right(starts, m.end() - 1) - 1
+        local_start = m.start() - starts[i]
+        local_end = m.end() - starts[j]
+        if i == j:
+            t = new_texts[i]
+            new_texts[i] = t[:local_start] + value + t[local_end:]
+        else:
+            new_texts[i] = new_texts[i][:local_start] + value
+            for k in range(i + 1, j):
+                new_texts[k] = ""
+            new_texts[j] = new_texts[j][local_end:]
 
-import fitz
+    for run, old, new in zip(runs, run_texts, new_texts):
+        if new != old:
+            run.text = new
 
 
 def _replace_in_paragraphs(paragraphs, mapping: Dict[str, str]) -> None:
     """
     在给定的段落列表中做占位符替换。
-    优先在 run 内替换（保持格式）；
-    如果占位符被拆成多个 run，则用整段文本替换作为兜底。
+    所有 key 合成一个正则，每段只扫描一次（不再是 key 数 × 段落数 × run 数）；
+    run 级别替换，保持格式，见 _replace_in_paragraph。
     """
+    if not mapping:
+        return
+    pattern = _key_pattern(tuple(mapping))
     for p in paragraphs:
-        if not p.text:
+        # 先用 XML 里的纯文本快速过滤，绝大多数段落没有占位符
+        if "{{" not in "".join(p._p.itertext()):
             continue
-
-        # 先尝试 run 级别替换
-        for key, value in mapping.items():
-            if key not in p.text:
-                continue
-
-            replaced_in_run = False
-            for run in p.runs:
-                if key in run.text:
-                    run.text = run.text.replace(key, value)
-                    replaced_in_run = True
-
-            # 如果 run 里完全找不到 key，但整段里有，说明被拆成多个 run 了
-            if not replaced_in_run:
-                full_text = p.text.replace(key, value)
-                # 尽量保留段落样式，用第一个 run 承载全部文本，其它 run 清空
-                if p.runs:
-                    p.runs[0].text = full_text
-                    for r in p.runs[1:]:
-                        r.text = ""
+        _replace_in_paragraph(p, mapping, pattern)
 
 
 def _replace_in_tables(tables, mapping: Dict[str, str]) -> None:
     """
     在给定的表格列表中做占位符替换。
-    不直接改 cell.text，而是对 cell.paragraphs 调用 _replace_in_paragraphs，
-    这样可以最大程度保持单元格内已有格式。
+    直接遍历表格 XML 里的段落（含嵌套表格），不经过 row.cells：
+    合并单元格不会被重复处理，也省掉了每行重新计算网格的开销。
     """
     for table in tables:
-        for row in table.rows:
-            for cell in row.cells:
-                _replace_in_paragraphs(cell.paragraphs, mapping)
+        paragraphs = [Paragraph(p_el, table._parent) for p_el in table._tbl.iter(qn("w:p"))]
+        _replace_in_paragraphs(paragraphs, mapping)
 
 
-def replace_placeholders_everywhere(doc: Document, mapping: Dict[str, str]) -> None:
+def replace_placeholders_everywhere(
+    doc: Document,
+    mapping: Dict[str, str],
+    index: Optional[TemplateIndex] = None,
+) -> None:
     """
     在整个文档（正文 + 各节的 header/footer）中替换占位符。
+    传入 index 时只处理索引里含 mapping key 的段落，不再遍历全文。
     """
+    if index is not None:
+        _replace_in_paragraphs(index.paragraphs_for(mapping), mapping)
+        return
+
     # 1. 正文
     _replace_in_paragraphs(doc.paragraphs, mapping)
     _replace_in_tables(doc.tables, mapping)
@@ -90,13 +164,18 @@ def _bold_cycle_titles(doc: Document) -> None:
 
 
 
-def _fill_discussion_paragraph(doc: Document, text: str) -> List[Paragraph]:
+def _fill_discussion_paragraph(
+    doc: Document,
+    text: str,
+    anchor: Optional[Paragraph] = None,
+) -> List[Paragraph]:
     """
     找到包含 {{Discussion}} 的段落，把它替换成多行普通段落：
     - 每一行 text.splitlines() -> 一个 Paragraph（Word 里是 ¶）；
     - 段落 style 继承原段落；
     - 字体从原段落第一个 run 继承（尽量保持 Times New Roman 等）；
     - cycle 标题加粗。
+    anchor: 已知的 {{Discussion}} 段落（来自模板索引）；不传则扫描正文查找。
     返回新插入的所有 Paragraph 列表。
     """
     marker = "{{Discussion}}"
@@ -104,7 +183,8 @@ def _fill_discussion_paragraph(doc: Document, text: str) -> List[Paragraph]:
     if not lines:
         return []
 
-    for para in doc.paragraphs:
+    candidates = [anchor] if anchor is not None else doc.paragraphs
+    for para in candidates:
         if marker in para.text:
             base_style = para.style
 
@@ -153,41 +233,93 @@ def _fill_discussion_paragraph(doc: Document, text: str) -> List[Paragraph]:
     return []
 
 
-def _insert_dsc_figure_after_discussion(
-    doc: Document,
-    pdf_path: str,          # 现在既可以是 pdf，也可以是 png/jpg
-    figure_number: str,
-    sample_name: str,
-    discussion_paras: Optional[List[Paragraph]] = None,
-) -> Optional[Paragraph]:
+# Word 2016+ 的 SVG 图片扩展：a:blip 仍指向位图（旧版 Word 显示它），extLst 里再挂一份 SVG
+_SVG_BLIP_EXT_URI = "{96DAC541-7B7A-43D3-8B79-37D633B846F1}"
+_ASVG_NS = "http://schemas.microsoft.com/office/drawing/2016/SVG/main"
+
+
+def _attach_svg(doc: Document, inline_shape, svg_bytes: bytes) -> None:
+    """python-docx 不支持直接插 SVG，这里手动加 SVG part 并挂到图片的 a:blip 上。"""
+    package = doc.part.package
+    svg_part = Part(
+        package.next_partname("/word/media/image%d.svg"),
+        "image/svg+xml",
+        svg_bytes,
+        package,
+    )
+    r_id = doc.part.relate_to(svg_part, RT.IMAGE)
+    _add_svg_blip(inline_shape._inline, r_id)
+
+
+def _add_svg_blip(inline, r_id: str) -> None:
+    """在 wp:inline 的 a:blip 上挂 asvg:svgBlip 扩展，指向 r_id 对应的 SVG。"""
+    blip = inline.xpath(".//a:blip")[0]
+    ext_lst = blip.find(qn("a:extLst"))
+    if ext_lst is None:
+        ext_lst = etree.SubElement(blip, qn("a:extLst"))
+    ext = etree.SubElement(ext_lst, qn("a:ext"))
+    ext.set("uri", _SVG_BLIP_EXT_URI)
+    svg_blip = etree.SubElement(ext, f"{{{_ASVG_NS}}}svgBlip", nsmap={"asvg": _ASVG_NS})
+    svg_blip.set(qn("r:embed"), r_id)
+
+
+def _load_figure(
+    pdf_path: str,
+    figure_cache: Optional[FigureCache],
+    figure_options: FigureOptions,
+):
     """
-    在 Discussion 段落后面插入 DSC 曲线图 + 图注。
-    返回插入的图注段落，用于后续继续在其后插入下一张图。
+    曲线图来源 -> (python-docx 能直接插的图片：路径或 BytesIO, SVG 字节或 None)。
+    文件不存在 / 渲染失败 / 类型不支持时打印原因并返回 None。
     """
     if not os.path.exists(pdf_path):
         print(f"[figure] 文件不存在: {pdf_path}")
         return None
 
     ext = os.path.splitext(pdf_path)[1].lower()
-    image_path = None
-
     if ext in (".png", ".jpg", ".jpeg"):
-        image_path = pdf_path
-    elif ext == ".pdf":
+        return pdf_path, None
+    if ext == ".pdf":
         try:
-            doc_pdf = fitz.open(pdf_path)
-            page = doc_pdf.load_page(0)
-            pix = page.get_pixmap(dpi=250)
-            tmp_dir = tempfile.gettempdir()
-            image_path = os.path.join(tmp_dir, "dsc_curve_tmp.png")
-            pix.save(image_path)
-            doc_pdf.close()
+            if figure_cache is not None:
+                figure = figure_cache.get_or_render(pdf_path, figure_options)
+            else:
+                figure = render_pdf_figure(pdf_path, figure_options)
         except Exception as e:
             print(f"[figure] 渲染 PDF 出错: {e}")
             return None
-    else:
-        print(f"[figure] 不支持的文件类型: {pdf_path}")
+        return io.BytesIO(figure.image), figure.svg
+
+    print(f"[figure] 不支持的文件类型: {pdf_path}")
+    return None
+
+
+def _figure_max_width(doc: Document) -> int:
+    """图片宽度：正文可用宽度的 90%。"""
+    section = doc.sections[0]
+    max_width = section.page_width - section.left_margin - section.right_margin
+    return int(max_width * 0.9)
+
+
+def _insert_dsc_figure_after_discussion(
+    doc: Document,
+    pdf_path: str,          # 现在既可以是 pdf，也可以是 png/jpg
+    figure_number: str,
+    sample_name: str,
+    discussion_paras: Optional[List[Paragraph]] = None,
+    figure_cache: Optional[FigureCache] = None,
+    figure_options: FigureOptions = FigureOptions(),
+) -> Optional[Paragraph]:
+    """
+    在 Discussion 段落后面插入 DSC 曲线图 + 图注。
+    返回插入的图注段落，用于后续继续在其后插入下一张图。
+    PDF 渲染出的图片字节直接以 BytesIO 交给 python-docx，不落临时文件；
+    有 figure_cache 时优先从缓存取（key 含 PDF 指纹和 figure_options）。
+    """
+    loaded = _load_figure(pdf_path, figure_cache, figure_options)
+    if loaded is None:
         return None
+    image_source, svg_bytes = loaded
 
     # 锚点：有 discussion_paras 就接在最后一段后，否则接在整个文档最后
     if discussion_paras:
@@ -198,15 +330,15 @@ def _insert_dsc_figure_after_discussion(
     parent = last_para._p.getparent()
     idx = parent.index(last_para._p) + 1
 
-    section = doc.sections[0]
-    max_width = section.page_width - section.left_margin - section.right_margin
-    max_width = int(max_width * 0.9)
+    max_width = _figure_max_width(doc)
 
     # 图片段落
     fig_para = doc.add_paragraph()
     fig_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
     run = fig_para.add_run()
-    run.add_picture(image_path, width=max_width)
+    inline_shape = run.add_picture(image_source, width=max_width)
+    if svg_bytes is not None:
+        _attach_svg(doc, inline_shape, svg_bytes)
     parent.insert(idx, fig_para._p)
     idx += 1
 
@@ -240,9 +372,6 @@ def _fill_samples_table(table, samples: List[SampleItem]):
         # 没有找到样品行，占位符可能没放在这个表里
         return
 
-    # ❶ 先备份“原始模板行”的 XML（此时里面还是占位符，格式完整）
-    tpl_tr_template = deepcopy(template_row._tr)
-
     def _fill_one_row(row, sample: SampleItem):
         mf = sample.manual_fields
         af = sample.auto_fields
@@ -258,19 +387,26 @@ def _fill_samples_table(table, samples: List[SampleItem]):
         for cell in row.cells:
             _replace_in_paragraphs(cell.paragraphs, row_mapping)
 
-    # ❷ 遍历所有样品：
-    #    - 第一个样品：直接用模板行
-    #    - 之后的样品：克隆模板行，再填数据
-    for idx, sample in enumerate(samples):
-        if idx == 0:
-            row = template_row
-        else:
-            new_tr = deepcopy(tpl_tr_template)
-            table._tbl.append(new_tr)
-            row = table.rows[-1]
-
+    # 第一个样品用模板行本身，之后的样品用模板行的克隆，一次性插到模板行后面
+    for row, sample in zip(_build_rows_from_template(table, template_row._tr, len(samples)), samples):
         _fill_one_row(row, sample)
 
+
+def _build_rows_from_template(table, tpl_tr, count: int) -> List[_Row]:
+    """
+    以 tpl_tr 为模板准备 count 行：第一行就是 tpl_tr 本身，其余是它（填充前）的克隆。
+    - 克隆行在 lxml 层一次性插到模板行后面，不经过 table.rows
+      （table.rows[-1] 每次都要重建整张表的行列表，逐行 append 再取会变成 O(n²)）
+    - 返回的 _Row 直接包着各自的 <w:tr>，填充时不用再按下标回表里找
+    """
+    clones = [deepcopy(tpl_tr) for _ in range(count - 1)]
+    if clones:
+        parent = tpl_tr.getparent()
+        pos = parent.index(tpl_tr) + 1
+        parent[pos:pos] = clones
+    return [_Row(tr, table) for tr in [tpl_tr] + clones]
+
+
 def fill_template_with_mapping(
     template_path: str,
     output_path: str,
@@ -281,8 +417,39 @@ def fill_template_with_mapping(
     pdf_path: Optional[str] = None,
     figure_number: str = "1",
     samples: Optional[List[SampleItem]] = None,
-) -> None:
-    doc = Document(template_path)
+    progress: Optional[Callable[[str], None]] = None,
+    figure_cache: Optional[FigureCache] = None,
+    figure_options: FigureOptions = FigureOptions(),
+    template_cache: Optional[TemplateCache] = None,
+    stream: bool = False,
+    profiler: Optional[Profiler] = None,
+) -> int:
+    """
+    progress: 每个阶段开始前调用一次 progress(stage)，stage 见 REPORT_STAGES。
+    回调里抛异常即可中断生成（此时还没 save，不会留下半个文件）。
+    figure_cache: 传入时 PDF 曲线图的渲染结果走磁盘缓存。
+    figure_options: 曲线图的模式（raster / vector / target-size）、dpi、格式、裁剪框。
+    template_cache: 传入时模板只解析一次，之后每份报告从内存克隆。
+    stream: 流式写出（大批样品用）。Result and Discussion 的数据行和曲线图不进文档对象树，
+      save 阶段由 StreamingDocxWriter 逐行 / 逐张写进 zip（图片渲染也推迟到 save 阶段）。
+    profiler: 传入时按阶段记录耗时（load_template + REPORT_STAGES，表格 / 每张图另有子 span）。
+    返回生成的 docx 文件大小（字节）。
+    """
+    def _stage(name: str) -> None:
+        if progress is not None:
+            progress(name)
+        if profiler is not None:
+            profiler.stage(name)
+
+    if profiler is not None:
+        profiler.stage("load_template")
+    if template_cache is not None:
+        doc = template_cache.load(template_path)
+    else:
+        doc = Document(template_path)
+    # 一次遍历记下所有占位符的位置，后面各步骤直接按位置取目标
+    index = build_template_index(doc)
+    _stage("tables")
 
     # 1) 普通占位符（不含 {{Discussion}}）
     mapping_no_disc = {
@@ -291,49 +458,109 @@ def fill_template_with_mapping(
     }
 
     # ---------- A. 找出“样品信息(SAMPLES)”表 ----------
-    sample_table = None
-    if samples:
-        for table in doc.tables:
-            is_sample_table = False
-            for row in table.rows:
-                for cell in row.cells:
-                    text = cell.text
-                    if (
-                        "{{Sample_id}}" in text
-                        or "{{Sample_name}}" in text
-                        or "{{Nature}}" in text
-                        or "{{Assign_to}}" in text
-                    ):
-                        is_sample_table = True
-                        break
-                if is_sample_table:
-                    break
-            if is_sample_table:
-                sample_table = table
-                break
+    sample_table = index.table_with_any(SAMPLE_ROW_TOKENS) if samples else None
 
     # ---------- B. Result and Discussion 表格（多样品优先） ----------
-    if samples:
+    seg_location = index.first("{{SEG_VALUE}}")
+    seg_stream = None   # 流式：(table, 模板行 <w:tr>, 行数据)，save 阶段再展开
+    if stream:
+        if samples:
+            seg_rows = _build_segment_rows_for_samples(samples)
+        else:
+            seg_rows = _build_segment_rows(segments, sample_name_for_segments) if segments else []
+        if seg_location is not None:
+            seg_table, seg_row_idx = seg_location.table, seg_location.row_idx
+        else:
+            seg_table, seg_row_idx = _find_segment_template_row(doc)
+        if seg_rows and seg_table is not None:
+            seg_stream = (seg_table, seg_table._tbl.tr_lst[seg_row_idx], seg_rows)
+    elif samples:
         # 多样品：一次性把所有 samples 的 segments 写入 Result and Discussion 表
-        fill_segments_table_for_samples(doc, samples)
+        with span(profiler, "segments_table", samples=len(samples)):
+            fill_segments_table_for_samples(doc, samples, location=seg_location)
     elif segments:
         # 兼容旧逻辑：仅当前样品
-        fill_segments_table(doc, segments, sample_name_for_segments)
+        with span(profiler, "segments_table", samples=1):
+            fill_segments_table(doc, segments, sample_name_for_segments, location=seg_location)
 
     # ---------- C. 样品信息(SAMPLES) 表格：按样品数复制模板行 ----------
     if samples and sample_table is not None:
-        _fill_samples_table(sample_table, samples)
+        with span(profiler, "samples_table", samples=len(samples)):
+            _fill_samples_table(sample_table, samples)
 
-# ---------- D. Discussion 段落 ----------
+    # ---------- D. Discussion 段落 ----------
+    _stage("discussion")
     inserted_discussion_paras = None
-    if discussion_text:
-        inserted_discussion_paras = _fill_discussion_paragraph(doc, discussion_text)
+    disc_location = index.first("{{Discussion}}")
+    if discussion_text and disc_location is not None:
+        inserted_discussion_paras = _fill_discussion_paragraph(
+            doc, discussion_text, anchor=disc_location.paragraph
+        )
 
     # ---------- E. 在 Discussion 后插入图像和图注 ----------
-    # 多样品优先：对每个样品分别插图，自动编号
-    if samples:
-        anchor_paras = inserted_discussion_paras   # 当前插图的锚点
+    _stage("figures")
+    # (图片路径, 图注里的样品名)；编号在插图成功后才分配
+    figure_jobs = _collect_figure_jobs(samples, pdf_path, mapping_no_disc)
+    # 锚点：有 Discussion 段落就接在最后一段后，否则接在整个文档最后
+    figure_anchor = None
+    if figure_jobs:
+        figure_anchor = inserted_discussion_paras[-1] if inserted_discussion_paras else doc.paragraphs[-1]
+
+    # 多样品优先：对每个样品分别插图，自动编号；兼容旧逻辑：只有一个 pdf_path 时用 figure_number
+    if not stream:
+        anchor_paras = [figure_anchor]   # 当前插图的锚点
         fig_idx = 1
+        for job_path, job_name in figure_jobs:
+            with span(profiler, "figure", file=os.path.basename(job_path)):
+                cap_para = _insert_dsc_figure_after_discussion(
+                    doc,
+                    pdf_path=job_path,
+                    figure_number=str(fig_idx) if samples else figure_number,
+                    sample_name=job_name,
+                    discussion_paras=anchor_paras,
+                    figure_cache=figure_cache,
+                    figure_options=figure_options,
+                )
+            if cap_para is not None:
+                # 下一个 figure 接在这次图注后面
+                anchor_paras = [cap_para]
+                fig_idx += 1
+
+    # ---------- F. 最后再做一次全局占位符替换 ----------
+    _stage("placeholders")
+    replace_placeholders_everywhere(doc, mapping_no_disc, index=index)
+    # 克隆出来的行不在索引里：这两张表再整表过一遍（模板行里可能还有全局占位符）
+    dynamic_tables = [t for t in (sample_table, seg_location and seg_location.table) if t is not None]
+    _replace_in_tables(dynamic_tables, mapping_no_disc)
+
+    _stage("save")
+    if stream:
+        _save_streaming(
+            doc,
+            output_path,
+            seg_stream=seg_stream,
+            figure_jobs=figure_jobs,
+            figure_anchor=figure_anchor,
+            fixed_figure_number=None if samples else figure_number,
+            figure_cache=figure_cache,
+            figure_options=figure_options,
+            profiler=profiler,
+        )
+    else:
+        doc.save(output_path)
+    if profiler is not None:
+        profiler.end_stage()
+    return os.path.getsize(output_path)
+
+
+def _collect_figure_jobs(
+    samples: Optional[List[SampleItem]],
+    pdf_path: Optional[str],
+    mapping: Dict[str, str],
+) -> List[Tuple[str, str]]:
+    """要插的曲线图：[(图片 / PDF 路径, 图注里的样品名)]，文件不存在的跳过。"""
+    if samples:
+        jobs = []
         for s in samples:
             if not s.pdf_path or not os.path.exists(s.pdf_path):
                 continue
@@ -345,34 +572,90 @@ def fill_template_with_mapping(
                 or ""
             )
             if not sample_name_for_caption:
-                sample_name_for_caption = mapping_no_disc.get("{{Sample_name}}", "")
-
-            cap_para = _insert_dsc_figure_after_discussion(
-                doc,
-                pdf_path=s.pdf_path,
-                figure_number=str(fig_idx),
-                sample_name=sample_name_for_caption,
-                discussion_paras=anchor_paras,
-            )
-            if cap_para is not None:
-                # 下一个 figure 接在这次图注后面
-                anchor_paras = [cap_para]
-                fig_idx += 1
+                sample_name_for_caption = mapping.get("{{Sample_name}}", "")
+            jobs.append((s.pdf_path, sample_name_for_caption))
+        return jobs
 
-    # 兼容旧逻辑：只有一个 pdf_path、没有 samples 传进来时
-    elif pdf_path and os.path.exists(pdf_path):
-        sample_name = mapping_no_disc.get("{{Sample_name}}", "")
-        _insert_dsc_figure_after_discussion(
-            doc,
-            pdf_path=pdf_path,
-            figure_number=figure_number,
-            sample_name=sample_name,
-            discussion_paras=inserted_discussion_paras,
-        )
+    if pdf_path and os.path.exists(pdf_path):
+        return [(pdf_path, mapping.get("{{Sample_name}}", ""))]
+    return []
+
+
+def _figure_paragraphs(shape_id: int, r_id: str, svg_r_id: Optional[str], filename: str, cx, cy, caption: str):
+    """流式写出用：和 _insert_dsc_figure_after_discussion 一样的图片段落 + 图注段落（游离元素）。"""
+    fig_p = OxmlElement("w:p")
+    Paragraph(fig_p, None).alignment = WD_ALIGN_PARAGRAPH.CENTER
+    inline = CT_Inline.new_pic_inline(shape_id, r_id, filename, cx, cy)
+    if svg_r_id is not None:
+        _add_svg_blip(inline, svg_r_id)
+    fig_p.add_r().add_drawing(inline)
+
+    cap_p = OxmlElement("w:p")
+    cap_para = Paragraph(cap_p, None)
+    cap_para.add_run(caption)
+    cap_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+    return fig_p, cap_p
+
+
+def _save_streaming(
+    doc: Document,
+    output_path: str,
+    seg_stream,
+    figure_jobs: List[Tuple[str, str]],
+    figure_anchor: Optional[Paragraph],
+    fixed_figure_number: Optional[str],
+    figure_cache: Optional[FigureCache],
+    figure_options: FigureOptions,
+    profiler: Optional[Profiler] = None,
+) -> None:
+    """
+    stream=True 时的 save：
+    1) 逐张渲染曲线图，字节直接写进 zip（相同图片只写一次），只记下 rId / 尺寸 / 图注；
+       编号按成功插入的顺序从 1 开始，fixed_figure_number 给定时（旧的单图逻辑）用它
+    2) 流式写 document.xml：模板行的位置逐行展开数据行，锚点段落后面逐张展开图片 + 图注
+    出错时 StreamingDocxWriter 会删掉写了一半的文件。
+    """
+    with StreamingDocxWriter(doc, output_path) as writer:
+        expansions = {}
+
+        figures = []    # (r_id, svg_r_id, filename, cx, cy, caption)
+        media_by_sha1: Dict[str, str] = {}
+        max_width = _figure_max_width(doc)
+        for job_path, job_name in figure_jobs:
+            with span(profiler, "figure", file=os.path.basename(job_path)):
+                loaded = _load_figure(job_path, figure_cache, figure_options)
+            if loaded is None:
+                continue
+            image_source, svg_bytes = loaded
+            image = DocxImage.from_file(image_source)
+            r_id = media_by_sha1.get(image.sha1)
+            if r_id is None:
+                r_id = writer.add_media(image.blob, image.ext)
+                media_by_sha1[image.sha1] = r_id
+            svg_r_id = writer.add_media(svg_bytes, "svg") if svg_bytes is not None else None
+            cx, cy = image.scaled_dimensions(max_width, None)
+            number = fixed_figure_number or str(len(figures) + 1)
+            caption = f"Figure {number}. DSC test curve of {job_name}"
+            # 图片字节已经在 zip 里了，这里只留元数据
+            figures.append((r_id, svg_r_id, image.filename, cx, cy, caption))
+
+        if figures:
+            next_id = doc.part.next_id
+
+            def _iter_figures():
+                for i, (r_id, svg_r_id, filename, cx, cy, caption) in enumerate(figures):
+                    yield from _figure_paragraphs(next_id + i, r_id, svg_r_id, filename, cx, cy, caption)
+
+            expansions[writer.insert_after(figure_anchor._p)] = _iter_figures()
+
+        if seg_stream is not None:
+            table, tpl_tr, rows_data = seg_stream
+            key = writer.replace(tpl_tr)
+            expansions[key] = _iter_segment_rows(table, tpl_tr, rows_data)
+
+        with span(profiler, "write_document"):
+            writer.write_document(expansions)
 
-    # ---------- F. 最后再做一次全局占位符替换 ----------
-    replace_placeholders_everywhere(doc, mapping_no_disc)
-    doc.save(output_path)
 
 
 def _build_segment_rows(segments: List[DscSegment], sample_name: str) -> List[Dict[str, str]]:
@@ -436,98 +719,99 @@ def _find_segment_template_row(doc: Document):
     return None, None
 
 
-def _fill_row_with_data(row, data: Dict[str, str]) -> None:
-    """用 SEG_* 数据填充某一行。"""
-    replacements = {
-        "{{SEG_SAMPLE}}": data.get("SEG_SAMPLE", ""),
-        "{{SEG_METHOD}}": data.get("SEG_METHOD", ""),
-        "{{SEG_VALUE}}": data.get("SEG_VALUE", ""),
-        "{{SEG_ONSET}}": data.get("SEG_ONSET", ""),
-        "{{SEG_PEAK}}": data.get("SEG_PEAK", ""),
-        "{{SEG_AREA}}": data.get("SEG_AREA", ""),
-        "{{SEG_COMMENT}}": data.get("SEG_COMMENT", ""),
-    }
-    for cell in row.cells:
-        text = cell.text
-        for k, v in replacements.items():
-            text = text.replace(k, v)
-        cell.text = text
+# Result and Discussion 表模板行里的占位符 -> 行数据的 key
+SEG_ROW_TOKENS = {
+    "{{SEG_SAMPLE}}": "SEG_SAMPLE",
+    "{{SEG_METHOD}}": "SEG_METHOD",
+    "{{SEG_VALUE}}": "SEG_VALUE",
+    "{{SEG_ONSET}}": "SEG_ONSET",
+    "{{SEG_PEAK}}": "SEG_PEAK",
+    "{{SEG_AREA}}": "SEG_AREA",
+    "{{SEG_COMMENT}}": "SEG_COMMENT",
+}
+_SEG_TOKEN_SPLIT_RE = re.compile("(" + "|".join(re.escape(k) for k in SEG_ROW_TOKENS) + ")")
+
+_W_T = qn("w:t")
+_XML_SPACE = qn("xml:space")
 
+# 模板行编译结果：[(第几个 <w:t>, 文字片段)]，片段里 SEG_* key 的位置填行数据，其余原样
+RowSlots = List[Tuple[int, List[str]]]
 
-def _merge_down_same_text(table, start_row: int, end_row: int, col_idx: int) -> None:
+
+def _compile_segment_row(tpl_tr) -> Optional[RowSlots]:
     """
-    在 table 的第 col_idx 列，从 start_row 到 end_row（含）之间，
-    把“连续文本相同”的单元格纵向合并。
-    合并后只保留一份文本（放在合并后的单元格里）。
+    每个模板（每次填表）只做一次：先把模板行里被拆开的占位符合并回一个 run，
+    再记下含 {{SEG_*}} 的 <w:t> 是行里的第几个文本节点、节点文字怎么拆成“原文 + key”。
+    克隆行和模板行结构一样，按同样的下标就能直接找到要写的节点。
+    仍有占位符跨节点（如落在超链接 / 内容控件里被拆开）时返回 None，退回整格重写。
     """
-    if start_row >= end_row:
-        return
+    for p_el in tpl_tr.iter(qn("w:p")):
+        merge_split_placeholders(Paragraph(p_el, None))
 
-    current_text = table.cell(start_row, col_idx).text
-    group_start = start_row
+    slots: RowSlots = []
+    for idx, t in enumerate(tpl_tr.iter(_W_T)):
+        text = t.text or ""
+        if "{{SEG_" not in text:
+            continue
+        pieces = _SEG_TOKEN_SPLIT_RE.split(text)
+        # split 带捕获组：奇数位是占位符，换成行数据的 key
+        slots.append((idx, [SEG_ROW_TOKENS[x] if i % 2 else x for i, x in enumerate(pieces)]))
 
-    for r in range(start_row + 1, end_row + 1):
-        cell = table.cell(r, col_idx)
-        text = cell.text
+    found = sum(len(pieces) // 2 for _, pieces in slots)
+    cells_text = "".join(t.text or "" for t in tpl_tr.iter(_W_T))
+    if found != len(_SEG_TOKEN_SPLIT_RE.findall(cells_text)):
+        return None
+    return slots
 
-        if text == current_text:
-            # 还在同一组，继续往下
-            continue
 
-        # 结束上一组：如果组里有多行且文本非空，则合并
-        if r - 1 > group_start and current_text != "":
-            top_cell = table.cell(group_start, col_idx)
-            bottom_cell = table.cell(r - 1, col_idx)
-            merged = top_cell.merge(bottom_cell)
-            # 重要：重设一次文本，只留一份
-            merged.text = current_text
+def _fill_row_with_data(row, data: Dict[str, str], slots: Optional[RowSlots] = None) -> None:
+    """
+    用 SEG_* 数据填充某一行。
+    - slots（_compile_segment_row 的结果）：只改占位符所在的文本节点，run / 段落 / 单元格格式都保留
+    - 不传 slots：退回旧做法，整格拼出文字再 cell.text 重写
+    """
+    if slots is not None:
+        nodes = list(row._tr.iter(_W_T))
+        for idx, pieces in slots:
+            text = "".join(data.get(x, "") if i % 2 else x for i, x in enumerate(pieces))
+            t = nodes[idx]
+            t.text = text
+            if text != text.strip():
+                t.set(_XML_SPACE, "preserve")
+        return
 
-        # 开启新的一组
-        current_text = text
-        group_start = r
+    for cell in row.cells:
+        text = cell.text
+        for k, v in SEG_ROW_TOKENS.items():
+            text = text.replace(k, data.get(v, ""))
+        cell.text = text
 
-    # 处理最后一组
-    if end_row > group_start and current_text != "":
-        top_cell = table.cell(group_start, col_idx)
-        bottom_cell = table.cell(end_row, col_idx)
-        merged = top_cell.merge(bottom_cell)
-        merged.text = current_text
 
-def _merge_method_within_sample(table, start_row: int, end_row: int,
-                                sample_col: int, method_col: int) -> None:
+def _vmerge_marks(keys: List, texts: List[str]) -> List[Optional[str]]:
     """
-    只在“同一个 Sample 且 Test method 文本相同”的连续行里合并 method 列。
-    不会跨样品合并。
+    按行数据算出某一列的纵向合并标记（每行一个）：
+    - 连续 key 相同的行分成一组，组内多于一行且文本非空时合并
+    - 组的第一行为 "restart"，其余行为 "continue"，不合并的行为 None
     """
-    if start_row >= end_row:
-        return
+    marks: List[Optional[str]] = [None] * len(keys)
+    group_start = 0
+    for r in range(1, len(keys) + 1):
+        if r < len(keys) and keys[r] == keys[group_start]:
+            continue
+        if r - 1 > group_start and texts[group_start] != "":
+            marks[group_start] = "restart"
+            for k in range(group_start + 1, r):
+                marks[k] = "continue"
+        group_start = r
+    return marks
+
 
-    current_sample = table.cell(start_row, sample_col).text
-    current_method = table.cell(start_row, method_col).text
-    group_start = start_row
-
-    for r in range(start_row + 1, end_row + 1):
-        sample_text = table.cell(r, sample_col).text
-        method_text = table.cell(r, method_col).text
-
-        # 只要样品变了，或者方法变了，就结束上一个分组
-        if sample_text != current_sample or method_text != current_method:
-            if r - 1 > group_start and current_method != "":
-                top_cell = table.cell(group_start, method_col)
-                bottom_cell = table.cell(r - 1, method_col)
-                merged = top_cell.merge(bottom_cell)
-                merged.text = current_method
-            # 开启新组
-            current_sample = sample_text
-            current_method = method_text
-            group_start = r
-
-    # 处理最后一组
-    if end_row > group_start and current_method != "":
-        top_cell = table.cell(group_start, method_col)
-        bottom_cell = table.cell(end_row, method_col)
-        merged = top_cell.merge(bottom_cell)
-        merged.text = current_method
+def _token_column(tr, token: str) -> Optional[int]:
+    """模板行里包含 token 的单元格下标（<w:tc> 顺序），没有则为 None。"""
+    for col, tc in enumerate(tr.tc_lst):
+        if token in "".join(t.text or "" for t in tc.iter(qn("w:t"))):
+            return col
+    return None
 
 
 def _build_segment_rows_for_samples(samples: List[SampleItem]) -> List[Dict[str, str]]:
@@ -550,66 +834,115 @@ def _build_segment_rows_for_samples(samples: List[SampleItem]) -> List[Dict[str,
     return all_rows
 
 
-def _fill_segment_rows_to_table(doc: Document, rows_data: List[Dict[str, str]]) -> None:
+def _fill_segment_rows_to_table(
+    doc: Document,
+    rows_data: List[Dict[str, str]],
+    location: Optional[PlaceholderLocation] = None,
+) -> None:
     """
     把已经准备好的 SEG_* 行数据写入模板中的 Result and Discussion 表格。
     模板里只需要一行带 {{SEG_*}} 的模板行。
+    location: 模板索引里 {{SEG_VALUE}} 的位置；不传则扫描文档查找。
     """
     if not rows_data:
         return
 
-    table, tpl_row_idx = _find_segment_template_row(doc)
+    if location is not None:
+        table, tpl_row_idx = location.table, location.row_idx
+    else:
+        table, tpl_row_idx = _find_segment_template_row(doc)
     if table is None:
         return
 
-    tpl_row = table.rows[tpl_row_idx]
-    tpl_tr_template = deepcopy(tpl_row._tr)
+    tpl_tr = table._tbl.tr_lst[tpl_row_idx]
+    slots, merges = _segment_row_plan(table, tpl_tr, rows_data)
+    rows = _build_rows_from_template(table, tpl_tr, len(rows_data))
+    for r, (row, data) in enumerate(zip(rows, rows_data)):
+        _fill_segment_row(table, row, r, data, slots, merges)
 
-    # 第一条数据直接使用模板行
-    _fill_row_with_data(tpl_row, rows_data[0])
 
-    # 后面的数据：基于“原始模板行”克隆
-    for data in rows_data[1:]:
-        new_tr = deepcopy(tpl_tr_template)
-        table._tbl.append(new_tr)
-        new_row = table.rows[-1]
-        _fill_row_with_data(new_row, data)
+def _segment_row_plan(table, tpl_tr, rows_data: List[Dict[str, str]]):
+    """
+    填表前对模板行做一次的准备，返回 (slots, merges)：
+    - slots：占位符所在文本节点的位置（见 _compile_segment_row），克隆行按同样的下标写值。
+      快路径不重建段落，居中也只需在克隆前对模板行做一次
+    - merges：[(列下标, 每行的 vMerge 标记)]，Sample / Test method 列的合并分组直接由行数据算出：
+      Sample 连续相同的样品名合并；Test method 只在同一个 Sample 内、连续相同的 method 合并
+    """
+    slots = _compile_segment_row(tpl_tr)
+    if slots is not None:
+        _center_cells(table, tpl_tr.tc_lst)
+
+    samples_col = [d.get("SEG_SAMPLE", "") for d in rows_data]
+    methods_col = [d.get("SEG_METHOD", "") for d in rows_data]
+    merges = []
+    sample_col = _token_column(tpl_tr, "{{SEG_SAMPLE}}")
+    if sample_col is not None:
+        merges.append((sample_col, _vmerge_marks(samples_col, samples_col)))
+    method_col = _token_column(tpl_tr, "{{SEG_METHOD}}")
+    if method_col is not None:
+        merges.append((method_col, _vmerge_marks(list(zip(samples_col, methods_col)), methods_col)))
+    return slots, merges
+
+
+def _fill_segment_row(table, row, r: int, data: Dict[str, str], slots, merges) -> None:
+    """填第 r 行：写值，再直接写 vMerge（续行格清空成一个空段落，文本只留在合并块的第一格）。"""
+    _fill_row_with_data(row, data, slots)
+    tcs = row._tr.tc_lst
+    for col, marks in merges:
+        mark = marks[r]
+        if mark is None:
+            continue
+        tcs[col].vMerge = mark
+        if mark == "continue":
+            tcs[col].clear_content()
+            tcs[col].add_p()
 
-    # 合并 Sample / Test method 列相同文本的单元格，并居中
-    start_row = tpl_row_idx
-    end_row = tpl_row_idx + len(rows_data) - 1
+    if slots is None:
+        # 退回整格重写时逐行居中；续行格（vMerge=continue）归合并块的第一格管，跳过
+        _center_cells(table, [tc for tc in tcs if tc.vMerge != "continue"])
 
-    SAMPLE_COL = 0
-    METHOD_COL = 1
 
-    _merge_down_same_text(table, start_row, end_row, SAMPLE_COL)
-    _merge_method_within_sample(table, start_row, end_row, SAMPLE_COL, METHOD_COL)
+def _iter_segment_rows(table, tpl_tr, rows_data: List[Dict[str, str]]):
+    """流式写出用：逐行克隆模板行并填好，产出 <w:tr>（模板行本身不动、不进结果）。"""
+    slots, merges = _segment_row_plan(table, tpl_tr, rows_data)
+    for r, data in enumerate(rows_data):
+        tr = deepcopy(tpl_tr)
+        _fill_segment_row(table, _Row(tr, table), r, data, slots, merges)
+        yield tr
 
-    num_cols = len(table.rows[tpl_row_idx].cells)
 
-    for r in range(start_row, end_row + 1):
-        for c in range(num_cols):
-            cell = table.cell(r, c)
-            # 垂直居中
-            cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
-            # 水平居中
-            for p in cell.paragraphs:
-                p.alignment = WD_ALIGN_PARAGRAPH.CENTER
+def _center_cells(table, tcs) -> None:
+    """单元格垂直居中、里面的段落水平居中。"""
+    for tc in tcs:
+        cell = _Cell(tc, table)
+        cell.vertical_alignment = WD_ALIGN_VERTICAL.CENTER
+        for p in cell.paragraphs:
+            p.alignment = WD_ALIGN_PARAGRAPH.CENTER
 
 
-def fill_segments_table_for_samples(doc: Document, samples: List[SampleItem]) -> None:
+def fill_segments_table_for_samples(
+    doc: Document,
+    samples: List[SampleItem],
+    location: Optional[PlaceholderLocation] = None,
+) -> None:
     """
     多样品版本：把所有样品的 segments 一次性写入 Result and Discussion 表。
     """
     rows_data = _build_segment_rows_for_samples(samples)
-    _fill_segment_rows_to_table(doc, rows_data)
+    _fill_segment_rows_to_table(doc, rows_data, location=location)
 
 
-def fill_segments_table(doc: Document, segments: List[DscSegment], sample_label: str) -> None:
+def fill_segments_table(
+    doc: Document,
+    segments: List[DscSegment],
+    sample_label: str,
+    location: Optional[PlaceholderLocation] = None,
+) -> None:
     """
     兼容单样品的旧逻辑：只用当前 segments + sample_label。
     """
     if not segments:
         return
     rows_data = _build_segment_rows(segments, sample_label)
-    _fill_segment_rows_to_table(doc, rows_data)
+    _fill_segment_rows_to_table(doc, rows_data, location=location)